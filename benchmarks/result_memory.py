@@ -0,0 +1,106 @@
+"""
+Memory benchmark: ResultCollector (list of Result dataclasses) vs CompactResultStore.
+
+    python benchmarks/result_memory.py --cells 20000
+
+Builds synthetic results shaped like a real run (tests shared by every model × prompt,
+one assistant message per cell) and reports the memory held after collecting them and
+the peak while exporting them to JSON.
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from rawbench.results import CompactResultStore, Result, ResultCollector
+
+
+def make_results(cells: int, tests: int = 100, output_chars: int = 600):
+    rng = random.Random(0)
+    words = ["model", "token", "answer", "the", "of", "latency", "result", "evaluation", "prompt",
+             "tool", "call", "because", "which", "request", "provider", "cost", "and", "is", "a"]
+    test_messages = [
+        [{"role": "user", "content": f"Test question {test}: " + "context " * 60}]
+        for test in range(tests)
+    ]
+    for cell in range(cells):
+        test = cell % tests
+        content = (f"Answer {cell} " + " ".join(rng.choice(words) for _ in range(output_chars // 4)))[:output_chars]
+        yield Result(
+            id=f"bench::m{cell // (tests * 10)}::p{(cell // tests) % 10}::t{test}",
+            prompt_id=f"p{(cell // tests) % 10}",
+            model_id=f"m{cell // (tests * 10)}",
+            test_id=f"t{test}",
+            # Like Evaluation, every cell of a test references the same message list
+            input_messages=test_messages[test],
+            output_content=content,
+            output_messages=[{"content": content, "role": "assistant", "tool_calls": None,
+                              "function_call": None, "provider_specific_fields": None}],
+            completion_tokens=150,
+            prompt_tokens=120,
+            total_tokens=270,
+            cost=0.0004,
+            latency_ms=850,
+        )
+
+
+def export(collector):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.json")
+        collector.export_to_json(path)
+        return os.path.getsize(path)
+
+
+def measure(make_collector, cells: int):
+    """Memory held and export peak (traced), then collect and export times (untraced)."""
+    gc.collect()
+    tracemalloc.start()
+    collector = make_collector()
+    for result in make_results(cells):
+        collector.add_result(result)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    size = export(collector)
+    _, export_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del collector
+
+    gc.collect()
+    collector = make_collector()
+    start = time.perf_counter()
+    for result in make_results(cells):
+        collector.add_result(result)
+    collect_s = time.perf_counter() - start
+    start = time.perf_counter()
+    export(collector)
+    export_s = time.perf_counter() - start
+    return held, export_peak, collect_s, export_s, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cells", type=int, default=20_000)
+    parser.add_argument("--spill-mb", type=int, default=64, help="Transcript spill threshold in MiB")
+    args = parser.parse_args()
+
+    mib = 1024 * 1024
+    rows = [
+        ("ResultCollector", measure(ResultCollector, args.cells)),
+        ("CompactResultStore", measure(lambda: CompactResultStore(spill_threshold=args.spill_mb * mib),
+                                       args.cells)),
+    ]
+    print(f"{args.cells:,} results")
+    print(f"{'':<20} {'held':>10} {'export peak':>12} {'collect':>9} {'export':>9} {'file':>10}")
+    for name, (held, peak, collect_s, export_s, size) in rows:
+        print(f"{name:<20} {held / mib:>8.1f}Mi {peak / mib:>10.1f}Mi {collect_s:>8.2f}s {export_s:>8.2f}s "
+              f"{size / mib:>8.1f}Mi")
+    baseline, compact = rows[0][1][0], rows[1][1][0]
+    print(f"Held memory reduced {baseline / compact:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ RawBench Prompt Evaluation - A tool for evaluating LLM prompts across models.
 
 # Core functionality
 from .core.evaluation import Evaluation
+from .core.stream import ResultStream
 
 # Configuration
 from .config.loader import load_config, validate_config
@@ -12,6 +13,9 @@ from .config.loader import load_config, validate_config
 from .results.result import Result, ResultCollector
 # from .results.markdown_transformer import MarkdownTransformer
 
+# Python API
+from .services.evaluation import run
+
 # Version info
 __version__ = "0.1.0"
 
@@ -19,6 +23,8 @@ __version__ = "0.1.0"
 __all__ = [
     # Core
     "Evaluation",
+    "ResultStream",
+    "run",
     
     # Config
     "load_config",
@@ -3,13 +3,20 @@
 CLI tool for managing prompt evaluations with JSON and YAML file support.
 """
 
+import glob
+import json
 import sys
 import click
 from pathlib import Path
 from ..services.evaluation import EvaluationService
 from ..services.setup import SetupService 
 from ..services.server import WebServer
+from ..core.cost import Budget
+from ..core.progress import ConsoleProgressBar, ProgressForwarder, ProgressTracker
+from ..results import ResultArchive, SearchIndex, load_result_file
+from ..results.archive import is_archive
 from ..utils import load_env_file
+from ..utils.instrumentation import configure_logging, configure_tracing, get_tracer
 
 # Load environment variables from .env file
 load_env_file()
@@ -26,12 +33,53 @@ def main():
 
 @main.command()
 @click.argument('config_path')
-@click.option('-o', '--output', help='Output file path for results')
+@click.option('-o', '--output', help='Output file path for results (output directory for a suite)')
 @click.option('--serve', is_flag=True, help='Start web server to view results')
 @click.option('--port', default=8000, help='Port for web server (default: 8000)')
-def run(config_path: str, output: str = None, serve: bool = False, port: int = 8000):
-    """Run a benchmark evaluation"""
-    if not output:
+@click.option('--production', is_flag=True, help='Serve with a multi-threaded production WSGI server')
+@click.option('--workers', default=8, help='Worker threads in production mode (default: 8)')
+@click.option('--log-level', default='warning',
+              type=click.Choice(['debug', 'info', 'warning', 'error'], case_sensitive=False),
+              help='Log level; debug logs every model response (default: warning)')
+@click.option('--log-format', default='text', type=click.Choice(['text', 'json']),
+              help='Log line format (default: text)')
+@click.option('--trace-file', help='Export OpenTelemetry-compatible spans to this JSON file')
+@click.option('--trace-level', default='info', type=click.Choice(['info', 'debug'], case_sensitive=False),
+              help='info traces stages and cells, debug also every model and tool call (default: info)')
+@click.option('--trace-sample', default=1.0, type=click.FloatRange(0.0, 1.0),
+              help='Fraction of cells to trace (default: 1.0)')
+@click.option('--no-progress', is_flag=True, help='Disable the progress bar')
+@click.option('--max-cost', type=float, help='Stop starting new cells once this many dollars are spent')
+@click.option('--max-tokens', type=int, help='Stop starting new cells once this many tokens are used')
+@click.option('--pricing', 'pricing_path', help='YAML file with per-model prices overriding litellm')
+@click.option('--format', 'output_format', default='json', type=click.Choice(['json', 'archive']),
+              help='json, or archive for a compressed .rbz file (default: json)')
+@click.option('--watch', is_flag=True,
+              help='Stay running and re-run the cells affected by changes to the config or variables')
+@click.option('--watch-path', 'watch_paths', multiple=True,
+              help='Extra file or directory to watch, e.g. data read by variables (repeatable)')
+@click.option('--push-to', help='URL of a running rawbench serve to push progress and results to')
+@click.option('--push-token', envvar='RAWBENCH_PUSH_TOKEN',
+              help="The server's push token (default: $RAWBENCH_PUSH_TOKEN)")
+def run(config_path: str, output: str = None, serve: bool = False, port: int = 8000,
+        production: bool = False, workers: int = 8, log_level: str = 'warning',
+        log_format: str = 'text', trace_file: str = None, trace_level: str = 'info',
+        trace_sample: float = 1.0, no_progress: bool = False, max_cost: float = None,
+        max_tokens: int = None, pricing_path: str = None, output_format: str = 'json',
+        watch: bool = False, watch_paths=(), push_to: str = None, push_token: str = None):
+    """Run a benchmark evaluation, or every evaluation of a directory or glob as one suite"""
+    configure_logging(log_level, log_format)
+    if trace_file:
+        configure_tracing(trace_level, trace_sample)
+
+    suite = Path(config_path).is_dir() or glob.has_magic(config_path)
+    if suite and watch:
+        click.echo("❌ --watch runs a single evaluation, not a directory or glob", err=True)
+        sys.exit(1)
+
+    if suite:
+        output_path = output or "results"
+    elif not output:
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file_name = f"{Path(config_path).stem}_{timestamp}"
@@ -39,22 +87,266 @@ def run(config_path: str, output: str = None, serve: bool = False, port: int = 8
     else:
         output_path = output
     
+    progress = web_server.progress if serve else ProgressTracker()
+    if not no_progress:
+        progress.add_listener(ConsoleProgressBar())
+    forwarder = ProgressForwarder(push_to, token=push_token) if push_to else None
+    if forwarder:
+        progress.add_listener(forwarder)
+
     try:
-        evaluation_service.run_evaluation(
-            config_path=config_path,
-            output_path=output_path,
-        )
+        server_thread = None
+        if serve:
+            # Start serving before the run so the dashboard can follow it live
+            click.echo(f"🌐 Starting web server on http://localhost:{port}")
+            click.echo(f"📡 Live progress at http://localhost:{port}/api/progress/stream")
+            server_thread = web_server.serve_live_result(output_path, port, production=production, workers=workers)
+
+        if watch:
+            try:
+                evaluation_service.watch_evaluation(
+                    config_path=config_path,
+                    output_path=output_path,
+                    progress=progress,
+                    pricing_path=pricing_path,
+                    output_format=output_format,
+                    watch_paths=watch_paths,
+                    max_cost=max_cost,
+                    max_tokens=max_tokens,
+                )
+            except KeyboardInterrupt:
+                click.echo("\n👋 Stopped watching")
+            return
+
+        try:
+            budget = Budget(max_cost, max_tokens) if max_cost or max_tokens else None
+            if suite:
+                data = evaluation_service.run_suite(
+                    pattern=config_path,
+                    output_dir=output_path,
+                    progress=progress,
+                    budget=budget,
+                    pricing_path=pricing_path,
+                    output_format=output_format,
+                )
+                click.echo(f"\n🧪 Suite: {data['summary']['count_evaluations']} evaluations, "
+                           f"{data['summary']['total_results']} results "
+                           f"({data['summary']['shared_results']} shared between evaluations)")
+                for entry in data['evaluations']:
+                    click.echo(f"  {entry['id']:<30} {entry['total_results']:>6} results, "
+                               f"{entry['success_rate']:.1%} success, ${entry['total_cost']:.4f} -> {entry['result_file']}")
+            else:
+                evaluation_service.run_evaluation(
+                    config_path=config_path,
+                    output_path=output_path,
+                    progress=progress,
+                    budget=budget,
+                    pricing_path=pricing_path,
+                    output_format=output_format,
+                )
+        finally:
+            if trace_file:
+                get_tracer().export(trace_file)
+                click.echo(f"🔎 Trace written to {trace_file}")
         click.echo("✅ Evaluation completed successfully")
+        if forwarder:
+            forwarder.flush()
         
-        if serve:            
-            click.echo(f"🌐 Starting web server on http://localhost:{port}")
-            click.echo(f"📊 Viewing results from: {output_path}.json")
-            web_server.serve_specific_result(output_path, port)
+        if server_thread:
+            click.echo(f"📊 Viewing results from: {output_path}")
+            server_thread.join()
             
     except Exception as e:
         click.echo(f"❌ Error running evaluation: {str(e)}", err=True)
         sys.exit(1)
 
+@main.command()
+@click.argument('config_path')
+@click.option('--json', 'as_json', is_flag=True, help='Print the plan as JSON')
+@click.option('--limit', default=50, help='Maximum number of models and cells to print (default: 50, 0 for all)')
+def plan(config_path: str, as_json: bool = False, limit: int = 50):
+    """Show what an evaluation would run, without calling any model"""
+    try:
+        execution_plan = evaluation_service.plan_evaluation(config_path)
+        description = execution_plan.describe(limit if limit > 0 else None)
+        if as_json:
+            click.echo(json.dumps(description, indent=2))
+            return
+
+        click.echo(f"📋 Evaluation: {description['id']}")
+        click.echo(f"\nModels ({description['model_count']}):")
+        for model in description['models']:
+            click.echo(f"  {model['id']:<30} {model['name']} (temperature={model['temperature']}, "
+                       f"max_tokens={model['max_tokens']})")
+        if len(description['models']) < description['model_count']:
+            click.echo(f"  ... {description['model_count'] - len(description['models'])} more")
+        for model_id, sweep in description['sweeps'].items():
+            click.echo(f"  🎛️  {model_id}: {sweep['method']} sweep of {', '.join(sweep['parameters'])}, "
+                       f"{sweep['variants']} variants")
+        click.echo(f"Prompts ({len(description['prompts'])}): {', '.join(description['prompts'])}")
+        click.echo(f"Tests ({len(description['tests'])}): {', '.join(description['tests'])}")
+        click.echo(f"\n🧮 {description['cell_count']} cells "
+                   f"({description['model_count']} models × {len(description['prompts'])} prompts × "
+                   f"{len(description['tests'])} tests), in execution order:")
+        cells = description['cells']
+        for index, cell_id in enumerate(cells, start=1):
+            click.echo(f"  {index:>4}. {cell_id}")
+        if len(cells) < description['cell_count']:
+            click.echo(f"  ... {description['cell_count'] - len(cells)} more (use --limit 0 to show all)")
+    except Exception as e:
+        click.echo(f"❌ Error planning evaluation: {str(e)}", err=True)
+        sys.exit(1)
+
+@main.command()
+@click.argument('config_path')
+@click.option('--history', 'history_paths', multiple=True,
+              help='Past result file or directory to project completion tokens from (repeatable)')
+@click.option('--pricing', 'pricing_path', help='YAML file with per-model prices overriding litellm')
+@click.option('--json', 'as_json', is_flag=True, help='Print the estimate as JSON')
+def estimate(config_path: str, history_paths=(), pricing_path: str = None, as_json: bool = False):
+    """Estimate the tokens and cost of an evaluation before running it"""
+    try:
+        projection = evaluation_service.estimate_evaluation(config_path, pricing_path, history_paths)
+        if as_json:
+            click.echo(json.dumps(projection, indent=2))
+            return
+
+        click.echo(f"🧮 Evaluation: {projection['id']} ({projection['cell_count']} cells)")
+        click.echo("-" * 90)
+        click.echo(f"{'Model':<30} {'Cells':>7} {'Prompt tok':>12} {'Compl. tok':>12} {'Cost':>12}  Completions")
+        for model in projection['models']:
+            cost = f"${model['cost']:.4f}" if model['cost'] is not None else "unknown"
+            click.echo(f"{model['model_id']:<30} {model['cells']:>7} {model['prompt_tokens']:>12,} "
+                       f"{model['completion_tokens']:>12,} {cost:>12}  {model['completion_source']}")
+        click.echo("-" * 90)
+        total_cost = f"${projection['total_cost']:.4f}" if projection['total_cost'] is not None else "unknown"
+        click.echo(f"{'Total':<30} {projection['cell_count']:>7} {projection['prompt_tokens']:>12,} "
+                   f"{projection['completion_tokens']:>12,} {total_cost:>12}")
+        if projection['unpriced_models']:
+            click.echo(f"⚠️  No pricing for: {', '.join(projection['unpriced_models'])} (use --pricing)")
+    except Exception as e:
+        click.echo(f"❌ Error estimating evaluation: {str(e)}", err=True)
+        sys.exit(1)
+
+@main.command()
+@click.argument('config_path')
+@click.option('-o', '--output', help='Output file path for the load test results')
+@click.option('--model', 'model_ids', multiple=True, help='Model id to load test (repeatable, default: all)')
+@click.option('--qps', help='Comma-separated request rates, one step each (e.g. 1,2,4,8)')
+@click.option('--duration', type=float, help='Seconds per step (default: 30)')
+@click.option('--arrival', type=click.Choice(['constant', 'poisson']), help='Arrival process (default: constant)')
+@click.option('--max-in-flight', type=int, help='Maximum concurrent requests (default: 256)')
+@click.option('--timeout', type=float, help='Seconds per request (default: 60)')
+@click.option('--seed', type=int, help='Seed of the Poisson arrivals')
+def load(config_path: str, output: str = None, model_ids=(), qps: str = None, duration: float = None,
+         arrival: str = None, max_in_flight: int = None, timeout: float = None, seed: int = None):
+    """Load test model endpoints at fixed request rates"""
+    if not output:
+        from datetime import datetime
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = f"results/{Path(config_path).stem}_load_{timestamp}"
+
+    try:
+        data = evaluation_service.run_load_test(
+            config_path,
+            output,
+            model_ids=model_ids,
+            qps=[float(rate) for rate in qps.split(',')] if qps else None,
+            duration=duration,
+            arrival=arrival,
+            max_in_flight=max_in_flight,
+            timeout=timeout,
+            seed=seed,
+        )
+        for model_id, model in data['summary']['models'].items():
+            saturation = f"{model['saturation_qps']:g} qps" if model['saturation_qps'] else "not reached"
+            click.echo(f"📈 {model_id}: max throughput {model['max_throughput_rps']:.2f} rps, "
+                       f"saturation {saturation}")
+        click.echo("✅ Load test completed successfully")
+    except Exception as e:
+        click.echo(f"❌ Error running load test: {str(e)}", err=True)
+        sys.exit(1)
+
+@main.command()
+@click.argument('result_path')
+@click.option('--json', 'as_json', is_flag=True, help='Convert a .rbz archive to a result JSON file')
+@click.option('--archive', 'as_archive', is_flag=True, help='Convert a result JSON file to a .rbz archive')
+@click.option('-o', '--output', help='Output file path (default: next to the input)')
+@click.option('--index', 'indexes', type=int, multiple=True, help='Print the result at this position (repeatable)')
+@click.option('--id', 'result_ids', multiple=True, help='Print the result with this id (repeatable)')
+def export(result_path: str, as_json: bool = False, as_archive: bool = False, output: str = None,
+           indexes=(), result_ids=()):
+    """Convert result files between JSON and .rbz archives, or print single results"""
+    try:
+        if indexes or result_ids:
+            # Reads only the blocks holding the requested results
+            if is_archive(result_path):
+                with ResultArchive(result_path) as archive:
+                    selected = [archive.get(index) for index in indexes]
+                    selected += [archive.find(result_id) for result_id in result_ids]
+            else:
+                results = load_result_file(result_path).get("results", [])
+                by_id = {result.get("id"): result for result in results}
+                selected = [results[index] for index in indexes] + [by_id.get(result_id) for result_id in result_ids]
+            for result in selected:
+                click.echo(json.dumps(result, indent=2))
+            return
+
+        if as_json and as_archive:
+            raise click.UsageError("Use either --json or --archive")
+        if as_json and not is_archive(result_path):
+            raise click.UsageError(f"{result_path} is already JSON")
+        if as_archive and is_archive(result_path):
+            raise click.UsageError(f"{result_path} is already an archive")
+        target = evaluation_service.export_results(result_path, output)
+        click.echo(f"✅ Exported {result_path} to {target}")
+    except click.UsageError:
+        raise
+    except Exception as e:
+        click.echo(f"❌ Error exporting results: {str(e)}", err=True)
+        sys.exit(1)
+
+@main.command()
+@click.argument('query')
+@click.option('--dir', 'results_dir', default='results', help='Directory of result files (default: results)')
+@click.option('--model', help='Only results of this model id')
+@click.option('--prompt', help='Only results of this prompt id')
+@click.option('--test', help='Only results of this test id')
+@click.option('--evaluation', help='Only results of this evaluation id')
+@click.option('--status', type=click.Choice(['success', 'error']), help='Only successful or failed results')
+@click.option('--since', help='Only results created at or after this ISO date/time')
+@click.option('--until', help='Only results created before this ISO date/time')
+@click.option('--limit', default=20, help='Maximum number of hits (default: 20)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the hits as JSON')
+def search(query: str, results_dir: str = 'results', model: str = None, prompt: str = None, test: str = None,
+           evaluation: str = None, status: str = None, since: str = None, until: str = None, limit: int = 20,
+           as_json: bool = False):
+    """Full-text search over outputs, tool calls and test inputs of every result file
+
+    QUERY uses SQLite FTS5 syntax: words, "exact phrases", prefix* and
+    column filters such as tools:search_tool or output:refund.
+    """
+    try:
+        index = SearchIndex(results_dir)
+        try:
+            found = index.search(query, limit=limit, model=model, prompt=prompt, test=test,
+                                 evaluation=evaluation, status=status, since=since, until=until)
+        finally:
+            index.close()
+        if as_json:
+            click.echo(json.dumps(found, indent=2))
+            return
+        click.echo(f"🔎 {found['total']} results match \"{query}\" ({found['took_ms']:.0f}ms)")
+        for hit in found['hits']:
+            click.echo(f"\n  {hit['file']} #{hit['index']}  {hit['model_id']} · {hit['prompt_id']} · {hit['test_id']}"
+                       f"{'  ❌' if hit['status'] != 'success' else ''}")
+            click.echo(f"    {' '.join(hit['snippet'].split())}")
+        if found['total'] > len(found['hits']):
+            click.echo(f"\n  ... {found['total'] - len(found['hits'])} more (use --limit)")
+    except Exception as e:
+        click.echo(f"❌ Error searching results: {str(e)}", err=True)
+        sys.exit(1)
+
 @main.command()
 @click.option('--dir', default='evaluations', help='Directory containing evaluation files')
 def list(dir: str):
@@ -79,12 +371,18 @@ def list(dir: str):
 
 @main.command()
 @click.option('--port', default=8000, help='Port for web server (default: 8000)')
-def serve(port: int = 8000):
+@click.option('--production', is_flag=True, help='Serve with a multi-threaded production WSGI server')
+@click.option('--workers', default=8, help='Worker threads in production mode (default: 8)')
+@click.option('--push-token', envvar='RAWBENCH_PUSH_TOKEN',
+              help='Token runs must send to push progress; without one only local runs may push '
+                   '(default: $RAWBENCH_PUSH_TOKEN)')
+def serve(port: int = 8000, production: bool = False, workers: int = 8, push_token: str = None):
     """Start web server to browse all evaluation results"""
     try:
+        web_server.push_token = push_token
         click.echo(f"🌐 Starting web server on http://localhost:{port}")
         click.echo("📊 Browse all evaluation results")
-        web_server.serve_all_results(port)
+        web_server.serve_all_results(port, production=production, workers=workers)
     except Exception as e:
         click.echo(f"❌ Error starting web server: {str(e)}", err=True)
         sys.exit(1)
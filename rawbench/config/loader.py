@@ -52,6 +52,8 @@ def validate_config(config: Dict[str, Any]) -> bool:
     for model in config["models"]:
         if "id" not in model or "provider" not in model or "name" not in model:
             raise ValueError("Each model must have 'id', 'name' and 'provider' fields")
+        if "sweep" in model and not isinstance(model["sweep"], dict):
+            raise ValueError(f"Model '{model['id']}' sweep must be a mapping")
     
     # Validate prompts if present
     if "prompts" in config:
@@ -71,6 +73,8 @@ def validate_config(config: Dict[str, Any]) -> bool:
             raise ValueError("Each test must have 'id' and 'messages' fields")
         if not isinstance(test["messages"], list):
             raise ValueError("Test 'messages' must be a list")
+        if "assert" in test and not isinstance(test["assert"], list):
+            raise ValueError(f"Test '{test['id']}' assert must be a list of checks")
     
     # Validate tools if present
     if "tools" in config:
@@ -80,5 +84,20 @@ def validate_config(config: Dict[str, Any]) -> bool:
         for tool in config["tools"]:
             if "id" not in tool or "description" not in tool or "name" not in tool:
                 raise ValueError("Each tool must have 'id', 'name' and 'description' fields")
+
+    # Validate execution settings if present
+    if "execution" in config:
+        if not isinstance(config["execution"], dict):
+            raise ValueError("'execution' must be a mapping")
+
+    # Validate pricing overrides if present
+    if "pricing" in config:
+        if not isinstance(config["pricing"], dict):
+            raise ValueError("'pricing' must be a mapping of model id or name to prices")
+
+    # Validate load test settings if present
+    if "load" in config:
+        if not isinstance(config["load"], dict):
+            raise ValueError("'load' must be a mapping")
     
     return True
\ No newline at end of file
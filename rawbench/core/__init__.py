@@ -4,6 +4,8 @@ Core evaluation engine components.
 
 from .evaluation import Evaluation
 from .model import Model
+from .plan import Cell, ExecutionPlan
+from .progress import ConsoleProgressBar, ProgressTracker
 from .tool_execution import ToolExecutionHandler
 
-__all__ = ["Evaluation", "Model", "ToolExecutionHandler"] 
\ No newline at end of file
+__all__ = ["Cell", "ConsoleProgressBar", "Evaluation", "ExecutionPlan", "Model", "ProgressTracker", "ToolExecutionHandler"] 
\ No newline at end of file
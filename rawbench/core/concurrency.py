@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Optional
+
+from .retry import RATE_LIMIT, TIMEOUT
+
+# Errors that mean the provider wants less traffic
+THROTTLING_ERRORS = {RATE_LIMIT, TIMEOUT}
+MAX_RECORDED_DECISIONS = 50
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits in-flight requests to one provider with additive increase / multiplicative decrease.
+
+    The limit grows by one after each window (as many completions as the limit) in
+    which the limit was actually reached, latency stayed within latency_tolerance of
+    the best latency seen and throughput did not fall. It is multiplied by backoff on
+    429s and timeouts, and by latency_backoff when latency inflates. At most one
+    decrease happens per window, so a burst of failures from requests that were
+    already in flight counts once.
+    """
+
+    def __init__(self, name: str, initial: int = 4, min_limit: int = 1, max_limit: int = 32,
+                 latency_tolerance: float = 2.0, backoff: float = 0.5, latency_backoff: float = 0.9,
+                 adaptive: bool = True):
+        self.name = name
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.adaptive = adaptive
+
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.increases = 0
+        self.decreases: Dict[str, int] = {}
+        self.decisions = deque(maxlen=MAX_RECORDED_DECISIONS)
+        self._started = time.monotonic()
+        self._condition = threading.Condition()
+
+        self._latency_ewma: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._window_start = time.monotonic()
+        self._window_completions = 0
+        self._window_saturated = False
+        self._window_decreased = False
+        self._throughput: Optional[float] = None
+
+    def acquire(self):
+        """Wait for a free slot."""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._window_saturated = True
+                self._condition.wait()
+            self.in_flight += 1
+            if self.in_flight >= int(self.limit):
+                self._window_saturated = True
+
+    def release(self, latency_s: float, error_type: Optional[str] = None):
+        """Free a slot and adapt the limit to how the request went."""
+        with self._condition:
+            self.in_flight -= 1
+            if self.adaptive:
+                self._adapt(latency_s, error_type)
+            self._condition.notify_all()
+
+    def release_unused(self):
+        """Free a slot that was acquired but never used for a request, without adapting."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _adapt(self, latency_s: float, error_type: Optional[str]):
+        if error_type in THROTTLING_ERRORS:
+            self._decrease(self.backoff, error_type)
+            return
+        if error_type:
+            # Bad requests and the like say nothing about load
+            return
+
+        self._latency_ewma = latency_s if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency_s
+        if self._baseline is None or self._latency_ewma < self._baseline:
+            self._baseline = self._latency_ewma
+        if self._latency_ewma > self._baseline * self.latency_tolerance:
+            self._decrease(self.latency_backoff, "latency")
+
+        self._window_completions += 1
+        if self._window_completions < int(self.limit):
+            return
+
+        # End of a window
+        now = time.monotonic()
+        throughput = self._window_completions / max(now - self._window_start, 1e-6)
+        if (self._window_saturated and not self._window_decreased and self.limit < self.max_limit
+                and (self._throughput is None or throughput >= 0.95 * self._throughput)):
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self.increases += 1
+            self._record("increase", "throughput")
+        self._throughput = throughput
+        # Let the baseline follow a provider that got slower for good
+        self._baseline = min(self._latency_ewma, self._baseline * 1.05)
+        self._window_start = now
+        self._window_completions = 0
+        self._window_saturated = self.in_flight >= int(self.limit)
+        self._window_decreased = False
+
+    def _decrease(self, factor: float, reason: str):
+        if self._window_decreased:
+            return
+        limit = max(float(self.min_limit), self.limit * factor)
+        if int(limit) == int(self.limit):
+            limit = max(float(self.min_limit), self.limit - 1)
+        if limit == self.limit:
+            return
+        self.limit = limit
+        self.decreases[reason] = self.decreases.get(reason, 0) + 1
+        self._window_decreased = True
+        self._record("decrease", reason)
+
+    def _record(self, action: str, reason: str):
+        self.decisions.append({
+            "at_s": round(time.monotonic() - self._started, 3),
+            "action": action,
+            "reason": reason,
+            "limit": int(self.limit),
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "adaptive": self.adaptive,
+                "limit": int(self.limit),
+                "initial_limit": self.initial,
+                "peak_limit": int(self.peak_limit),
+                "increases": self.increases,
+                "decreases": dict(self.decreases),
+                "throughput_rps": self._throughput,
+                "baseline_latency_ms": self._baseline * 1000 if self._baseline is not None else None,
+                "decisions": list(self.decisions),
+            }
+
+
+def endpoint_key(provider: str, api_base: Optional[str] = None) -> str:
+    """Registry key of a provider endpoint: the provider, qualified by its api_base when one is set."""
+    return f"{provider}@{api_base}" if api_base else provider
+
+
+class ConcurrencyLimiterRegistry:
+    """
+    One adaptive limiter per provider endpoint (see endpoint_key), configured from
+    the 'execution' block:
+
+        execution:
+          concurrency:
+            initial: 4           # in-flight requests per provider to start with
+            min: 1
+            max: 32
+            latency_tolerance: 2.0
+            adaptive: true       # false keeps every provider at 'initial'
+    """
+
+    def __init__(self, **limiter_options: Any):
+        self.limiter_options = limiter_options
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, execution: Dict[str, Any]) -> "ConcurrencyLimiterRegistry":
+        concurrency = execution.get("concurrency", {})
+        if isinstance(concurrency, int):
+            # A bare number is a fixed concurrency
+            concurrency = {"initial": concurrency, "max": concurrency, "adaptive": False}
+        options = {}
+        for key, option in (("initial", "initial"), ("min", "min_limit"), ("max", "max_limit"),
+                            ("latency_tolerance", "latency_tolerance"), ("backoff", "backoff"),
+                            ("adaptive", "adaptive")):
+            if key in concurrency:
+                options[option] = concurrency[key]
+        return cls(**options)
+
+    @property
+    def initial_limit(self) -> int:
+        return self.limiter_options.get("initial", 4)
+
+    @property
+    def max_limit(self) -> int:
+        return self.limiter_options.get("max_limit", 32)
+
+    def get(self, endpoint: str) -> AdaptiveConcurrencyLimiter:
+        with self._lock:
+            if endpoint not in self._limiters:
+                self._limiters[endpoint] = AdaptiveConcurrencyLimiter(endpoint, **self.limiter_options)
+            return self._limiters[endpoint]
+
+    def current_limit(self, endpoint: str) -> int:
+        """The endpoint's current limit on in-flight requests."""
+        return int(self.get(endpoint).limit)
+
+    def max_workers(self, endpoints: Iterable[str]) -> int:
+        """Threads needed for every endpoint to reach its maximum limit."""
+        return self.max_limit * max(len(set(endpoints)), 1)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: limiter.to_dict() for endpoint, limiter in self._limiters.items()}
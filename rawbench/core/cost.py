@@ -0,0 +1,197 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+import litellm
+import yaml
+
+logger = logging.getLogger(__name__)
+
+PER_MILLION = 1_000_000
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """Price of a model in dollars per token."""
+    input_cost_per_token: float
+    output_cost_per_token: float
+    cached_input_cost_per_token: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelPrice":
+        """
+        Build a price from a YAML/litellm entry.
+
+        Accepts litellm's per-token keys (input_cost_per_token, output_cost_per_token,
+        cache_read_input_token_cost) or the friendlier per-million keys
+        (input_cost_per_million, output_cost_per_million, cached_input_cost_per_million).
+        """
+        def pick(per_token_keys, per_million_key):
+            for key in per_token_keys:
+                if data.get(key) is not None:
+                    return float(data[key])
+            if data.get(per_million_key) is not None:
+                return float(data[per_million_key]) / PER_MILLION
+            return None
+
+        input_cost = pick(["input_cost_per_token"], "input_cost_per_million")
+        output_cost = pick(["output_cost_per_token"], "output_cost_per_million")
+        if input_cost is None or output_cost is None:
+            raise ValueError("Model pricing needs both an input and an output cost")
+        cached_cost = pick(["cached_input_cost_per_token", "cache_read_input_token_cost"],
+                           "cached_input_cost_per_million")
+        return cls(input_cost, output_cost, cached_cost)
+
+
+@dataclass
+class Usage:
+    """Token usage of one or more model calls."""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0
+
+    def add(self, other: "Usage"):
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.total_tokens += other.total_tokens
+        self.cached_tokens += other.cached_tokens
+
+
+def usage_from_response(model_response) -> Usage:
+    """Extract token usage (including cached prompt tokens) from a litellm response."""
+    usage = getattr(model_response, "usage", None)
+    if usage is None:
+        return Usage()
+    cached = 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is not None and getattr(details, "cached_tokens", None):
+        cached = details.cached_tokens
+    elif getattr(usage, "cache_read_input_tokens", None):
+        # Anthropic reports cache reads separately
+        cached = usage.cache_read_input_tokens
+    return Usage(
+        prompt_tokens=usage.prompt_tokens or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        total_tokens=usage.total_tokens or 0,
+        cached_tokens=cached or 0,
+    )
+
+
+class PricingTable:
+    """
+    Resolves model prices: user overrides first, then litellm's pricing map.
+
+    Overrides are keyed by model id or model name, e.g.
+
+        pricing:
+          openai/gpt-4o-mini:
+            input_cost_per_million: 0.15
+            output_cost_per_million: 0.60
+            cached_input_cost_per_million: 0.075
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.overrides = {key: ModelPrice.from_dict(value) for key, value in (overrides or {}).items()}
+        self._cache: Dict[str, Optional[ModelPrice]] = {}
+
+    @classmethod
+    def load(cls, pricing_file: Optional[str] = None,
+             overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> "PricingTable":
+        """Build a table from config overrides plus an optional YAML price file (which wins)."""
+        merged = dict(overrides or {})
+        if pricing_file:
+            with open(pricing_file, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+            # Accept both a bare mapping and a file with a top-level 'pricing' key
+            merged.update(data.get("pricing", data))
+        return cls(merged)
+
+    def price_for(self, *names: str) -> Optional[ModelPrice]:
+        """Find the price of the first known name (model id, model name, ...)."""
+        for name in names:
+            if name in self.overrides:
+                return self.overrides[name]
+        key = names[-1]
+        if key not in self._cache:
+            self._cache[key] = self._litellm_price(key)
+        return self._cache[key]
+
+    def _litellm_price(self, model_name: str) -> Optional[ModelPrice]:
+        candidates = [model_name]
+        if "/" in model_name:
+            candidates.append(model_name.split("/", 1)[1])
+        for candidate in candidates:
+            entry = litellm.model_cost.get(candidate)
+            if entry and entry.get("input_cost_per_token") is not None:
+                try:
+                    return ModelPrice.from_dict(entry)
+                except ValueError:
+                    continue
+        logger.warning("No pricing found for model %s, its cost will not be tracked", model_name)
+        return None
+
+    def cost(self, usage: Usage, *names: str) -> Optional[float]:
+        """Cost in dollars of the given usage, or None if the model has no known price."""
+        price = self.price_for(*names)
+        if price is None:
+            return None
+        cached = min(usage.cached_tokens, usage.prompt_tokens)
+        cached_rate = price.cached_input_cost_per_token
+        if cached_rate is None:
+            cached_rate = price.input_cost_per_token
+        return ((usage.prompt_tokens - cached) * price.input_cost_per_token
+                + cached * cached_rate
+                + usage.completion_tokens * price.output_cost_per_token)
+
+    def cost_of_responses(self, responses: Iterable, *names: str):
+        """Total usage and cost over every call of a tool loop."""
+        total = Usage()
+        cost: Optional[float] = None
+        for model_response in responses:
+            usage = usage_from_response(model_response)
+            total.add(usage)
+            call_cost = self.cost(usage, *names)
+            if call_cost is not None:
+                cost = (cost or 0.0) + call_cost
+        return total, cost
+
+
+class Budget:
+    """
+    Spending limits for a run. Once a limit is reached no new cells are scheduled;
+    cells already in flight still complete and are saved.
+    """
+
+    def __init__(self, max_cost: Optional[float] = None, max_tokens: Optional[int] = None):
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.spent_cost = 0.0
+        self.spent_tokens = 0
+        self._lock = threading.Lock()
+
+    def charge(self, cost: Optional[float], tokens: int):
+        """Record the spend of a completed cell."""
+        with self._lock:
+            self.spent_cost += cost or 0.0
+            self.spent_tokens += tokens or 0
+
+    @property
+    def exhausted_reason(self) -> Optional[str]:
+        """Why the budget is exhausted, or None if there is room left."""
+        with self._lock:
+            if self.max_cost is not None and self.spent_cost >= self.max_cost:
+                return f"max_cost reached (${self.spent_cost:.6f} >= ${self.max_cost:.6f})"
+            if self.max_tokens is not None and self.spent_tokens >= self.max_tokens:
+                return f"max_tokens reached ({self.spent_tokens} >= {self.max_tokens})"
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_cost": self.max_cost,
+                "max_tokens": self.max_tokens,
+                "spent_cost": self.spent_cost,
+                "spent_tokens": self.spent_tokens,
+            }
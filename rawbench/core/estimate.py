@@ -0,0 +1,212 @@
+import json
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import litellm
+
+try:
+    # Private to litellm; gives the tokenizer object itself, so counters can be shared by
+    # a model family and tokenize in batches. Without it, litellm.encode is used per text.
+    from litellm.utils import _select_tokenizer
+except ImportError:
+    _select_tokenizer = None
+
+from ..results.archive import ARCHIVE_SUFFIX, load_result_file
+from .cost import PricingTable, Usage
+from .plan import ExecutionPlan
+
+logger = logging.getLogger(__name__)
+
+# Chat formatting overhead of the OpenAI chat format, used as an approximation for every provider
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+# Rough size of a token, for models no tokenizer can be found for
+CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """
+    Counts tokens locally with the tokenizer of a model family.
+
+    Counters are shared by every model of a family (e.g. all tiktoken o200k models),
+    and each distinct text is only tokenized once. When litellm's tokenizer lookup is
+    unavailable, texts are encoded one by one with litellm.encode, and when that fails
+    too, tokens are estimated from the text length.
+    """
+
+    _by_family: Dict[str, "TokenCounter"] = {}
+    _family_of_model: Dict[str, str] = {}
+
+    def __init__(self, family: str, tokenizer_type: str, tokenizer):
+        self.family = family
+        self.tokenizer_type = tokenizer_type
+        self.tokenizer = tokenizer
+        self._counts: Dict[str, int] = {}
+
+    @classmethod
+    def for_model(cls, model_name: str) -> "TokenCounter":
+        family = cls._family_of_model.get(model_name)
+        if family is None:
+            try:
+                selected = _select_tokenizer(model_name) if _select_tokenizer else None
+            except Exception as e:
+                logger.debug("No tokenizer lookup for %s: %s", model_name, e)
+                selected = None
+            if selected:
+                tokenizer = selected["tokenizer"]
+                family = f"{selected['type']}:{getattr(tokenizer, 'name', None) or id(tokenizer)}"
+                tokenizer_type = selected["type"]
+            else:
+                family, tokenizer_type, tokenizer = f"litellm:{model_name}", "litellm", model_name
+            cls._family_of_model[model_name] = family
+            if family not in cls._by_family:
+                cls._by_family[family] = cls(family, tokenizer_type, tokenizer)
+        return cls._by_family[family]
+
+    def count_many(self, texts: Iterable[str]) -> List[int]:
+        """Token counts of texts, tokenizing the unseen distinct ones in one batch."""
+        texts = list(texts)
+        missing = list({text for text in texts if text not in self._counts})
+        if missing:
+            for text, count in zip(missing, self._encode_batch(missing)):
+                self._counts[text] = count
+        return [self._counts[text] for text in texts]
+
+    def count(self, text: str) -> int:
+        return self.count_many([text])[0]
+
+    def _encode_batch(self, texts: List[str]) -> List[int]:
+        if self.tokenizer_type == "openai_tokenizer":
+            return [len(ids) for ids in self.tokenizer.encode_ordinary_batch(texts)]
+        if self.tokenizer_type == "litellm":
+            try:
+                return [len(litellm.encode(model=self.tokenizer, text=text)) for text in texts]
+            except Exception as e:
+                logger.warning("Estimating tokens of %s from text length: %s", self.tokenizer, e)
+                self.tokenizer_type = "characters"
+        if self.tokenizer_type == "characters":
+            return [-(-len(text) // CHARS_PER_TOKEN) for text in texts]
+        return [len(encoding.ids) for encoding in self.tokenizer.encode_batch(texts)]
+
+
+def _message_texts(message: Dict[str, Any]) -> List[str]:
+    """The parts of a chat message that are tokenized."""
+    texts = [message.get("role", "")]
+    content = message.get("content")
+    if isinstance(content, str):
+        texts.append(content)
+    elif content is not None:
+        texts.append(json.dumps(content))
+    if message.get("name"):
+        texts.append(message["name"])
+    if message.get("tool_calls"):
+        texts.append(json.dumps(message["tool_calls"]))
+    return texts
+
+
+def _messages_tokens(counter: TokenCounter, messages: Sequence[Dict[str, Any]]) -> int:
+    texts = [text for message in messages for text in _message_texts(message)]
+    return sum(counter.count_many(texts)) + TOKENS_PER_MESSAGE * len(messages)
+
+
+def load_completion_history(paths: Iterable[str]) -> Dict[str, Any]:
+    """
+    Average completion tokens of successful past results, by (model, test) and by model.
+
+    Paths can be result JSON files, result archives or directories of them.
+    """
+    by_cell = defaultdict(list)
+    by_model = defaultdict(list)
+    for path in paths:
+        path = Path(path)
+        files = sorted([*path.glob("**/*.json"), *path.glob(f"**/*{ARCHIVE_SUFFIX}")]) if path.is_dir() else [path]
+        for file in files:
+            try:
+                results = load_result_file(file).get("results", [])
+            except (OSError, ValueError, AttributeError, RuntimeError) as e:
+                logger.warning("Skipping history file %s: %s", file, e)
+                continue
+            for result in results:
+                if result.get("status", "success") != "success" or not result.get("completion_tokens"):
+                    continue
+                by_cell[(result["model_id"], result["test_id"])].append(result["completion_tokens"])
+                by_model[result["model_id"]].append(result["completion_tokens"])
+
+    def mean(values):
+        return sum(values) / len(values)
+
+    return {
+        "by_cell": {key: mean(values) for key, values in by_cell.items()},
+        "by_model": {key: mean(values) for key, values in by_model.items()},
+    }
+
+
+def estimate_plan(plan: ExecutionPlan, pricing: Optional[PricingTable] = None,
+                  history: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Project the tokens and cost of running a plan, without calling any model.
+
+    Prompt tokens cover the rendered system prompt, the test messages and the tool
+    schemas of the first call of each cell. Completion tokens come from historical
+    results when available, otherwise max_tokens is used as an upper bound. Calls
+    made by tool loops are not projected.
+    """
+    pricing = pricing or PricingTable()
+    history = history or {"by_cell": {}, "by_model": {}}
+    tools = plan.tools
+    prompt_count = len(plan.prompts)
+    test_count = len(plan.tests)
+
+    models = []
+    for model in plan.models:
+        counter = TokenCounter.for_model(model.name)
+        system_tokens = sum(
+            _messages_tokens(counter, [{"role": "system", "content": system_prompt}])
+            for _, system_prompt in plan.prompts
+        )
+        test_tokens = sum(_messages_tokens(counter, test["messages"]) for test in plan.tests)
+        tool_tokens = counter.count(json.dumps(tools)) if tools else 0
+        # Every prompt is paired with every test
+        prompt_tokens = (system_tokens * test_count + test_tokens * prompt_count
+                         + (tool_tokens + TOKENS_PER_REPLY) * prompt_count * test_count)
+
+        completion_tokens = 0.0
+        sources = set()
+        for test in plan.tests:
+            projected = history["by_cell"].get((model.id, test["id"]))
+            source = "history"
+            if projected is None:
+                projected = history["by_model"].get(model.id)
+            if projected is None:
+                projected, source = model.max_tokens, "max_tokens"
+            completion_tokens += projected * prompt_count
+            sources.add(source)
+        completion_tokens = int(round(completion_tokens))
+
+        usage = Usage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                      total_tokens=prompt_tokens + completion_tokens)
+        models.append({
+            "model_id": model.id,
+            "model_name": model.name,
+            "tokenizer": counter.family,
+            "cells": prompt_count * test_count,
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "completion_source": "/".join(sorted(sources)),
+            "cost": pricing.cost(usage, model.id, model.name),
+        })
+
+    known_costs = [model["cost"] for model in models if model["cost"] is not None]
+    return {
+        "id": plan.evaluation_id,
+        "cell_count": len(plan),
+        "models": models,
+        "prompt_tokens": sum(model["prompt_tokens"] for model in models),
+        "completion_tokens": sum(model["completion_tokens"] for model in models),
+        "total_tokens": sum(model["total_tokens"] for model in models),
+        "total_cost": sum(known_costs) if known_costs else None,
+        "unpriced_models": [model["model_id"] for model in models if model["cost"] is None],
+    }
@@ -1,121 +1,308 @@
-from .model import Model
-from ..results.result import Result, ResultCollector
+import dataclasses
+import functools
+import logging
+
+from .concurrency import ConcurrencyLimiterRegistry
+from .cost import PricingTable
+from .http_clients import HttpClientRegistry
+from .model import Response
+from .plan import ExecutionPlan
+from .retry import CellError, CellSkipped, CircuitBreakerRegistry, RetryPolicy, classify_error
+from .scheduler import Scheduler
+from .scoring import Scorer
+from ..results.result import Result
+from ..results.store import CompactResultStore
+from ..utils.instrumentation import get_tracer
 from .variables import load_variables
 
+logger = logging.getLogger(__name__)
+
 
 class Evaluation:
-    def __init__(self, config):
-        """Initialize an evaluation from a config file."""
+    def __init__(self, config, pricing=None, limiters=None, http_clients=None, circuit_breakers=None,
+                 scorer=None):
+        """Initialize an evaluation from a config file.
+
+        Args:
+            config: Evaluation configuration
+            pricing: Optional PricingTable, defaults to litellm prices plus the config 'pricing' block
+            limiters: Optional ConcurrencyLimiterRegistry shared across runs (e.g. watch mode)
+            http_clients: Optional HttpClientRegistry shared across runs; it is left open on close()
+            circuit_breakers: Optional CircuitBreakerRegistry shared with other evaluations
+            scorer: Optional Scorer shared with other evaluations or runs (keeps its judge cache)
+        """
         self.id = config['id']
         self.models = config['models']
         self.prompts = config['prompts']
         self.tests = config['tests']
         # Load variables if present in config
-        self.variables = load_variables(config.get('variables', {}))
-        
+        with get_tracer().span("variables.resolve") as span:
+            self.variables = load_variables(config.get('variables', {}))
+            span.set_attribute("variables.count", len(self.variables))
+
         # Initialize components from config
         if not self.models:
             raise ValueError("No models defined in configuration")
-            
+
         if not self.tests:
             raise ValueError("No tests defined in configuration")
-            
+
         self.tools = config.get("tools", [])
-            
-        self.result_collector = ResultCollector()
-    
-    def run(self):
-        """Run all tests against all models."""
-        
-        print(f"Running evaluation: {self.id}")
-        print(f"Models: {len(self.models)}, Tests: {len(self.tests)}")
-        tools = self.tools if self.tools else []
-
-        for model_config in self.models:
-            print(f"  Testing model: {model_config['name']}")
-
-            model_id = model_config['id']
-            
-            # Create model instance
-            model = Model(
-                model_config['id'],
-                model_config['name'], 
-                model_config['provider'], 
-                model_config.get('temperature', 0.0),
-                model_config.get('max_tokens', 1000),
-                model_config.get('top_p', 1.0),
-                model_config.get('frequency_penalty', 0.0),
-                model_config.get('presence_penalty', 0.0),
-                model_config.get('seed', None),
-            )
-            for prompt in self.prompts:
-                prompt_id = prompt['id']
-                print(f"    Using prompt: {prompt_id}")
-                system_prompt = prompt['system']
-                # replace {{variable_name}} with the variables.function
-                for var_id, var_value in self.variables.items():
-                    system_prompt = system_prompt.replace(f"{{{{{var_id}}}}}", str(var_value))
-
-                for test in self.tests:
-                    test_id = test['id']
-                    print(f"        Running test: {test['id']}")
-                    complete_messages = test['messages']
-
-                    # Run the test
-                    response = model.run(
-                        test, 
-                        tools=tools,
-                        tool_execution_config=test.get('tool_execution'),
-                        system_prompt=system_prompt
-                    )
-                    last_response = response.output_messages[-1]
-
-
-                    result = Result(
-                        id=f"{self.id}::{model_id}::{prompt_id}::{test_id}",
-                        model_id=model.id,
-                        prompt_id=prompt_id,
-                        test_id=test_id,
-                        input_messages=complete_messages,
-                        output_content=last_response.choices[0].message.content,
-                        output_messages=[response.output_messages[i].choices[0].message.to_dict() for i in range(len(response.output_messages))],
-                        completion_tokens=last_response.usage.completion_tokens,
-                        prompt_tokens=last_response.usage.prompt_tokens,
-                        total_tokens=last_response.usage.total_tokens,
-                        latency_ms=sum(response.latencies),
-                    )
-                    self.result_collector.add_result(result)
+        self.pricing = pricing or PricingTable(config.get("pricing"))
+
+        # Retries, timeouts and circuit breaking for model calls
+        execution = config.get("execution", {})
+        self.retry_policy = RetryPolicy.from_config(execution)
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry.from_config(execution)
+        self.limiters = limiters or ConcurrencyLimiterRegistry.from_config(execution)
+        self._owns_http_clients = http_clients is None
+        self.http_clients = http_clients or HttpClientRegistry.from_config(execution)
+
+        # Compile the config once; the run loop only iterates the cells
+        self.plan = ExecutionPlan.compile(config, self.variables, self.retry_policy,
+                                          self.circuit_breakers, self.limiters, self.http_clients)
+        # Assertions are scored on a separate pool while cells keep running
+        self._owns_scorer = scorer is None
+        self.scorer = scorer or Scorer.from_config(execution, self.plan.models, self.pricing)
+
+        self.result_collector = CompactResultStore()
+
+    def run(self, progress=None, budget=None, cache=None, cancel=None, select=None, quiet=False):
+        """Run all tests against all models.
+
+        Cells run concurrently; each provider's in-flight requests are limited by
+        its adaptive concurrency limiter.
+
+        Args:
+            progress: Optional ProgressTracker notified as each cell completes
+            budget: Optional Budget; once exhausted no new cells are started
+            cache: Optional dict of cell key -> Result from earlier runs; cells with a
+                   cached successful result are not run again, and the dict is updated
+                   to hold the results of this run's cells only
+            cancel: Optional threading.Event; once set no new cells are started
+            select: Optional set of cell ids to run instead of the whole plan
+            quiet: Don't print the run header and summary
+        """
+
+        if not quiet:
+            print(f"Running evaluation: {self.id}")
+            print(f"Models: {len(self.plan.models)}, Tests: {len(self.tests)}")
+        if progress:
+            progress.start(self.id, len(select) if select is not None else len(self.plan))
+
+        def should_stop():
+            stopped_reason = budget.exhausted_reason if budget else None
+            if cancel is not None and cancel.is_set():
+                stopped_reason = "cancelled"
+            if stopped_reason and 'stopped_reason' not in self.result_collector.metadata:
+                if stopped_reason != "cancelled":
+                    print(f"⚠️  Budget exhausted, stopping: {stopped_reason}")
+                self.result_collector.metadata['stopped_reason'] = stopped_reason
+            return stopped_reason is not None
+
+        tracer = get_tracer()
+        with tracer.span("connections.warmup"):
+            # Open the first wave of connections before any latency is measured
+            self.plan.models.resolve_clients()
+            self.http_clients.warmup(self.limiters.initial_limit)
+
+        # One lane per endpoint, so a slow provider never holds up the others
+        lanes = self.plan.by_endpoint()
+        keys = set()
+        for endpoint, cells in lanes.items():
+            if select is not None:
+                cells = (cell for cell in cells if cell.id in select)
+            if cache is not None:
+                cells = self._uncached_cells(cells, cache, keys, progress)
+            lanes[endpoint] = cells
+
+        scheduler = Scheduler(self.limiters.max_workers(self.plan.models.endpoints))
+        run_cell = functools.partial(self._run_cell, should_stop=should_stop)
+        with tracer.span("evaluation.run", evaluation=self.id):
+            try:
+                for cell, response, exception in scheduler.run_lanes(run_cell, lanes, should_stop,
+                                                                     self.limiters.current_limit):
+                    if isinstance(exception, CellSkipped):
+                        continue
+                    result = self._result_of(cell, response, exception)
+                    remember = None
+                    if cache is not None and result.status == "success":
+                        remember = functools.partial(cache.__setitem__, cell.key)
+                    self._record(cell, result, budget, progress, then=remember)
+                    self.scorer.collect()
+            except KeyboardInterrupt:
+                print("\n⚠️  Interrupted, saving the results collected so far")
+                self.result_collector.metadata['stopped_reason'] = "interrupted"
+            self.scorer.collect(block=True)
+
+        if cache is not None and 'stopped_reason' not in self.result_collector.metadata:
+            # Forget results of cells that are no longer in the plan
+            for key in [key for key in cache if key not in keys]:
+                del cache[key]
+
+        return self.finalize(budget, quiet)
+
+    def finalize(self, budget=None, quiet=False):
+        """Order the results, attach run metadata and print the summary (unless quiet)."""
+        # Cells complete out of order; keep results in plan order
+        self.result_collector.sort_by_id({cell_id: index for index, cell_id in enumerate(self.plan.cell_ids())})
+
+        if budget:
+            self.result_collector.metadata['budget'] = budget.to_dict()
+        self.result_collector.metadata['circuit_breakers'] = self.circuit_breakers.to_dict()
+        self.result_collector.metadata['concurrency'] = self.limiters.to_dict()
+        self.result_collector.metadata['connections'] = self.http_clients.to_dict()
+        if self.scorer.scored:
+            self.result_collector.metadata['scoring'] = self.scorer.to_dict()
+
+        if quiet:
+            return self.result_collector
 
         # Print summary
         summary = self.result_collector.get_summary()
-        print(f"\nEvaluation Summary:")
+        print(f"\nEvaluation Summary ({self.id}):")
         print(f"  Total Results: {summary['total_results']}")
+        if summary['failed_results'] > 0:
+            print(f"  Failed Results: {summary['failed_results']} ({summary['errors_by_type']})")
         if summary['total_tokens'] > 0:
             print(f"  Total Tokens: {summary['total_tokens']}")
+        if summary['total_cost'] > 0:
+            print(f"  Total Cost: ${summary['total_cost']:.4f}")
         if summary['avg_latency'] > 0:
             print(f"  Avg Latency: {summary['avg_latency']:.0f}ms")
+        if 'latency_breakdown' in summary:
+            parts = [f"{key[:-3]} {value:.0f}ms" for key, value in summary['latency_breakdown']['avg'].items()
+                     if value is not None]
+            print(f"  Latency Breakdown (avg): {', '.join(parts)}")
         print(f"  Models: {summary['count_models']}")
         print(f"  Prompts: {summary['count_prompts']}")
+        if 'scores' in summary:
+            scores = summary['scores']
+            print(f"  Assertions Passed: {scores['passed_results']}/{scores['scored_results']} "
+                  f"({scores['pass_rate']:.1%})")
+            if scores['judge_tokens'] > 0:
+                print(f"  Judge Cost: ${scores['judge_cost']:.4f} ({scores['judge_tokens']} tokens, "
+                      f"included in the total cost)")
+        for endpoint, limiter in summary['concurrency'].items():
+            print(f"  Concurrency ({endpoint}): limit {limiter['limit']} (peak {limiter['peak_limit']})")
         return self.result_collector
-    
+
+    def _result_of(self, cell, response, exception):
+        """The Result of a cell from what the scheduler returned for it."""
+        if isinstance(exception, CellError):
+            logger.error("Cell %s failed: %s", cell.id, exception)
+            return self._build_result(cell, exception.response, exception)
+        if exception is not None:
+            # Never let one cell abort the run
+            logger.error("Cell %s failed", cell.id, exc_info=exception)
+            return self._build_result(cell, None, CellError(classify_error(exception), str(exception), attempts=1))
+        return self._build_result(cell, response)
+
+    def _record(self, cell, result, budget=None, progress=None, then=None):
+        """Account for a result and collect it, once scored when the test has assertions.
+
+        then(result) is called with the collected result; scored results are collected
+        by the next scorer.collect() in the run loop, and their judge calls charged then.
+        """
+        if budget:
+            budget.charge(result.cost, result.total_tokens)
+
+        def collect(result):
+            if budget and result.scores:
+                budget.charge(sum(score.get('judge_cost', 0.0) for score in result.scores),
+                              sum(score.get('judge_tokens', 0) for score in result.scores))
+            self.result_collector.add_result(result)
+            if progress:
+                progress.record(result)
+            if then:
+                then(result)
+
+        if cell.assertions and result.status == "success":
+            self.scorer.submit(result, cell.assertions, collect)
+        else:
+            collect(result)
+
+    def _uncached_cells(self, cells, cache, keys, progress=None):
+        """Yield the cells to run, recording cached results for the others."""
+        for cell in cells:
+            keys.add(cell.key)
+            cached = cache.get(cell.key)
+            if cached is None:
+                yield cell
+                continue
+            # Re-scored, in case the assertions changed since
+            self._record(cell, dataclasses.replace(cached, id=cell.id), progress=progress)
+            metadata = self.result_collector.metadata
+            metadata['reused_results'] = metadata.get('reused_results', 0) + 1
+
+    def _run_cell(self, cell, should_stop=None):
+        """Run one cell; called on a scheduler thread."""
+        logger.debug("Running cell: %s", cell.id)
+        with get_tracer().span("evaluation.cell", sampled=True, model=cell.model.id,
+                               prompt=cell.prompt_id, test=cell.test_id):
+            return cell.model.run(
+                cell.test,
+                system_prompt=cell.system_prompt,
+                formatted_tools=cell.tools,
+                tool_handler=cell.tool_handler,
+                should_stop=should_stop,
+            )
+
+    def _build_result(self, cell, response, error=None):
+        """Build the Result of a cell from its (possibly partial) response."""
+        model = cell.model
+        response = response or Response(output_messages=[], latencies=[])
+        # Tokens and cost cover every call of the tool loop
+        usage, cost = self.pricing.cost_of_responses(
+            response.output_messages, model.id, model.name
+        )
+        last_message = response.output_messages[-1].choices[0].message if response.output_messages else None
+
+        return Result(
+            id=cell.id,
+            model_id=model.id,
+            prompt_id=cell.prompt_id,
+            test_id=cell.test_id,
+            input_messages=cell.test['messages'],
+            output_content=last_message.content if last_message else None,
+            output_messages=[r.choices[0].message.to_dict() for r in response.output_messages],
+            completion_tokens=usage.completion_tokens,
+            prompt_tokens=usage.prompt_tokens,
+            total_tokens=usage.total_tokens,
+            cached_tokens=usage.cached_tokens,
+            cost=cost,
+            latency_ms=sum(response.latencies),
+            connect_ms=response.connect_ms,
+            latency_breakdown={key: None if value is None else round(value, 1)
+                               for key, value in response.breakdown.items()},
+            status="error" if error else "success",
+            error_type=error.error_type if error else None,
+            error_message=error.message if error else None,
+            attempts=error.attempts if error else response.attempts,
+        )
+
     def get_results(self):
         """Get all results for this evaluation."""
         return [r.to_dict() for r in self.result_collector.results]
-    
+
     def get_results_summary(self):
         """Get a summary of results for this evaluation."""
         return self.result_collector.get_summary()
-    
+
     def export_results(self, filepath):
         """Export results to JSON file."""
-        self.result_collector.export_to_json(filepath)
-    
+        with get_tracer().span("results.export", path=str(filepath)):
+            self.result_collector.export_to_json(filepath)
+
     def close(self):
-        """No database connection to close."""
-        pass
-    
+        """Close the pooled HTTP connections and scoring pool, unless they are shared with other runs."""
+        if self._owns_http_clients:
+            self.http_clients.close()
+        if self._owns_scorer:
+            self.scorer.close()
+
     def __enter__(self):
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
\ No newline at end of file
+        self.close()
@@ -0,0 +1,275 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import litellm
+from litellm.llms.custom_httpx.http_handler import HTTPHandler
+from litellm.secret_managers.main import get_secret_str
+
+logger = logging.getLogger(__name__)
+
+# litellm routes these providers through the OpenAI SDK, which takes an OpenAI client
+OPENAI_SDK_PROVIDERS = {"openai", "custom_openai", "text-completion-openai"}
+
+DEFAULT_BASE_URLS = {
+    "openai": ("OPENAI_BASE_URL", "OPENAI_API_BASE", "https://api.openai.com/v1"),
+    "anthropic": ("ANTHROPIC_BASE_URL", "ANTHROPIC_API_BASE", "https://api.anthropic.com"),
+}
+
+# Response headers in which providers report their own processing time, in ms
+PROCESSING_TIME_HEADERS = ("openai-processing-ms", "x-envoy-upstream-service-time")
+
+# Connection setup time of the requests made by the current thread
+_connect_time = threading.local()
+# perf_counter timestamps of the last request made by the current thread
+_request_timing = threading.local()
+
+
+def take_connect_ms() -> int:
+    """Connection setup time (TCP + TLS) spent by this thread since the last call, in ms."""
+    elapsed = getattr(_connect_time, "seconds", 0.0)
+    _connect_time.seconds = 0.0
+    return int(elapsed * 1000)
+
+
+def take_request_timing() -> Dict[str, float]:
+    """
+    Timings of this thread's last request through a pooled client since the last call:
+    sent_at, headers_at and body_at (perf_counter seconds) and provider_ms when the
+    provider reported its processing time. Empty for requests made outside the pool.
+    """
+    timing = getattr(_request_timing, "value", None)
+    _request_timing.value = None
+    return timing or {}
+
+
+class _TimedStream(httpx.SyncByteStream):
+    """Response body stream noting when the last byte has been read."""
+
+    def __init__(self, stream, timing: Dict[str, float]):
+        self._stream = stream
+        self._timing = timing
+
+    def __iter__(self):
+        for chunk in self._stream:
+            yield chunk
+        self._timing["body_at"] = time.perf_counter()
+
+    def close(self):
+        self._stream.close()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PooledClient:
+    """A keep-alive HTTP client for one base URL, timing every new connection it opens."""
+
+    def __init__(self, base_url: str, pool_size: int, http2: bool, keepalive_expiry: float):
+        self.base_url = base_url
+        self.http2 = http2
+        self.pool_size = pool_size
+        self.connections_opened = 0
+        self.connect_seconds = 0.0
+        self.warmup_ms: Optional[float] = None
+        self.warmup_connect_ms: Optional[float] = None
+        self._lock = threading.Lock()
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=None,
+            event_hooks={"request": [self._attach_trace], "response": [self._time_response]},
+        )
+        self._sdk_clients: Dict[Tuple[str, str], Any] = {}
+        self._http_handler = HTTPHandler(client=self.client)
+
+    def _attach_trace(self, request: httpx.Request):
+        request.extensions["trace"] = self._trace
+        _request_timing.value = {"sent_at": time.perf_counter()}
+
+    def _time_response(self, response: httpx.Response):
+        # Called once the headers are in; the body is timed as it is read
+        timing = getattr(_request_timing, "value", None)
+        if timing is None:
+            return
+        timing["headers_at"] = time.perf_counter()
+        for header in PROCESSING_TIME_HEADERS:
+            value = response.headers.get(header)
+            if value:
+                try:
+                    timing["provider_ms"] = float(value)
+                    break
+                except ValueError:
+                    pass
+        response.stream = _TimedStream(response.stream, timing)
+
+    def _trace(self, event_name: str, info: Dict[str, Any]):
+        # httpcore reports connection.connect_tcp.* and connection.start_tls.* around new connections
+        if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            _connect_time.started = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            started = getattr(_connect_time, "started", None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            _connect_time.started = None
+            _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + elapsed
+            with self._lock:
+                self.connect_seconds += elapsed
+                if event_name == "connection.connect_tcp.complete":
+                    self.connections_opened += 1
+
+    def litellm_client(self, provider: str, api_key: Optional[str]):
+        """The client object litellm.completion accepts for this provider."""
+        if provider in OPENAI_SDK_PROVIDERS:
+            if not api_key:
+                return None
+            key = (provider, api_key)
+            with self._lock:
+                if key not in self._sdk_clients:
+                    import openai
+                    # litellm handles retries itself (and rawbench on top of it)
+                    self._sdk_clients[key] = openai.OpenAI(api_key=api_key, base_url=self.base_url,
+                                                           http_client=self.client, max_retries=0)
+                return self._sdk_clients[key]
+        return self._http_handler
+
+    def warmup(self, connections: int):
+        """Open connections ahead of the run; any HTTP answer means the connection is up."""
+        start = time.perf_counter()
+        connect_before = self.connect_seconds
+        with self._lock:
+            sdk_clients = list(self._sdk_clients.values())
+        for sdk_client in sdk_clients:
+            # The OpenAI SDK imports its resources on first use, which would land in the first call's latency
+            sdk_client.chat.completions
+
+        def touch(_):
+            try:
+                self.client.get(self.base_url, timeout=10)
+            except httpx.HTTPError as e:
+                logger.warning("Warmup of %s failed: %s", self.base_url, e)
+
+        # HTTP/2 multiplexes every request over a single connection
+        count = 1 if self.http2 else max(1, min(connections, self.pool_size))
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            list(pool.map(touch, range(count)))
+        self.warmup_ms = (time.perf_counter() - start) * 1000
+        self.warmup_connect_ms = (self.connect_seconds - connect_before) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "http2": self.http2,
+                "pool_size": self.pool_size,
+                "connections_opened": self.connections_opened,
+                # Includes the connections opened during warmup
+                "connect_ms": self.connect_seconds * 1000,
+                "warmup_ms": self.warmup_ms,
+                "warmup_connect_ms": self.warmup_connect_ms,
+            }
+
+    def close(self):
+        self.client.close()
+
+
+class HttpClientRegistry:
+    """
+    One pooled HTTP client per provider base URL, shared by every model of a run.
+
+    Configured from the 'execution' block:
+
+        execution:
+          http:
+            pool_size: 32          # connections per base URL
+            http2: true            # when the h2 package is installed
+            keepalive_expiry: 60   # seconds an idle connection is kept
+            warmup: true           # open connections before the first cell
+            enabled: true          # false leaves connection handling to litellm
+    """
+
+    def __init__(self, pool_size: int = 32, http2: bool = True, keepalive_expiry: float = 60.0,
+                 warmup: bool = True, enabled: bool = True):
+        self.pool_size = pool_size
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.info("h2 is not installed, using HTTP/1.1 (pip install 'raw-bench[http2]')")
+        self.keepalive_expiry = keepalive_expiry
+        self.warmup_enabled = warmup
+        self.enabled = enabled
+        self._clients: Dict[str, PooledClient] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, execution: Dict[str, Any]) -> "HttpClientRegistry":
+        http = execution.get("http", {})
+        return cls(
+            pool_size=http.get("pool_size", 32),
+            http2=http.get("http2", True),
+            keepalive_expiry=http.get("keepalive_expiry", 60.0),
+            warmup=http.get("warmup", True),
+            enabled=http.get("enabled", True),
+        )
+
+    @staticmethod
+    def resolve(model_name: str, api_base: Optional[str] = None) -> Tuple[str, Optional[str], Optional[str]]:
+        """The litellm provider, base URL and API key a model is called with."""
+        _, provider, api_key, base_url = litellm.get_llm_provider(model=model_name, api_base=api_base)
+        if not base_url and provider in DEFAULT_BASE_URLS:
+            *env_names, default = DEFAULT_BASE_URLS[provider]
+            base_url = next((os.environ[name] for name in env_names if os.environ.get(name)), default)
+        if not api_key:
+            api_key = get_secret_str(f"{provider.upper()}_API_KEY") or litellm.api_key
+        return provider, base_url, api_key
+
+    def client_for(self, model_name: str, api_base: Optional[str] = None):
+        """The pooled client to pass to litellm.completion, or None to let litellm decide."""
+        if not self.enabled:
+            return None
+        try:
+            provider, base_url, api_key = self.resolve(model_name, api_base)
+        except Exception as e:
+            logger.debug("No pooled client for %s: %s", model_name, e)
+            return None
+        if not base_url:
+            return None
+        return self._pooled(base_url).litellm_client(provider, api_key)
+
+    def _pooled(self, base_url: str) -> PooledClient:
+        base_url = base_url.rstrip("/")
+        with self._lock:
+            if base_url not in self._clients:
+                self._clients[base_url] = PooledClient(base_url, self.pool_size, self.http2,
+                                                       self.keepalive_expiry)
+            return self._clients[base_url]
+
+    def warmup(self, connections: int = 1):
+        """Open connections to every base URL used so far and not warmed up yet, in parallel."""
+        if not self.enabled or not self.warmup_enabled:
+            return
+        with self._lock:
+            clients = [client for client in self._clients.values() if client.warmup_ms is None]
+        if not clients:
+            return
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            list(pool.map(lambda client: client.warmup(connections), clients))
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {base_url: client.to_dict() for base_url, client in self._clients.items()}
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
@@ -0,0 +1,311 @@
+"""
+Open-loop load testing of model endpoints.
+
+Requests are sent on a fixed arrival schedule (constant or Poisson) regardless of
+how fast the endpoint answers, so queueing at a saturated endpoint shows up as
+latency instead of silently lowering the request rate.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import litellm
+
+from .plan import Cell, ExecutionPlan
+from .progress import percentile
+from .retry import classify_error
+
+logger = logging.getLogger(__name__)
+
+CONSTANT = "constant"
+POISSON = "poisson"
+
+# A step is past saturation when it completes less than this share of the sent rate...
+SATURATION_THROUGHPUT_RATIO = 0.9
+# ...or fails more than this share of its requests
+SATURATION_ERROR_RATE = 0.05
+
+
+@dataclass(frozen=True)
+class LoadStep:
+    """Send requests at qps requests per second for duration seconds."""
+    qps: float
+    duration: float
+
+
+class LoadProfile:
+    """
+    The arrival schedule of a load test, configured from a 'load' block:
+
+        load:
+          arrival: poisson       # or constant
+          steps:                 # explicit steps...
+            - qps: 1
+              duration: 30
+          ramp:                  # ...or a stepped ramp
+            start: 1
+            stop: 16
+            factor: 2            # or increment: 2
+            duration: 30
+          max_in_flight: 256     # cap on concurrent requests
+          timeout: 60            # seconds per request
+    """
+
+    def __init__(self, steps: Sequence[LoadStep], arrival: str = CONSTANT, max_in_flight: int = 256,
+                 timeout: Optional[float] = 60.0, seed: Optional[int] = None):
+        if not steps:
+            raise ValueError("A load test needs at least one step")
+        if arrival not in (CONSTANT, POISSON):
+            raise ValueError(f"Unknown arrival process: {arrival}")
+        self.steps = list(steps)
+        self.arrival = arrival
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.seed = seed
+
+    @classmethod
+    def from_config(cls, load: Dict[str, Any], **overrides: Any) -> "LoadProfile":
+        """Build a profile from a 'load' config block; non-None overrides (CLI options) win."""
+        options = dict(load or {})
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        duration = options.get("duration", 30)
+
+        if options.get("qps"):
+            steps = [LoadStep(float(qps), duration) for qps in options["qps"]]
+        elif options.get("steps"):
+            steps = [LoadStep(float(step["qps"]), step.get("duration", duration)) for step in options["steps"]]
+        elif options.get("ramp"):
+            steps = cls.ramp(**options["ramp"])
+        else:
+            steps = [LoadStep(1.0, duration)]
+
+        return cls(
+            steps,
+            arrival=options.get("arrival", CONSTANT),
+            max_in_flight=options.get("max_in_flight", 256),
+            timeout=options.get("timeout", 60.0),
+            seed=options.get("seed"),
+        )
+
+    @staticmethod
+    def ramp(start: float, stop: float, duration: float = 30, factor: Optional[float] = None,
+             increment: Optional[float] = None) -> List[LoadStep]:
+        """Steps from start to stop qps, multiplying by factor or adding increment each step."""
+        if not factor and not increment:
+            factor = 2
+        if (factor and factor <= 1) or (increment is not None and increment <= 0):
+            raise ValueError("A load ramp must increase")
+        steps = []
+        qps = float(start)
+        while qps <= stop:
+            steps.append(LoadStep(qps, duration))
+            qps = qps * factor if factor else qps + increment
+        return steps
+
+    def arrivals(self, step: LoadStep, rng: random.Random) -> Iterator[float]:
+        """Send offsets in seconds from the start of a step."""
+        offset = 0.0
+        while True:
+            if self.arrival == POISSON:
+                offset += rng.expovariate(step.qps)
+            if offset >= step.duration:
+                return
+            yield offset
+            if self.arrival == CONSTANT:
+                offset += 1.0 / step.qps
+
+
+class LoadRunner:
+    """Replays the cells of a plan against one model at a time, step by step."""
+
+    def __init__(self, plan: ExecutionPlan, profile: LoadProfile):
+        self.plan = plan
+        self.profile = profile
+
+    def run(self, model_ids: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        # Models are built on access, so cells are grouped by model id rather than by Model object
+        cells_by_model: Dict[str, List[Cell]] = {}
+        for cell in self.plan:
+            if not model_ids or cell.model.id in model_ids:
+                cells_by_model.setdefault(cell.model.id, []).append(cell)
+        if not cells_by_model:
+            raise ValueError(f"No models matching {', '.join(model_ids)} in configuration")
+
+        rng = random.Random(self.profile.seed)
+        steps = []
+        for model_id, cells in cells_by_model.items():
+            for index, step in enumerate(self.profile.steps):
+                print(f"🚦 {model_id}: step {index + 1}/{len(self.profile.steps)}, "
+                      f"{step.qps:g} qps for {step.duration:g}s ({self.profile.arrival})")
+                records = self._run_step(cells, step, rng)
+                stats = step_stats(records, step)
+                stats.update({"model_id": model_id, "step": index})
+                steps.append(stats)
+                print(f"   throughput {stats['throughput_rps']:.2f} rps, "
+                      f"p50 {stats['latency_ms']['p50']:.0f}ms, p99 {stats['latency_ms']['p99']:.0f}ms, "
+                      f"errors {stats['error_rate']:.1%}")
+
+        return {
+            "type": "load",
+            "summary": load_summary(self.plan.evaluation_id, self.profile, steps),
+            "steps": steps,
+            "results": [],
+        }
+
+    def _run_step(self, cells: List[Cell], step: LoadStep, rng: random.Random) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+
+        def send(cell: Cell, scheduled: float):
+            record = self._call(cell, scheduled)
+            with lock:
+                records.append(record)
+
+        # The pool only bounds concurrency; sends are scheduled by the clock, not by completions
+        with ThreadPoolExecutor(max_workers=self.profile.max_in_flight,
+                                thread_name_prefix="rawbench-load") as pool:
+            start = time.perf_counter()
+            for sent, offset in enumerate(self.profile.arrivals(step, rng)):
+                scheduled = start + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(send, cells[sent % len(cells)], scheduled)
+        # Leaving the pool drains the step, so requests never spill into the next one
+        for record in records:
+            record["end_s"] -= start
+        return records
+
+    def _call(self, cell: Cell, scheduled: float) -> Dict[str, Any]:
+        model = cell.model
+        messages = [{"role": "system", "content": cell.system_prompt}] + cell.test["messages"]
+        started = time.perf_counter()
+        first_token = None
+        completion_tokens = 0
+        error_type = None
+        try:
+            # The same request as Model._complete, streamed to time the first token
+            stream = litellm.completion(
+                model=model.name,
+                messages=messages,
+                temperature=model.temperature,
+                max_tokens=model.max_tokens,
+                top_p=model.top_p,
+                frequency_penalty=model.frequency_penalty,
+                presence_penalty=model.presence_penalty,
+                seed=model.seed,
+                tools=cell.tools,
+                tool_choice="auto" if cell.tools else None,
+                timeout=self.profile.timeout,
+                api_base=model.api_base,
+                client=model.client,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            chunks = 0
+            for chunk in stream:
+                if first_token is None and chunk.choices:
+                    delta = chunk.choices[0].delta
+                    if getattr(delta, "content", None) or getattr(delta, "tool_calls", None):
+                        first_token = time.perf_counter()
+                chunks += 1
+                usage = getattr(chunk, "usage", None)
+                if usage and usage.completion_tokens:
+                    completion_tokens = usage.completion_tokens
+            completion_tokens = completion_tokens or chunks
+        except Exception as e:
+            error_type = classify_error(e)
+            logger.debug("Load request to %s failed: %s", model.id, e)
+        end = time.perf_counter()
+        return {
+            # Latency counts from the scheduled send time, so client-side queueing is not hidden
+            "latency_ms": (end - scheduled) * 1000,
+            "queue_ms": max(started - scheduled, 0.0) * 1000,
+            "ttft_ms": (first_token - scheduled) * 1000 if first_token else None,
+            "completion_tokens": completion_tokens,
+            "error_type": error_type,
+            "end_s": end,
+        }
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else 0.0,
+    }
+
+
+def step_stats(records: List[Dict[str, Any]], step: LoadStep) -> Dict[str, Any]:
+    """Aggregate the requests of one load step."""
+    successes = [record for record in records if record["error_type"] is None]
+    errors_by_type: Dict[str, int] = {}
+    for record in records:
+        if record["error_type"]:
+            errors_by_type[record["error_type"]] = errors_by_type.get(record["error_type"], 0) + 1
+    # The step lasts until its last request completed
+    elapsed = max([step.duration] + [record["end_s"] for record in records])
+    return {
+        "offered_qps": step.qps,
+        # Poisson arrivals only match the offered rate on average
+        "sent_qps": len(records) / step.duration,
+        "duration_s": step.duration,
+        "elapsed_s": elapsed,
+        "requests": len(records),
+        "successes": len(successes),
+        "errors": len(records) - len(successes),
+        "error_rate": (len(records) - len(successes)) / len(records) if records else 0.0,
+        "errors_by_type": errors_by_type,
+        "throughput_rps": len(successes) / elapsed if elapsed else 0.0,
+        "output_tokens_per_sec": sum(record["completion_tokens"] for record in successes) / elapsed
+        if elapsed else 0.0,
+        "latency_ms": _distribution([record["latency_ms"] for record in successes]),
+        "ttft_ms": _distribution([record["ttft_ms"] for record in successes if record["ttft_ms"] is not None]),
+        "queue_ms": _distribution([record["queue_ms"] for record in records]),
+    }
+
+
+def is_saturated(stats: Dict[str, Any]) -> bool:
+    return (stats["throughput_rps"] < SATURATION_THROUGHPUT_RATIO * stats["sent_qps"]
+            or stats["error_rate"] > SATURATION_ERROR_RATE)
+
+
+def load_summary(evaluation_id: str, profile: LoadProfile, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Saturation curve summary, one entry per model."""
+    models: Dict[str, Dict[str, Any]] = {}
+    for stats in steps:
+        model = models.setdefault(stats["model_id"], {
+            "max_throughput_rps": 0.0,
+            "saturation_qps": None,
+            "max_unsaturated_qps": None,
+        })
+        model["max_throughput_rps"] = max(model["max_throughput_rps"], stats["throughput_rps"])
+        if is_saturated(stats):
+            if model["saturation_qps"] is None:
+                model["saturation_qps"] = stats["offered_qps"]
+        elif model["saturation_qps"] is None:
+            model["max_unsaturated_qps"] = stats["offered_qps"]
+
+    requests = sum(stats["requests"] for stats in steps)
+    successes = sum(stats["successes"] for stats in steps)
+    return {
+        "type": "load",
+        "evaluation_id": evaluation_id,
+        "arrival": profile.arrival,
+        "steps": len(steps),
+        "total_results": requests,
+        "successful_results": successes,
+        "failed_results": requests - successes,
+        "success_rate": successes / requests if requests else 0.0,
+        "avg_latency": (sum(stats["latency_ms"]["mean"] * stats["successes"] for stats in steps) / successes
+                        if successes else 0.0),
+        "count_models": len(models),
+        "models": models,
+    }
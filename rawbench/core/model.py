@@ -1,21 +1,70 @@
 import os
 import time
 import json
+import logging
 import litellm
-from .tool_execution import ToolExecutionHandler
+from .http_clients import take_connect_ms, take_request_timing
+from .retry import CIRCUIT_OPEN, PROVIDER_ERRORS, CellError, CellSkipped, RetryPolicy, classify_error
+from .tool_execution import ToolExecutionHandler, format_tools
+from ..utils.instrumentation import get_tracer
 from litellm import ModelResponse
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
 MAX_ITERATIONS = 10
 
+logger = logging.getLogger(__name__)
+
+# Process-wide litellm settings, set once rather than per model or per call
+litellm.set_verbose = False
+litellm.drop_params = True
+
 @dataclass
 class Response:
     output_messages: List[ModelResponse]
     latencies: List[int]
+    # API requests made, including retried ones
+    attempts: int = 0
+    # Time spent opening connections (TCP + TLS), excluded from latencies
+    connect_ms: int = 0
+    # Where the time of the calls went, summed over calls (see call_breakdown)
+    breakdown: Dict[str, Optional[float]] = field(default_factory=dict)
+
+    def add_breakdown(self, breakdown: Dict[str, Optional[float]]):
+        for key, value in breakdown.items():
+            if value is None:
+                self.breakdown.setdefault(key, None)
+            else:
+                self.breakdown[key] = (self.breakdown.get(key) or 0.0) + value
+
+
+def call_breakdown(queue_s: float, started: float, finished: float, connect_ms: int,
+                   timing: Dict[str, float]) -> Dict[str, Optional[float]]:
+    """
+    Split one call into, in ms:
+
+        queue_ms     waiting for a concurrency slot, before the call
+        connect_ms   opening connections (TCP + TLS)
+        server_ms    request sent to response headers, minus connect: network round trip + provider processing
+        provider_ms  processing time reported by the provider in response headers, part of server_ms
+        transfer_ms  reading the response body
+        parse_ms     client work: building the request and parsing the response
+
+    Parts that can't be measured (calls outside the pooled clients, providers that don't
+    report processing time) are None.
+    """
+    breakdown = {"queue_ms": queue_s * 1000, "connect_ms": float(connect_ms), "server_ms": None,
+                 "provider_ms": timing.get("provider_ms"), "transfer_ms": None, "parse_ms": None}
+    if "headers_at" in timing and "body_at" in timing:
+        breakdown["server_ms"] = max((timing["headers_at"] - timing["sent_at"]) * 1000 - connect_ms, 0.0)
+        breakdown["transfer_ms"] = (timing["body_at"] - timing["headers_at"]) * 1000
+        breakdown["parse_ms"] = max(((finished - started) - (timing["body_at"] - timing["sent_at"])) * 1000, 0.0)
+    return breakdown
 
 class Model:
-    def __init__(self, id, name, provider, temperature=0.0, max_tokens=1000, top_p=1.0, frequency_penalty=0.0, presence_penalty=0.0, seed=None):
+    def __init__(self, id, name, provider, temperature=0.0, max_tokens=1000, top_p=1.0, frequency_penalty=0.0, presence_penalty=0.0, seed=None,
+                 timeout=None, retry_policy=None, circuit_breaker=None, limiter=None,
+                 api_base=None, client=None):
         self.id = id
         self.name = name
         self.provider = provider
@@ -25,12 +74,24 @@ class Model:
         self.frequency_penalty = frequency_penalty
         self.presence_penalty = presence_penalty
         self.seed = seed
-        
-        # Set up litellm
-        litellm.set_verbose = False
-        
-    def run(self, test, tools=None, tool_execution_config=None, system_prompt=None) -> Response:
-        """Run a test against this model with tool execution support."""
+        # Per-request timeout in seconds (None uses litellm's default)
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        # Adaptive limit on in-flight requests to this model's provider
+        self.limiter = limiter
+        # Endpoint override and the pooled HTTP client shared with other models of the run
+        self.api_base = api_base
+        self.client = client
+
+    def run(self, test, tools=None, tool_execution_config=None, system_prompt=None,
+            formatted_tools=None, tool_handler=None, should_stop=None) -> Response:
+        """Run a test against this model with tool execution support.
+
+        Compiled execution plans pass pre-formatted tool schemas and a shared tool
+        handler; otherwise they are built from tools and tool_execution_config.
+        should_stop lets a run that stopped while the cell waited for a slot skip it.
+        """
         messages = []
         response = Response(output_messages=[], latencies=[])
         
@@ -42,48 +103,22 @@ class Model:
         messages.extend(test['messages'])
         
         # Prepare tools for API
-        formatted_tools = None
-        if tools:
-            formatted_tools = [{
-                "type": "function",
-                "function": {
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "parameters": tool["parameters"]
-                }
-            } for tool in tools]
+        if formatted_tools is None:
+            formatted_tools = format_tools(tools)
         
         # Initialize tool handler
-        tool_handler = None
-        if tool_execution_config:
+        if tool_handler is None and tool_execution_config:
             tool_handler = ToolExecutionHandler(tool_execution_config, tools)
         
         # Tool execution loop
         iteration = 0
         max_iterations = tool_handler.max_iterations if tool_handler and tool_handler.max_iterations else MAX_ITERATIONS
         
+        tracer = get_tracer()
         while iteration < max_iterations:
             # Make API call
-
-            litellm.drop_params = True
-            start_time = time.time()
-    
-            model_response = litellm.completion(
-                model=self.name,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                top_p=self.top_p,
-                frequency_penalty=self.frequency_penalty,
-                presence_penalty=self.presence_penalty,
-                seed=self.seed,
-                tools=formatted_tools,
-                tool_choice="auto" if formatted_tools else None
-            )
-            
-            # Track response
-            response.latencies.append(int((time.time() - start_time) * 1000))
-            print(f"Model Response: {model_response}")
+            model_response = self._complete(messages, formatted_tools, response, should_stop)
+            logger.debug("Model response: %s", model_response)
             response.output_messages.append(model_response)
             
             # Check for tool calls
@@ -97,8 +132,14 @@ class Model:
                 # Execute tools and add results
                 for tool_call in model_response.choices[0].message.tool_calls:
                     tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-                    tool_result = tool_handler.execute_tool(tool_name, tool_args)
+                    with tracer.span("tool.call", level=logging.DEBUG, tool=tool_name):
+                        try:
+                            tool_args = json.loads(tool_call.function.arguments or "{}")
+                        except json.JSONDecodeError as e:
+                            # Report malformed arguments back to the model instead of failing the cell
+                            tool_result = json.dumps({"error": f"Invalid JSON arguments for {tool_name}: {e}"})
+                        else:
+                            tool_result = tool_handler.execute_tool(tool_name, tool_args)
                     
                     messages.append({
                         "role": "tool",
@@ -112,4 +153,93 @@ class Model:
                 # No tool calls, we're done
                 break
         
-        return response
\ No newline at end of file
+        return response
+
+    def _complete(self, messages, formatted_tools, response: Response,
+                  should_stop: Optional[Callable[[], bool]] = None) -> ModelResponse:
+        """
+        Make one API call, retrying per the retry policy; raises CellError when giving up.
+
+        should_stop is re-checked once a slot is acquired for the cell's first call, since
+        the run may have been stopped while the cell waited; CellSkipped is raised then.
+        """
+        tracer = get_tracer()
+        retry = 0
+        while True:
+            if self.circuit_breaker and not self.circuit_breaker.allow():
+                raise CellError(CIRCUIT_OPEN, f"Circuit breaker open for provider {self.provider}",
+                                response.attempts, response)
+
+            response.attempts += 1
+            try:
+                with tracer.span("model.call", level=logging.DEBUG, model=self.name,
+                                 attempt=response.attempts) as span:
+                    queued_at = time.perf_counter()
+                    if self.limiter:
+                        self.limiter.acquire()
+                    if should_stop and response.attempts == 1 and not response.output_messages and should_stop():
+                        if self.limiter:
+                            self.limiter.release_unused()
+                        raise CellSkipped(self.id)
+                    take_connect_ms()
+                    take_request_timing()
+                    start_time = time.perf_counter()
+                    queue_s = start_time - queued_at
+                    error_type = None
+                    try:
+                        model_response = litellm.completion(
+                            model=self.name,
+                            messages=messages,
+                            temperature=self.temperature,
+                            max_tokens=self.max_tokens,
+                            top_p=self.top_p,
+                            frequency_penalty=self.frequency_penalty,
+                            presence_penalty=self.presence_penalty,
+                            seed=self.seed,
+                            tools=formatted_tools,
+                            tool_choice="auto" if formatted_tools else None,
+                            timeout=self.timeout,
+                            api_base=self.api_base,
+                            client=self.client,
+                        )
+                    except Exception as e:
+                        error_type = classify_error(e)
+                        raise
+                    finally:
+                        finished = time.perf_counter()
+                        if self.limiter:
+                            self.limiter.release(finished - start_time, error_type)
+                    
+                    # Track response; connection setup is reported separately from latency
+                    connect_ms = take_connect_ms()
+                    breakdown = call_breakdown(queue_s, start_time, finished, connect_ms, take_request_timing())
+                    response.connect_ms += connect_ms
+                    response.latencies.append(int((finished - start_time) * 1000) - connect_ms)
+                    response.add_breakdown(breakdown)
+                    span.set_attributes(
+                        latency_ms=response.latencies[-1],
+                        connect_ms=connect_ms,
+                        **{key: value for key, value in breakdown.items()
+                           if value is not None and key != "connect_ms"},
+                        prompt_tokens=model_response.usage.prompt_tokens,
+                        completion_tokens=model_response.usage.completion_tokens,
+                        finish_reason=model_response.choices[0].finish_reason,
+                    )
+            except CellSkipped:
+                raise
+            except Exception as e:
+                error_type = classify_error(e)
+                retry += 1
+                if self.retry_policy.should_retry(error_type, retry):
+                    delay = self.retry_policy.backoff(retry)
+                    logger.warning("%s call failed (%s: %s), retry %d in %.1fs",
+                                   self.name, error_type, e, retry, delay)
+                    time.sleep(delay)
+                    continue
+                if self.circuit_breaker and error_type in PROVIDER_ERRORS:
+                    self.circuit_breaker.record_failure()
+                raise CellError(error_type, str(e), response.attempts, response) from e
+
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success()
+            return model_response
@@ -0,0 +1,287 @@
+import hashlib
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .concurrency import ConcurrencyLimiterRegistry, endpoint_key
+from .http_clients import HttpClientRegistry
+from .model import Model
+from .retry import CircuitBreakerRegistry, RetryPolicy
+from .scoring import Assertion, compile_assertions
+from .sweep import ModelConfigs
+from .tool_execution import ToolExecutionHandler, format_tools
+
+
+def render_prompt(system_prompt: str, variables: Dict[str, Any]) -> str:
+    """Replace {{variable_name}} placeholders with resolved variable values."""
+    for var_id, var_value in variables.items():
+        system_prompt = system_prompt.replace(f"{{{{{var_id}}}}}", str(var_value))
+    return system_prompt
+
+
+def fingerprint(value: Any) -> str:
+    """Short stable hash of a JSON-serializable value."""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Cell:
+    """One model×prompt×test combination; heavy parts are shared between cells by reference."""
+    index: int
+    id: str
+    model: Model
+    prompt_id: str
+    system_prompt: str
+    test: Dict[str, Any]
+    tools: Optional[List[Dict[str, Any]]]
+    tool_handler: Optional[ToolExecutionHandler]
+    # Fingerprint of everything that determines the cell's output (model settings,
+    # rendered prompt, test, tools and mocks); equal keys mean a result can be reused
+    key: str = ""
+    # Checks of the test's 'assert' block; not part of the key, so reused results are re-scored
+    assertions: Tuple[Assertion, ...] = ()
+
+    @property
+    def test_id(self) -> str:
+        return self.test['id']
+
+
+class ModelSet(Sequence):
+    """
+    The models of a plan, built from their configs on access.
+
+    Swept models expand into one Model per variant; pooled clients are resolved
+    once per model name and endpoint and shared by every variant.
+    """
+
+    def __init__(self, configs: ModelConfigs, timeout: Optional[float] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                 limiters: Optional[ConcurrencyLimiterRegistry] = None,
+                 http_clients: Optional[HttpClientRegistry] = None):
+        self.configs = configs
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.limiters = limiters
+        self.http_clients = http_clients
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        return self.build(self.configs[index])
+
+    def __iter__(self) -> Iterator[Model]:
+        for model_config in self.configs:
+            yield self.build(model_config)
+
+    @property
+    def providers(self) -> List[str]:
+        """Providers of the models, without expanding sweeps."""
+        return [model_config['provider'] for model_config in self.configs.base_configs]
+
+    @property
+    def endpoints(self) -> List[str]:
+        """Limiter and breaker keys of the models (provider and api_base), without expanding sweeps."""
+        return [endpoint_key(model_config['provider'], model_config.get('api_base'))
+                for model_config in self.configs.base_configs]
+
+    def _client(self, name: str, api_base: Optional[str]):
+        if self.http_clients is None:
+            return None
+        key = (name, api_base)
+        if key not in self._clients:
+            self._clients[key] = self.http_clients.client_for(name, api_base)
+        return self._clients[key]
+
+    def resolve_clients(self):
+        """Create the pooled clients of every model up front, so they can be warmed up before the run."""
+        for model_config in self.configs.base_configs:
+            self._client(model_config['name'], model_config.get('api_base'))
+
+    def build(self, model_config: Dict[str, Any]) -> Model:
+        provider = model_config['provider']
+        # Endpoints of one provider are limited and broken separately
+        endpoint = endpoint_key(provider, model_config.get('api_base'))
+        return Model(
+            model_config['id'],
+            model_config['name'],
+            provider,
+            model_config.get('temperature', 0.0),
+            model_config.get('max_tokens', 1000),
+            model_config.get('top_p', 1.0),
+            model_config.get('frequency_penalty', 0.0),
+            model_config.get('presence_penalty', 0.0),
+            model_config.get('seed', None),
+            timeout=model_config.get('timeout', self.timeout),
+            retry_policy=self.retry_policy,
+            circuit_breaker=self.circuit_breakers.get(endpoint) if self.circuit_breakers else None,
+            limiter=self.limiters.get(endpoint) if self.limiters else None,
+            api_base=model_config.get('api_base'),
+            client=self._client(model_config['name'], model_config.get('api_base')),
+        )
+
+
+class ExecutionPlan:
+    """
+    An evaluation config compiled once into the cells to run.
+
+    System prompts are rendered once per prompt, tool schemas are formatted once
+    per evaluation and tool handlers (with their indexed mocks) once per test, so
+    the inner loop only looks things up. Cells are generated on demand in a fixed
+    model → prompt → test order, so model sweeps are never materialized up front.
+    """
+
+    def __init__(self, evaluation_id: str, models: ModelSet, prompts: Tuple[Tuple[str, str], ...],
+                 tests: Tuple[Dict[str, Any], ...], tools: Optional[List[Dict[str, Any]]] = None,
+                 tool_handlers: Optional[Sequence] = None, tool_configs: Optional[List[Dict[str, Any]]] = None,
+                 assertions: Optional[Sequence] = None):
+        self.evaluation_id = evaluation_id
+        self.models = models
+        self.prompts = prompts
+        self.tests = tests
+        self.tools = tools
+        self.tool_handlers = tuple(tool_handlers) if tool_handlers is not None else (None,) * len(tests)
+        self.assertions = tuple(assertions) if assertions is not None else ((),) * len(tests)
+        self._prompt_keys = tuple(fingerprint(prompt) for prompt in prompts)
+        # Tool configs hold the global mocks, so they are part of every test's key
+        self._test_keys = tuple(
+            fingerprint([{key: value for key, value in test.items() if key != 'assert'}, tool_configs])
+            for test in tests
+        )
+
+    @classmethod
+    def compile(cls, config: Dict[str, Any], variables: Dict[str, Any],
+                retry_policy: Optional[RetryPolicy] = None,
+                circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+                limiters: Optional[ConcurrencyLimiterRegistry] = None,
+                http_clients: Optional[HttpClientRegistry] = None) -> "ExecutionPlan":
+        """Compile a validated config; swept models expand lazily."""
+        evaluation_id = config['id']
+        execution = config.get("execution", {})
+        tools = config.get("tools", [])
+
+        models = ModelSet(ModelConfigs(config['models']), execution.get("timeout"), retry_policy,
+                          circuit_breakers, limiters, http_clients)
+        prompts = tuple(
+            (prompt['id'], render_prompt(prompt['system'], variables))
+            for prompt in config['prompts']
+        )
+        tests = tuple(config['tests'])
+
+        global_mocks = ToolExecutionHandler.index_global_mocks(tools)
+        tool_handlers = [
+            ToolExecutionHandler(test['tool_execution'], tools, global_mocks=global_mocks)
+            if test.get('tool_execution') else None
+            for test in tests
+        ]
+        assertions = [compile_assertions(test.get('assert')) for test in tests]
+        return cls(evaluation_id, models, prompts, tests, format_tools(tools), tool_handlers, tools, assertions)
+
+    def __len__(self) -> int:
+        return len(self.models) * len(self.prompts) * len(self.tests)
+
+    def _cell(self, index: int, model: Model, model_key: str, prompt_index: int, test_index: int) -> Cell:
+        prompt_id, system_prompt = self.prompts[prompt_index]
+        test = self.tests[test_index]
+        return Cell(
+            index=index,
+            id=f"{self.evaluation_id}::{model.id}::{prompt_id}::{test['id']}",
+            model=model,
+            prompt_id=prompt_id,
+            system_prompt=system_prompt,
+            test=test,
+            tools=self.tools,
+            tool_handler=self.tool_handlers[test_index],
+            key=f"{model_key}:{self._prompt_keys[prompt_index]}:{self._test_keys[test_index]}",
+            assertions=self.assertions[test_index],
+        )
+
+    def __iter__(self) -> Iterator[Cell]:
+        for model_index, model_config in enumerate(self.models.configs):
+            yield from self._model_cells(model_index, model_config)
+
+    def _model_cells(self, model_index: int, model_config: Dict[str, Any]) -> Iterator[Cell]:
+        # Each model (or sweep variant) is built once, right before its cells run
+        model = self.models.build(model_config)
+        model_key = fingerprint(model_config)
+        index = model_index * len(self.prompts) * len(self.tests)
+        for prompt_index in range(len(self.prompts)):
+            for test_index in range(len(self.tests)):
+                yield self._cell(index, model, model_key, prompt_index, test_index)
+                index += 1
+
+    def by_endpoint(self) -> Dict[str, Iterator[Cell]]:
+        """The cells grouped by endpoint (see endpoint_key), each group lazily in plan order."""
+        model_indexes: Dict[str, List[int]] = {}
+        for model_index, model_config in enumerate(self.models.configs):
+            endpoint = endpoint_key(model_config['provider'], model_config.get('api_base'))
+            model_indexes.setdefault(endpoint, []).append(model_index)
+
+        def cells(indexes: List[int]) -> Iterator[Cell]:
+            for model_index in indexes:
+                yield from self._model_cells(model_index, self.models.configs[model_index])
+
+        return {endpoint: cells(indexes) for endpoint, indexes in model_indexes.items()}
+
+    def __getitem__(self, index: int) -> Cell:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cell index out of range")
+        model_index, rest = divmod(index, len(self.prompts) * len(self.tests))
+        prompt_index, test_index = divmod(rest, len(self.tests))
+        model_config = self.models.configs[model_index]
+        return self._cell(index, self.models.build(model_config), fingerprint(model_config),
+                          prompt_index, test_index)
+
+    def cell_labels(self) -> Iterator[Tuple[str, str, str, str]]:
+        """(cell id, model id, prompt id, test id) in execution order, without building models."""
+        for model_config in self.models.configs:
+            for prompt_id, _ in self.prompts:
+                for test in self.tests:
+                    cell_id = f"{self.evaluation_id}::{model_config['id']}::{prompt_id}::{test['id']}"
+                    yield cell_id, model_config['id'], prompt_id, test['id']
+
+    def cell_ids(self) -> Iterator[str]:
+        """Cell ids in execution order, without building models."""
+        for cell_id, _, _, _ in self.cell_labels():
+            yield cell_id
+
+    def cell_keys(self) -> Iterator[str]:
+        """Cell keys in execution order, without building models."""
+        for model_config in self.models.configs:
+            model_key = fingerprint(model_config)
+            for prompt_key in self._prompt_keys:
+                for test_key in self._test_keys:
+                    yield f"{model_key}:{prompt_key}:{test_key}"
+
+    def describe(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Summary of the expanded matrix, used by `rawbench plan`; limit caps the models and cells listed."""
+        model_configs = self.models.configs
+        return {
+            "id": self.evaluation_id,
+            "models": [
+                {
+                    "id": model_config['id'],
+                    "name": model_config['name'],
+                    "provider": model_config['provider'],
+                    "temperature": model_config.get('temperature', 0.0),
+                    "max_tokens": model_config.get('max_tokens', 1000),
+                    "top_p": model_config.get('top_p', 1.0),
+                }
+                for model_config in islice(model_configs, limit)
+            ],
+            "model_count": len(model_configs),
+            "sweeps": model_configs.sweeps(),
+            "prompts": [prompt_id for prompt_id, _ in self.prompts],
+            "tests": [test['id'] for test in self.tests],
+            "cell_count": len(self),
+            "cells": list(islice(self.cell_ids(), limit)),
+        }
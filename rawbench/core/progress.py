@@ -0,0 +1,270 @@
+import bisect
+import json
+import math
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+import httpx
+
+DEFAULT_QUEUE_SIZE = 1000
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class ProgressTracker:
+    """
+    Tracks an in-flight evaluation and fans progress events out to subscribers.
+
+    Every subscriber gets its own bounded queue. Publishing never blocks: when a
+    subscriber falls behind, its oldest event is dropped so the run is never slowed
+    down by a slow consumer (e.g. a browser tab on a bad connection).
+    """
+
+    def __init__(self, max_queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._subscribers: List[queue.Queue] = []
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Statistics last relayed from a run in another process
+        self._relayed_stats: Optional[Dict[str, Any]] = None
+        # The last completion event, replayed to clients that reconnect after missing it
+        self.last_completed: Optional[Dict[str, Any]] = None
+        self._reset(None, 0)
+
+    def _reset(self, evaluation_id: Optional[str], total_cells: int):
+        self.evaluation_id = evaluation_id
+        self.total_cells = total_cells
+        self.completed_cells = 0
+        self.failed_cells = 0
+        self.total_tokens = 0
+        self.total_cost = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.finished = False
+        self._latencies: List[float] = []
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new subscriber, primed with the current state of the run."""
+        subscriber: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            subscriber.put_nowait({"type": "snapshot", "stats": self._stats()})
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Register a callback invoked synchronously with every event; it must be cheap."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Remove a subscriber registered with subscribe()."""
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def start(self, evaluation_id: str, total_cells: int):
+        """Mark the beginning of an evaluation with the number of cells it will run."""
+        with self._lock:
+            self._reset(evaluation_id, total_cells)
+            self.started_at = time.monotonic()
+            self._publish({"type": "started", "stats": self._stats()})
+
+    def record(self, result):
+        """Record a completed cell (a Result) and publish the updated statistics."""
+        with self._lock:
+            self.completed_cells += 1
+            if result.status != "success":
+                self.failed_cells += 1
+            self.total_tokens += result.total_tokens or 0
+            self.total_cost += result.cost or 0.0
+            if result.latency_ms is not None:
+                bisect.insort(self._latencies, result.latency_ms)
+            self._publish({
+                "type": "cell",
+                "cell": {
+                    "id": result.id,
+                    "model_id": result.model_id,
+                    "prompt_id": result.prompt_id,
+                    "test_id": result.test_id,
+                    "latency_ms": result.latency_ms,
+                    "total_tokens": result.total_tokens,
+                    "cost": result.cost,
+                    "status": result.status,
+                    "error_type": result.error_type,
+                },
+                "stats": self._stats(),
+            })
+
+    def finish(self, summary: Dict[str, Any], result_file: Optional[str] = None):
+        """Mark the evaluation as finished and publish its final summary."""
+        with self._lock:
+            self.finished = True
+            self.finished_at = time.monotonic()
+            self.last_completed = {
+                "type": "completed",
+                "summary": summary,
+                "result_file": result_file,
+                "stats": self._stats(),
+            }
+            self._publish(self.last_completed)
+
+    def relay(self, event: Dict[str, Any]):
+        """Publish an event of a run in another process (e.g. rawbench run --watch --push-to)."""
+        with self._lock:
+            if isinstance(event.get("stats"), dict):
+                self._relayed_stats = event["stats"]
+            event = dict(event)
+            if event["type"] == "completed":
+                self.last_completed = event
+            self._publish(event)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current statistics of the run."""
+        with self._lock:
+            if self.started_at is None and self._relayed_stats is not None:
+                return self._relayed_stats
+            return self._stats()
+
+    def _stats(self) -> Dict[str, Any]:
+        now = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = now - self.started_at if self.started_at is not None else 0.0
+        cells_per_sec = self.completed_cells / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total_cells - self.completed_cells, 0)
+        eta = remaining / cells_per_sec if cells_per_sec > 0 else None
+        return {
+            "evaluation_id": self.evaluation_id,
+            "completed": self.completed_cells,
+            "failed": self.failed_cells,
+            "total": self.total_cells,
+            "finished": self.finished,
+            "elapsed_s": elapsed,
+            "cells_per_sec": cells_per_sec,
+            "tokens_per_sec": self.total_tokens / elapsed if elapsed > 0 else 0.0,
+            "total_tokens": self.total_tokens,
+            "total_cost": self.total_cost,
+            "eta_s": eta,
+            "latency_ms": {
+                "p50": percentile(self._latencies, 50),
+                "p90": percentile(self._latencies, 90),
+                "p99": percentile(self._latencies, 99),
+            },
+        }
+
+    def _publish(self, event: Dict[str, Any]):
+        """Push an event to every subscriber without ever blocking the caller."""
+        event["ts"] = time.time()
+        for listener in self._listeners:
+            listener(event)
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Drop the oldest event to make room; consumers only need recent state
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+
+class ProgressForwarder:
+    """
+    Listener posting progress events to a running `rawbench serve`.
+
+    Events are sent from a background thread; when the server is slow or down, cell
+    events are dropped so the run is never held up. token is the server's push token,
+    required when it is not on this machine.
+    """
+
+    def __init__(self, url: str, max_queue_size: int = DEFAULT_QUEUE_SIZE, timeout: float = 2.0,
+                 token: Optional[str] = None):
+        self.endpoint = url.rstrip("/") + "/api/progress/events"
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._warned = False
+        self._thread = threading.Thread(target=self._send_loop, name="rawbench-progress-forwarder", daemon=True)
+        self._thread.start()
+
+    def __call__(self, event: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            if event["type"] != "cell":
+                # Start and completion events matter more than any single cell
+                try:
+                    self._queue.get_nowait()
+                    self._queue.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def _send_loop(self):
+        with httpx.Client(timeout=self.timeout) as client:
+            while True:
+                event = self._queue.get()
+                try:
+                    response = client.post(self.endpoint, content=json.dumps(event, default=str),
+                                           headers=self.headers)
+                    response.raise_for_status()
+                except httpx.HTTPError as e:
+                    if not self._warned:
+                        print(f"⚠️  Could not push progress to {self.endpoint}: {e}", file=sys.stderr)
+                        self._warned = True
+                finally:
+                    self._queue.task_done()
+
+    def flush(self, timeout: float = 5.0):
+        """Wait (up to timeout seconds) until queued events are sent."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+
+class ConsoleProgressBar:
+    """
+    Compact single-line progress bar fed by ProgressTracker events.
+
+    Redraws are throttled so terminal I/O stays negligible on large runs, and
+    nothing is drawn when the stream is not a terminal.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, width: int = 30, min_interval: float = 0.1):
+        self.stream = stream or sys.stderr
+        self.width = width
+        self.min_interval = min_interval
+        self.enabled = self.stream.isatty()
+        self._last_draw = 0.0
+
+    def __call__(self, event: Dict[str, Any]):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        final = event["type"] == "completed"
+        if not final and now - self._last_draw < self.min_interval:
+            return
+        self._last_draw = now
+        self.stream.write("\r" + self.render(event["stats"]))
+        if final:
+            self.stream.write("\n")
+        self.stream.flush()
+
+    def render(self, stats: Dict[str, Any]) -> str:
+        """Render the progress line for a stats snapshot."""
+        total = stats["total"] or 1
+        filled = int(self.width * stats["completed"] / total)
+        bar = "█" * filled + "░" * (self.width - filled)
+        eta = f"{stats['eta_s']:.0f}s" if stats["eta_s"] is not None else "-"
+        return (f"{bar} {stats['completed']}/{stats['total']} "
+                f"| {stats['cells_per_sec']:.1f} cells/s | {stats['tokens_per_sec']:.0f} tok/s "
+                f"| ${stats['total_cost']:.4f} | p50 {stats['latency_ms']['p50']:.0f}ms | ETA {eta}  ")
@@ -0,0 +1,185 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import litellm
+
+# Error classes used by retry policies and reported on failed results
+TIMEOUT = "timeout"
+RATE_LIMIT = "rate_limit"
+CONNECTION = "connection"
+SERVER = "server"
+BAD_REQUEST = "bad_request"
+AUTH = "auth"
+CIRCUIT_OPEN = "circuit_open"
+OTHER = "other"
+
+# Errors that say something about the provider's health (and trip the circuit breaker)
+PROVIDER_ERRORS = {TIMEOUT, RATE_LIMIT, CONNECTION, SERVER}
+
+DEFAULT_RETRIES = {
+    TIMEOUT: 2,
+    RATE_LIMIT: 5,
+    CONNECTION: 3,
+    SERVER: 3,
+}
+
+
+def classify_error(exc: BaseException) -> str:
+    """Map an exception raised by a model call to an error class."""
+    # Timeout subclasses APIConnectionError, so it must be checked first
+    if isinstance(exc, (litellm.Timeout, TimeoutError)):
+        return TIMEOUT
+    if isinstance(exc, litellm.RateLimitError):
+        return RATE_LIMIT
+    if isinstance(exc, (litellm.APIConnectionError, ConnectionError)):
+        return CONNECTION
+    if isinstance(exc, (litellm.InternalServerError, litellm.ServiceUnavailableError,
+                        litellm.BadGatewayError)):
+        return SERVER
+    if isinstance(exc, (litellm.AuthenticationError, litellm.PermissionDeniedError)):
+        return AUTH
+    if isinstance(exc, (litellm.BadRequestError, litellm.NotFoundError)):
+        return BAD_REQUEST
+    return OTHER
+
+
+class CellError(Exception):
+    """A cell failed after exhausting its retries; carries what is known about the failure."""
+
+    def __init__(self, error_type: str, message: str, attempts: int, response=None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.message = message
+        self.attempts = attempts
+        # Partial Response with the calls that succeeded before the failure
+        self.response = response
+
+
+class CellSkipped(Exception):
+    """A cell stopped (budget or cancel) while waiting for a slot, before any call; it has no result."""
+
+
+class RetryPolicy:
+    """
+    How often and how fast to retry a failed model call, per error class.
+
+    Configured from the 'execution' block of an evaluation:
+
+        execution:
+          timeout: 60            # seconds per request
+          retries:
+            timeout: 2
+            rate_limit: 5
+            default: 0           # any other error class
+          backoff:
+            initial: 1.0
+            max: 30.0
+    """
+
+    def __init__(self, retries: Optional[Dict[str, int]] = None, initial_backoff: float = 1.0,
+                 max_backoff: float = 30.0):
+        self.retries = dict(DEFAULT_RETRIES)
+        self.retries.update(retries or {})
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def from_config(cls, execution: Dict[str, Any]) -> "RetryPolicy":
+        backoff = execution.get("backoff", {})
+        return cls(
+            retries=execution.get("retries"),
+            initial_backoff=backoff.get("initial", 1.0),
+            max_backoff=backoff.get("max", 30.0),
+        )
+
+    def max_retries(self, error_type: str) -> int:
+        return self.retries.get(error_type, self.retries.get("default", 0))
+
+    def should_retry(self, error_type: str, retry: int) -> bool:
+        """Whether the retry-th retry (1-based) is allowed for this error class."""
+        return retry <= self.max_retries(error_type)
+
+    def backoff(self, retry: int) -> float:
+        """Delay before the retry-th retry: exponential with jitter."""
+        delay = min(self.max_backoff, self.initial_backoff * (2 ** (retry - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after repeated failures.
+
+    After failure_threshold consecutive provider errors the circuit opens and calls
+    fail fast (error type circuit_open) for cooldown seconds. Then one trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.times_opened = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may be made now."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "times_opened": self.times_opened}
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per provider endpoint (see concurrency.endpoint_key)."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, execution: Dict[str, Any]) -> "CircuitBreakerRegistry":
+        breaker = execution.get("circuit_breaker", {})
+        return cls(
+            failure_threshold=breaker.get("failure_threshold", 5),
+            cooldown=breaker.get("cooldown", 30.0),
+        )
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.cooldown)
+            return self._breakers[endpoint]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: breaker.to_dict() for endpoint, breaker in self._breakers.items()}
@@ -0,0 +1,88 @@
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Marks an exhausted lane
+_EXHAUSTED = object()
+
+
+class Scheduler:
+    """
+    Runs work items concurrently on a thread pool and yields them as they complete.
+
+    Only max_workers items are submitted at a time, so items are pulled lazily and
+    should_stop is checked right before each item is started. Each item runs in a
+    copy of the caller's context, which keeps trace spans parented correctly.
+    Per-provider concurrency is limited inside the model call; run_lanes only keeps
+    each provider's share of the pool close to its current limit.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max(1, max_workers)
+
+    def run(self, fn: Callable[[T], Any], items: Iterable[T],
+            should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[T, Any, Optional[BaseException]]]:
+        """
+        Yield (item, result, exception) for every started item, in completion order.
+
+        Args:
+            fn: Work to run on each item
+            items: Items to run, consumed lazily
+            should_stop: Checked before starting each item; once true no more items start,
+                         while the ones already running still complete and are yielded
+        """
+        return self.run_lanes(fn, {None: items}, should_stop)
+
+    def run_lanes(self, fn: Callable[[T], Any], lanes: Dict[Hashable, Iterable[T]],
+                  should_stop: Optional[Callable[[], bool]] = None,
+                  capacity: Optional[Callable[[Hashable], int]] = None
+                  ) -> Iterator[Tuple[T, Any, Optional[BaseException]]]:
+        """
+        Like run, with items split into lanes (e.g. one per provider endpoint) that are
+        served round-robin. A lane only gets a new item started while fewer than
+        capacity(lane) of its items are running, so a slow lane never fills the pool
+        with items that would only wait for it, and the other lanes keep going.
+        """
+        iterators = {lane: iter(items) for lane, items in lanes.items()}
+        order = deque(iterators)
+        running: Dict[Hashable, int] = {lane: 0 for lane in iterators}
+        pending: Dict[Future, Tuple[Hashable, T]] = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rawbench-cell")
+        try:
+            while True:
+                # Lanes passed over in a row because they are at capacity
+                full = 0
+                while order and full < len(order) and len(pending) < self.max_workers:
+                    lane = order[0]
+                    order.rotate(-1)
+                    if capacity and running[lane] >= max(1, capacity(lane)):
+                        full += 1
+                        continue
+                    if should_stop and should_stop():
+                        order.clear()
+                        break
+                    item = next(iterators[lane], _EXHAUSTED)
+                    if item is _EXHAUSTED:
+                        order.remove(lane)
+                        continue
+                    full = 0
+                    running[lane] += 1
+                    context = contextvars.copy_context()
+                    pending[pool.submit(context.run, fn, item)] = (lane, item)
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lane, item = pending.pop(future)
+                    running[lane] -= 1
+                    exception = future.exception()
+                    yield item, None if exception else future.result(), exception
+        finally:
+            # On interrupt, drop queued work; running items finish in the background
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
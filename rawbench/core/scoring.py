@@ -0,0 +1,425 @@
+import abc
+import contextvars
+import dataclasses
+import difflib
+import hashlib
+import json
+import logging
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.instrumentation import get_tracer
+
+logger = logging.getLogger(__name__)
+
+JUDGE_SYSTEM_PROMPT = """You grade responses against a rubric.
+Give every response a score from 0 (does not meet the rubric at all) to 1 (fully meets it) and a one-sentence reason.
+Reply with JSON only, in this shape, with one grade per response:
+{"grades": [{"index": 0, "score": 0.0, "reason": "..."}]}"""
+
+_FENCE = re.compile(r"^```[\w-]*\s*\n(.*?)\n?```$", re.DOTALL)
+# Judge spend of the assertion being checked: {"cost": ..., "tokens": ...}, set by Scorer.score
+_judge_usage: contextvars.ContextVar = contextvars.ContextVar("rawbench_judge_usage", default=None)
+
+
+def _parse_json(text: Optional[str]) -> Tuple[Any, Optional[str]]:
+    """The JSON value of a response and an error, accepting a single markdown code fence around it."""
+    text = (text or "").strip()
+    try:
+        return json.loads(text), None
+    except ValueError as e:
+        error = str(e)
+    fenced = _FENCE.match(text)
+    if fenced:
+        try:
+            return json.loads(fenced.group(1)), None
+        except ValueError as e:
+            error = str(e)
+    return None, f"invalid JSON: {error}"
+
+
+class Assertion(abc.ABC):
+    """One check of a test's 'assert' block; check() returns a score in [0, 1] and a reason."""
+
+    type = ""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.name = spec.get("name") or self.type
+        self.threshold = spec.get("threshold", 1.0)
+
+    @abc.abstractmethod
+    def check(self, output: str, judge: Optional["LLMJudge"]) -> Tuple[Optional[float], str]:
+        """Score an output; judge is the run's LLMJudge, or None when no judge is configured."""
+
+
+class JsonAssertion(Assertion):
+    type = "is-json"
+
+    def check(self, output, judge):
+        _, error = _parse_json(output)
+        return (0.0, error) if error else (1.0, "valid JSON")
+
+
+class JsonSchemaAssertion(Assertion):
+    type = "json-schema"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        try:
+            import jsonschema
+        except ImportError:
+            raise RuntimeError("json-schema assertions require jsonschema (pip install 'raw-bench[scoring]')")
+        schema = spec.get("schema")
+        if not isinstance(schema, dict):
+            raise ValueError("A json-schema assertion needs a 'schema' mapping")
+        jsonschema.validators.validator_for(schema).check_schema(schema)
+        self.validator = jsonschema.validators.validator_for(schema)(schema)
+
+    def check(self, output, judge):
+        value, error = _parse_json(output)
+        if error:
+            return 0.0, error
+        violation = next(iter(self.validator.iter_errors(value)), None)
+        if violation is not None:
+            location = "/".join(str(part) for part in violation.absolute_path) or "(root)"
+            return 0.0, f"{location}: {violation.message}"
+        return 1.0, "matches the schema"
+
+
+class RegexAssertion(Assertion):
+    type = "regex"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        if not spec.get("pattern"):
+            raise ValueError("A regex assertion needs a 'pattern'")
+        flags = re.IGNORECASE if spec.get("ignore_case") else 0
+        self.pattern = re.compile(spec["pattern"], flags | re.MULTILINE)
+
+    def check(self, output, judge):
+        if self.pattern.search(output or ""):
+            return 1.0, f"matches /{self.pattern.pattern}/"
+        return 0.0, f"no match for /{self.pattern.pattern}/"
+
+
+class ContainsAssertion(Assertion):
+    """Scores the fraction of values found; the default threshold requires all of them."""
+
+    type = "contains"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        values = spec.get("values", spec.get("value"))
+        self.values = [values] if isinstance(values, str) else list(values or [])
+        if not self.values:
+            raise ValueError("A contains assertion needs a 'value' or 'values'")
+        self.ignore_case = spec.get("ignore_case", False)
+
+    def check(self, output, judge):
+        output = output or ""
+        if self.ignore_case:
+            output = output.lower()
+        missing = [value for value in self.values
+                   if (value.lower() if self.ignore_case else value) not in output]
+        score = 1 - len(missing) / len(self.values)
+        return score, f"missing {', '.join(repr(value) for value in missing)}" if missing else "contains all values"
+
+
+class SimilarityAssertion(Assertion):
+    """Character-level similarity ratio (difflib) to an expected answer."""
+
+    type = "similarity"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        if spec.get("expected") is None:
+            raise ValueError("A similarity assertion needs an 'expected' answer")
+        self.expected = str(spec["expected"]).strip()
+        self.threshold = spec.get("threshold", 0.8)
+        self.ignore_case = spec.get("ignore_case", True)
+
+    def check(self, output, judge):
+        output, expected = (output or "").strip(), self.expected
+        if self.ignore_case:
+            output, expected = output.lower(), expected.lower()
+        score = difflib.SequenceMatcher(None, output, expected, autojunk=False).ratio()
+        return round(score, 4), f"similarity {score:.2f}"
+
+
+class JudgeAssertion(Assertion):
+    type = "llm-judge"
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        if not spec.get("rubric"):
+            raise ValueError("An llm-judge assertion needs a 'rubric'")
+        self.rubric = spec["rubric"].strip()
+        self.model = spec.get("model")
+        self.threshold = spec.get("threshold", 0.5)
+
+    def check(self, output, judge):
+        if judge is None:
+            raise RuntimeError("llm-judge assertions need a judge model (execution.scoring.judge.model)")
+        return judge.grade(self.model, self.rubric, output or "")
+
+
+ASSERTION_TYPES = {cls.type: cls for cls in (JsonAssertion, JsonSchemaAssertion, RegexAssertion,
+                                              ContainsAssertion, SimilarityAssertion, JudgeAssertion)}
+ASSERTION_TYPES["json"] = JsonAssertion
+
+
+def compile_assertions(specs: Optional[List[Dict[str, Any]]]) -> Tuple[Assertion, ...]:
+    """Build the assertions of a test's 'assert' block, validating them up front."""
+    assertions = []
+    for spec in specs or []:
+        if not isinstance(spec, dict) or spec.get("type") not in ASSERTION_TYPES:
+            kind = spec.get("type") if isinstance(spec, dict) else spec
+            raise ValueError(f"Unknown assertion type '{kind}', use one of {', '.join(sorted(ASSERTION_TYPES))}")
+        assertions.append(ASSERTION_TYPES[spec["type"]](spec))
+    return tuple(assertions)
+
+
+class LLMJudge:
+    """
+    Grades outputs against rubrics with a judge model.
+
+    Grades are cached by (judge model, rubric, output hash), and concurrent requests
+    for the same model and rubric are sent together in one call of up to batch_size
+    outputs, waiting at most max_wait_ms for a batch to fill. The cost of a call is split
+    evenly between the outputs it graded; cached grades cost nothing.
+    """
+
+    def __init__(self, build_model: Callable[[str], Any], model: Optional[str] = None,
+                 batch_size: int = 8, max_wait_ms: float = 50, pricing=None):
+        self.build_model = build_model
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.pricing = pricing
+        self.calls = 0
+        self.graded = 0
+        self.cache_hits = 0
+        self.total_tokens = 0
+        self.total_cost = 0.0
+        self._models: Dict[str, Any] = {}
+        self._cache: Dict[Tuple[str, str, str], Future] = {}
+        self._batches: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def grade(self, model: Optional[str], rubric: str, output: str) -> Tuple[Optional[float], str]:
+        model = model or self.model
+        if not model:
+            raise RuntimeError("No judge model configured (execution.scoring.judge.model)")
+        key = (model, rubric, hashlib.sha1(output.encode("utf-8")).hexdigest())
+        send = leader = None
+        with self._lock:
+            future = self._cache.get(key)
+            cached = future is not None
+            if cached:
+                self.cache_hits += 1
+            else:
+                future = self._cache[key] = Future()
+                pending = self._batches.setdefault((model, rubric), [])
+                pending.append((key, output, future))
+                if len(pending) >= self.batch_size:
+                    send = self._batches.pop((model, rubric))
+                elif len(pending) == 1:
+                    leader = pending
+        if leader is not None:
+            # The first request of a batch sends it unless it fills up within max_wait
+            wait([future], timeout=self.max_wait)
+            with self._lock:
+                if self._batches.get((model, rubric)) is leader:
+                    send = self._batches.pop((model, rubric))
+        if send:
+            self._send(model, rubric, send)
+        score, reason, cost, tokens = future.result()
+        usage = _judge_usage.get()
+        if usage is not None and not cached:
+            usage["cost"] += cost
+            usage["tokens"] += tokens
+        return score, reason
+
+    def _judge_model(self, name: str):
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self.build_model(name)
+            return self._models[name]
+
+    def _send(self, name: str, rubric: str, batch: List[Tuple[Tuple[str, str, str], str, Future]]):
+        responses = "\n\n".join(
+            f'<response index="{index}">\n{output}\n</response>' for index, (_, output, _) in enumerate(batch)
+        )
+        test = {"id": "judge", "messages": [{"role": "user", "content": f"Rubric:\n{rubric}\n\n{responses}"}]}
+        try:
+            with get_tracer().span("scoring.judge", model=name, outputs=len(batch)):
+                response = self._judge_model(name).run(test, system_prompt=JUDGE_SYSTEM_PROMPT)
+            message = response.output_messages[-1].choices[0].message.content if response.output_messages else ""
+            grades = self._parse(message, len(batch))
+            cost, tokens = self._account(name, response, len(batch))
+        except Exception as e:
+            logger.error("Judge call to %s failed: %s", name, e)
+            grades = [(None, f"judge failed: {e}")] * len(batch)
+            cost, tokens = 0.0, 0
+            with self._lock:
+                # Failures are not cached, so a later run asks again
+                for key, _, _ in batch:
+                    self._cache.pop(key, None)
+        for (_, _, future), grade in zip(batch, grades):
+            future.set_result((*grade, cost / len(batch), tokens / len(batch)))
+
+    def _parse(self, message: str, count: int) -> List[Tuple[Optional[float], str]]:
+        value, error = _parse_json(message)
+        if error is None and isinstance(value, dict):
+            value = value.get("grades")
+        if not isinstance(value, list):
+            return [(None, f"unreadable judge reply: {error or message[:200]}")] * count
+        grades: List[Tuple[Optional[float], str]] = [(None, "no grade returned by the judge")] * count
+        for position, grade in enumerate(value):
+            if not isinstance(grade, dict):
+                continue
+            index = grade.get("index", position)
+            try:
+                score = min(max(float(grade.get("score")), 0.0), 1.0)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(index, int) and 0 <= index < count:
+                grades[index] = (score, str(grade.get("reason", "")))
+        return grades
+
+    def _account(self, name: str, response, graded: int) -> Tuple[float, int]:
+        """Record a judge call; returns its cost and tokens."""
+        cost, tokens = None, 0
+        if self.pricing is not None:
+            usage, cost = self.pricing.cost_of_responses(response.output_messages, name)
+            tokens = usage.total_tokens
+        with self._lock:
+            self.calls += 1
+            self.graded += graded
+            self.total_tokens += tokens
+            self.total_cost += cost or 0.0
+        return cost or 0.0, tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model": self.model,
+                "calls": self.calls,
+                "graded": self.graded,
+                "cache_hits": self.cache_hits,
+                "cached_grades": len(self._cache),
+                "total_tokens": self.total_tokens,
+                "total_cost": self.total_cost,
+            }
+
+
+class Scorer:
+    """
+    Scores results against their test's assertions on its own worker pool, so checks and
+    judge calls never hold up the cell scheduler. Configured from the 'execution' block:
+
+        execution:
+          scoring:
+            workers: 8                      # scoring threads
+            judge:
+              model: openai/gpt-4o-mini     # default model of llm-judge assertions
+              max_tokens: 1024
+              batch_size: 8                 # outputs graded per judge call
+              max_wait_ms: 50               # how long a batch waits to fill
+    """
+
+    def __init__(self, workers: int = 8, judge: Optional[LLMJudge] = None):
+        self.workers = max(1, workers)
+        self.judge = judge
+        self.scored = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Future, Callable[[Any], None]] = {}
+
+    @classmethod
+    def from_config(cls, execution: Dict[str, Any], models=None, pricing=None) -> "Scorer":
+        """models is the ModelSet judge models are built with, sharing its limiters and clients."""
+        scoring = execution.get("scoring", {})
+        judge_config = scoring.get("judge", {})
+        judge = None
+        if models is not None:
+            def build(name):
+                return models.build({
+                    "id": f"judge:{name}",
+                    "name": name,
+                    "provider": judge_config.get("provider") or _provider_of(name),
+                    "temperature": 0.0,
+                    "max_tokens": judge_config.get("max_tokens", 1024),
+                })
+            judge = LLMJudge(build, judge_config.get("model"), judge_config.get("batch_size", 8),
+                             judge_config.get("max_wait_ms", 50), pricing)
+        return cls(scoring.get("workers", 8), judge)
+
+    def score(self, result, assertions: Tuple[Assertion, ...]):
+        """The result with its scores; a check that raises fails with the error as its reason.
+
+        Scores that needed a judge call carry their share of its cost (judge_cost, judge_tokens).
+        """
+        scores = []
+        for assertion in assertions:
+            usage = {"cost": 0.0, "tokens": 0}
+            token = _judge_usage.set(usage)
+            try:
+                score, reason = assertion.check(result.output_content, self.judge)
+            except Exception as e:
+                logger.error("Assertion %s of %s failed: %s", assertion.name, result.id, e)
+                score, reason = None, f"{type(e).__name__}: {e}"
+            finally:
+                _judge_usage.reset(token)
+            entry = {
+                "name": assertion.name,
+                "type": assertion.type,
+                "score": score,
+                "passed": score is not None and score >= assertion.threshold,
+                "reason": reason,
+            }
+            if usage["cost"] or usage["tokens"]:
+                entry["judge_cost"] = usage["cost"]
+                entry["judge_tokens"] = round(usage["tokens"])
+            scores.append(entry)
+        return dataclasses.replace(result, scores=scores, passed=all(score["passed"] for score in scores))
+
+    def submit(self, result, assertions: Tuple[Assertion, ...], done: Callable[[Any], None]):
+        """Score a result in the background; done(scored_result) is called from collect()."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="rawbench-score")
+        context = contextvars.copy_context()
+        self._pending[self._pool.submit(context.run, self.score, result, assertions)] = done
+
+    def collect(self, block: bool = False):
+        """Hand finished results to their callbacks in the calling thread; block waits for all of them."""
+        while self._pending:
+            finished = [future for future in self._pending if future.done()]
+            if not finished:
+                if not block:
+                    return
+                finished, _ = wait(self._pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done = self._pending.pop(future)
+                self.scored += 1
+                done(future.result())
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"workers": self.workers, "scored": self.scored}
+        if self.judge is not None and self.judge.calls:
+            data["judge"] = self.judge.to_dict()
+        return data
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+def _provider_of(model_name: str) -> str:
+    try:
+        import litellm
+        return litellm.get_llm_provider(model=model_name)[1]
+    except Exception:
+        return model_name.split("/")[0] if "/" in model_name else "openai"
@@ -0,0 +1,129 @@
+import asyncio
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+# Marks the end of a stream's results
+_END = object()
+
+
+def _wake(future: "asyncio.Future"):
+    if not future.done():
+        future.set_result(None)
+
+
+class ResultStream:
+    """
+    A run in a background thread whose Results are yielded as each cell completes.
+
+    Iterate it with `for` or `async for`. cancel() stops new cells from starting;
+    iteration ends once the cells already in flight have been collected. Used as a
+    context manager (`with` / `async with`) the run is cancelled and joined on exit.
+
+    The target is called as target(progress, cancel) and returns the run's result
+    collectors; `progress` is this stream, which receives every collected Result.
+    """
+
+    def __init__(self, target: Callable[[Any, threading.Event], List[Any]]):
+        self._target = target
+        self._results: queue.Queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        # (loop, future) of async consumers waiting for the next result
+        self._waiters: List[Any] = []
+        self.collectors: Optional[List[Any]] = None
+        self.error: Optional[BaseException] = None
+        self.total_cells = 0
+        self._thread = threading.Thread(target=self._run, name="rawbench-stream", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self.collectors = self._target(self, self._cancel)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._put(_END)
+
+    def _put(self, item):
+        self._results.put(item)
+        with self._lock:
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+    # Progress interface: the run reports to the stream like to a ProgressTracker
+
+    def start(self, evaluation_id: str, total_cells: int):
+        self.total_cells += total_cells
+
+    def record(self, result):
+        self._put(result)
+
+    def _next(self, item, stop):
+        if item is _END:
+            # Leave the marker for later calls, and raise a failed run's error once
+            self._results.put(_END)
+            error, self.error = self.error, None
+            if error is not None:
+                raise error
+            raise stop
+        return item
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self._next(self._results.get(), StopIteration())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return self._next(self._results.get_nowait(), StopAsyncIteration())
+            except queue.Empty:
+                pass
+            future = loop.create_future()
+            with self._lock:
+                # Re-checked under the lock so a result put meanwhile is not missed
+                if not self._results.empty():
+                    continue
+                self._waiters.append((loop, future))
+            await future
+
+    def cancel(self):
+        """Start no new cells; results of the cells in flight are still yielded."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[List[Any]]:
+        """Wait for the run to finish and return its result collectors."""
+        self._thread.join(timeout)
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+        return self.collectors
+
+    def close(self):
+        """Cancel the run and wait for the cells in flight to finish."""
+        self.cancel()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.cancel()
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
@@ -0,0 +1,214 @@
+import dataclasses
+import functools
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .concurrency import ConcurrencyLimiterRegistry
+from .evaluation import Evaluation
+from .http_clients import HttpClientRegistry
+from .plan import Cell
+from .retry import CellSkipped, CircuitBreakerRegistry
+from .scheduler import Scheduler
+from ..utils.instrumentation import get_tracer
+
+
+class Suite:
+    """
+    Several evaluations run as one: a single scheduler, connection pool, set of
+    per-provider limiters and circuit breakers, with cells interleaved round-robin
+    across evaluations so no provider sits idle while one file drains.
+
+    Cells that are identical in several evaluations (same model settings, prompt,
+    test and tools) are called once and their result is shared.
+    """
+
+    def __init__(self, configs: List[Dict[str, Any]], pricing_tables: Optional[List[Any]] = None,
+                 execution: Optional[Dict[str, Any]] = None):
+        # Shared resources are configured from the first evaluation's 'execution' block
+        if execution is None:
+            execution = configs[0].get("execution", {})
+            differing = [config["id"] for config in configs[1:] if config.get("execution", {}) != execution]
+            if differing:
+                print(f"⚠️  The suite runs with the 'execution' settings of {configs[0]['id']}; "
+                      f"those of {', '.join(differing)} are ignored")
+        self.limiters = ConcurrencyLimiterRegistry.from_config(execution)
+        self.http_clients = HttpClientRegistry.from_config(execution)
+        self.circuit_breakers = CircuitBreakerRegistry.from_config(execution)
+        pricing_tables = pricing_tables or [None] * len(configs)
+        self.evaluations = []
+        # The first evaluation's scorer (and judge cache) is shared by the others
+        self.scorer = None
+        for config, pricing in zip(configs, pricing_tables):
+            evaluation = Evaluation(config, pricing=pricing, limiters=self.limiters, http_clients=self.http_clients,
+                                    circuit_breakers=self.circuit_breakers, scorer=self.scorer)
+            self.scorer = self.scorer or evaluation.scorer
+            self.evaluations.append(evaluation)
+        self.shared_results = 0
+        self.duration_s: Optional[float] = None
+
+    def __len__(self) -> int:
+        return sum(len(evaluation.plan) for evaluation in self.evaluations)
+
+    def _lanes(self) -> Dict[str, Iterator[Tuple[Evaluation, Cell]]]:
+        """(evaluation, cell) pairs grouped by endpoint, each lane interleaved across evaluations."""
+        grouped: Dict[str, List[Tuple[Evaluation, Iterator[Cell]]]] = {}
+        for evaluation in self.evaluations:
+            for endpoint, cells in evaluation.plan.by_endpoint().items():
+                grouped.setdefault(endpoint, []).append((evaluation, cells))
+        return {endpoint: self._interleaved(iterators) for endpoint, iterators in grouped.items()}
+
+    @staticmethod
+    def _interleaved(iterators: List[Tuple[Evaluation, Iterator[Cell]]]) -> Iterator[Tuple[Evaluation, Cell]]:
+        while iterators:
+            remaining = []
+            for evaluation, cells in iterators:
+                cell = next(cells, None)
+                if cell is not None:
+                    remaining.append((evaluation, cells))
+                    yield evaluation, cell
+            iterators = remaining
+
+    def run(self, progress=None, budget=None, cancel=None, select=None, quiet=False) -> List[Any]:
+        """Run every evaluation and return their result collectors, in suite order.
+
+        cancel is an optional threading.Event; once set no new cells are started.
+        select is an optional set of cell ids to run instead of every cell.
+        """
+        started = time.perf_counter()
+        if not quiet:
+            print(f"Running suite of {len(self.evaluations)} evaluations, {len(self)} cells")
+        if progress:
+            progress.start("suite", len(select) if select is not None else len(self))
+
+        stopped: Dict[str, str] = {}
+
+        def should_stop():
+            stopped_reason = budget.exhausted_reason if budget else None
+            if cancel is not None and cancel.is_set():
+                stopped_reason = "cancelled"
+            if stopped_reason and not stopped:
+                if stopped_reason != "cancelled":
+                    print(f"⚠️  Budget exhausted, stopping: {stopped_reason}")
+                stopped['reason'] = stopped_reason
+            return stopped_reason is not None
+
+        # Only keys that occur in more than one cell are worth remembering
+        counts = Counter(key for evaluation in self.evaluations for key in evaluation.plan.cell_keys())
+        shared_keys = {key for key, count in counts.items() if count > 1}
+        del counts
+        # key -> result of the cell that ran, and cells waiting for a key still in flight
+        done: Dict[str, Any] = {}
+        waiting: Dict[str, List[Tuple[Evaluation, Cell]]] = {}
+
+        def share(evaluation, cell, result):
+            # No call was made, so neither the budget nor the suite totals are charged again
+            shared = dataclasses.replace(result, id=cell.id, cost=0.0, prompt_tokens=0, completion_tokens=0,
+                                         cached_tokens=0, total_tokens=0)
+            evaluation._record(cell, shared, progress=progress)
+            self.shared_results += 1
+
+        def settle(key, result):
+            done[key] = result
+            for follower, follower_cell in waiting.pop(key, []):
+                share(follower, follower_cell, result)
+
+        def cells_to_run(lane):
+            for evaluation, cell in lane:
+                if select is not None and cell.id not in select:
+                    continue
+                if cell.key in shared_keys:
+                    if cell.key in done:
+                        share(evaluation, cell, done[cell.key])
+                        continue
+                    if cell.key in waiting:
+                        waiting[cell.key].append((evaluation, cell))
+                        continue
+                    waiting[cell.key] = []
+                yield evaluation, cell
+
+        tracer = get_tracer()
+        with tracer.span("connections.warmup"):
+            for evaluation in self.evaluations:
+                evaluation.plan.models.resolve_clients()
+            self.http_clients.warmup(self.limiters.initial_limit)
+
+        endpoints = [endpoint for evaluation in self.evaluations for endpoint in evaluation.plan.models.endpoints]
+        scheduler = Scheduler(self.limiters.max_workers(endpoints))
+        # Identical cells share an endpoint, so deduplicating within each lane is enough
+        lanes = {endpoint: cells_to_run(lane) for endpoint, lane in self._lanes().items()}
+        with tracer.span("suite.run", evaluations=len(self.evaluations)):
+            try:
+                for (evaluation, cell), response, exception in scheduler.run_lanes(
+                        lambda item: item[0]._run_cell(item[1], should_stop), lanes, should_stop,
+                        self.limiters.current_limit):
+                    if isinstance(exception, CellSkipped):
+                        continue
+                    result = evaluation._result_of(cell, response, exception)
+                    # Shared once scored, since followers are re-scored against their own assertions
+                    then = functools.partial(settle, cell.key) if cell.key in shared_keys else None
+                    evaluation._record(cell, result, budget, progress, then=then)
+                    self.scorer.collect()
+            except KeyboardInterrupt:
+                print("\n⚠️  Interrupted, saving the results collected so far")
+                stopped['reason'] = "interrupted"
+            self.scorer.collect(block=True)
+
+        collectors = []
+        for evaluation in self.evaluations:
+            if stopped:
+                evaluation.result_collector.metadata['stopped_reason'] = stopped['reason']
+            collectors.append(evaluation.finalize(budget, quiet))
+        self.duration_s = time.perf_counter() - started
+        return collectors
+
+    def summary(self, result_files: List[str], config_paths: List[str]) -> Dict[str, Any]:
+        """Aggregate summary of the suite, with one entry per evaluation."""
+        evaluations = []
+        totals = {"total_results": 0, "successful_results": 0, "failed_results": 0,
+                  "total_tokens": 0, "total_cost": 0.0}
+        for evaluation, result_file, config_path in zip(self.evaluations, result_files, config_paths):
+            summary = evaluation.result_collector.get_summary()
+            evaluations.append({
+                "id": evaluation.id,
+                "config": config_path,
+                "result_file": result_file,
+                "total_results": summary["total_results"],
+                "failed_results": summary["failed_results"],
+                "success_rate": summary["success_rate"],
+                "total_tokens": summary["total_tokens"],
+                "total_cost": summary["total_cost"],
+                "avg_latency": summary["avg_latency"],
+                "latency_breakdown": summary["latency_breakdown"]["avg"] if "latency_breakdown" in summary else None,
+                "pass_rate": summary["scores"]["pass_rate"] if "scores" in summary else None,
+                "stopped_reason": summary.get("stopped_reason"),
+            })
+            for key in totals:
+                totals[key] += summary[key]
+        totals["success_rate"] = (totals["successful_results"] / totals["total_results"]
+                                  if totals["total_results"] else 0.0)
+        return {
+            "type": "suite",
+            "summary": {
+                "count_evaluations": len(self.evaluations),
+                "created_at": datetime.now().isoformat(),
+                **totals,
+                "shared_results": self.shared_results,
+                "duration_s": self.duration_s,
+                "concurrency": self.limiters.to_dict(),
+                "connections": self.http_clients.to_dict(),
+            },
+            "evaluations": evaluations,
+            "results": [],
+        }
+
+    def close(self):
+        self.http_clients.close()
+        self.scorer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,227 @@
+import math
+import random
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional
+
+# Model settings a sweep can vary
+SWEEPABLE_PARAMETERS = ("temperature", "max_tokens", "top_p", "frequency_penalty", "presence_penalty", "seed")
+METHODS = ("grid", "random", "latin_hypercube")
+# Decimals kept from continuous samples, so variant ids show the exact value used
+SAMPLE_DECIMALS = 4
+
+
+class SweepParameter:
+    """
+    The values one setting can take: a list, a stepped range or a continuous range.
+
+        temperature: [0.0, 0.5, 1.0]
+        max_tokens: {min: 256, max: 1024, step: 256}
+        top_p: {min: 0.5, max: 1.0}        # continuous, random and latin_hypercube only
+    """
+
+    def __init__(self, name: str, spec: Any):
+        self.name = name
+        self.values: Optional[List[Any]] = None
+        self.low = self.high = self.step = None
+        if isinstance(spec, dict) and "values" in spec:
+            spec = spec["values"]
+        if isinstance(spec, list):
+            if not spec:
+                raise ValueError(f"Sweep parameter '{name}' has no values")
+            self.values = spec
+        elif isinstance(spec, dict) and "min" in spec and "max" in spec:
+            self.low, self.high, self.step = spec["min"], spec["max"], spec.get("step")
+            if self.high < self.low:
+                raise ValueError(f"Sweep parameter '{name}' has max < min")
+            if self.step is not None and self.step <= 0:
+                raise ValueError(f"Sweep parameter '{name}' needs a positive step")
+        else:
+            raise ValueError(f"Sweep parameter '{name}' must be a list of values or a {{min, max[, step]}} range")
+        self.integer = all(isinstance(v, int) for v in (self.low, self.high, self.step) if v is not None)
+
+    @property
+    def discrete(self) -> bool:
+        return self.values is not None or self.step is not None
+
+    def __len__(self) -> int:
+        if self.values is not None:
+            return len(self.values)
+        if self.step is not None:
+            return int(math.floor((self.high - self.low) / self.step + 1e-9)) + 1
+        raise ValueError(f"Sweep parameter '{self.name}' is continuous; grid sweeps need values or a step")
+
+    def value_at(self, index: int) -> Any:
+        if self.values is not None:
+            return self.values[index]
+        value = self.low + index * self.step
+        return value if self.integer else round(value, 10)
+
+    def sample(self, fraction: float) -> Any:
+        """The value at a fraction in [0, 1) of the parameter's range."""
+        if self.discrete:
+            return self.value_at(min(int(fraction * len(self)), len(self) - 1))
+        if self.integer:
+            return min(self.low + int(fraction * (self.high - self.low + 1)), self.high)
+        return round(self.low + fraction * (self.high - self.low), SAMPLE_DECIMALS)
+
+
+class Sweep:
+    """
+    Model variants generated from a 'sweep' block, built on access instead of up front.
+
+        models:
+          - id: mini
+            provider: openai
+            name: openai/gpt-4o-mini
+            sweep:
+              method: latin_hypercube   # grid (default), random or latin_hypercube
+              samples: 20               # random and latin_hypercube only
+              seed: 0
+              parameters:
+                temperature: {min: 0.0, max: 1.0}
+                max_tokens: [256, 1024]
+
+    Every variant is a function of its index and the seed only, so ids and settings are
+    stable across runs and a variant never depends on the ones generated before it.
+    """
+
+    def __init__(self, parameters: Dict[str, SweepParameter], method: str = "grid",
+                 samples: Optional[int] = None, seed: int = 0):
+        self.parameters = parameters
+        # Sorted so ids don't depend on the order parameters are written in
+        self.names = sorted(parameters)
+        self.method = method
+        self.seed = seed
+        if method == "grid":
+            self.sizes = [len(parameters[name]) for name in self.names]
+            self.count = math.prod(self.sizes)
+        else:
+            if not isinstance(samples, int) or samples < 1:
+                raise ValueError(f"A {method} sweep needs a positive number of 'samples'")
+            self.count = samples
+        self._permutations: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_config(cls, sweep: Dict[str, Any]) -> "Sweep":
+        method = sweep.get("method", "grid")
+        if method not in METHODS:
+            raise ValueError(f"Unknown sweep method '{method}', use one of {', '.join(METHODS)}")
+        specs = sweep.get("parameters") or {}
+        if not isinstance(specs, dict) or not specs:
+            raise ValueError("A sweep needs a mapping of 'parameters'")
+        unknown = [name for name in specs if name not in SWEEPABLE_PARAMETERS]
+        if unknown:
+            raise ValueError(f"Cannot sweep {', '.join(unknown)}; sweepable settings are "
+                             f"{', '.join(SWEEPABLE_PARAMETERS)}")
+        parameters = {name: SweepParameter(name, spec) for name, spec in specs.items()}
+        return cls(parameters, method, sweep.get("samples"), sweep.get("seed", 0))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def settings(self, index: int) -> Dict[str, Any]:
+        """The settings of the variant at index."""
+        if not 0 <= index < self.count:
+            raise IndexError("sweep index out of range")
+        if self.method == "grid":
+            settings = {}
+            # Last parameter varies fastest
+            for name, size in zip(reversed(self.names), reversed(self.sizes)):
+                index, position = divmod(index, size)
+                settings[name] = self.parameters[name].value_at(position)
+            return {name: settings[name] for name in self.names}
+
+        rng = random.Random(f"{self.seed}:{index}")
+        if self.method == "random":
+            return {name: self.parameters[name].sample(rng.random()) for name in self.names}
+        # Latin hypercube: each parameter's range is cut into `count` strata and every
+        # stratum is used by exactly one variant
+        return {
+            name: self.parameters[name].sample((self._permutation(name)[index] + rng.random()) / self.count)
+            for name in self.names
+        }
+
+    def _permutation(self, name: str) -> List[int]:
+        permutation = self._permutations.get(name)
+        if permutation is None:
+            permutation = list(range(self.count))
+            random.Random(f"{self.seed}:{name}").shuffle(permutation)
+            self._permutations[name] = permutation
+        return permutation
+
+    def variant_id(self, model_id: str, index: int, settings: Dict[str, Any]) -> str:
+        """e.g. mini[max_tokens=256,temperature=0.5]; sampled variants also carry their index (mini#3[...])
+        since two samples can draw the same settings."""
+        values = ",".join(f"{name}={_format(value)}" for name, value in settings.items())
+        if self.method == "grid":
+            return f"{model_id}[{values}]"
+        return f"{model_id}#{index}[{values}]"
+
+    def variant(self, model_config: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """The model config of the variant at index, with a stable generated id."""
+        settings = self.settings(index)
+        config = {key: value for key, value in model_config.items() if key != "sweep"}
+        config.update(settings)
+        config["id"] = self.variant_id(model_config["id"], index, settings)
+        return config
+
+
+def _format(value: Any) -> str:
+    return format(value, "g") if isinstance(value, float) else str(value)
+
+
+class ModelConfigs:
+    """
+    The model configs of an evaluation with sweeps expanded lazily, as a sequence.
+
+    Only the variant being accessed is built, so a sweep of thousands of settings
+    costs nothing until its cells are scheduled.
+    """
+
+    def __init__(self, model_configs: List[Dict[str, Any]]):
+        self._entries = []
+        self._starts = []
+        count = 0
+        for model_config in model_configs:
+            sweep = Sweep.from_config(model_config["sweep"]) if model_config.get("sweep") else None
+            self._entries.append((model_config, sweep))
+            self._starts.append(count)
+            count += len(sweep) if sweep else 1
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def locate(self, index: int):
+        """(base model config, sweep or None, variant index) of a model position."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("model index out of range")
+        entry = bisect_right(self._starts, index) - 1
+        model_config, sweep = self._entries[entry]
+        return model_config, sweep, index - self._starts[entry]
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        model_config, sweep, variant = self.locate(index)
+        return sweep.variant(model_config, variant) if sweep else model_config
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for model_config, sweep in self._entries:
+            if sweep is None:
+                yield model_config
+            else:
+                for variant in range(len(sweep)):
+                    yield sweep.variant(model_config, variant)
+
+    @property
+    def base_configs(self) -> List[Dict[str, Any]]:
+        """Model entries as written, before sweeps are expanded."""
+        return [model_config for model_config, _ in self._entries]
+
+    def sweeps(self) -> Dict[str, Dict[str, Any]]:
+        """Description of each sweep, by base model id."""
+        return {
+            model_config["id"]: {"method": sweep.method, "variants": len(sweep), "parameters": sweep.names}
+            for model_config, sweep in self._entries if sweep
+        }
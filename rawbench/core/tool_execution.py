@@ -1,12 +1,43 @@
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+
+def format_tools(tools: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Convert configured tools to the function-calling schema sent to the API."""
+    if not tools:
+        return None
+    return [{
+        "type": "function",
+        "function": {
+            "name": tool["name"],
+            "description": tool["description"],
+            "parameters": tool["parameters"]
+        }
+    } for tool in tools]
+
 
 class ToolExecutionHandler:
-    def __init__(self, config: Dict[str, Any], tools: List[Dict[str, Any]] = None):
+    def __init__(self, config: Dict[str, Any], tools: List[Dict[str, Any]] = None,
+                 global_mocks: Optional[Dict[str, str]] = None):
         self.config = config
         self.tools = tools or []
         self.mode = config.get('mode', 'mock')
         self.max_iterations = config.get('max_iterations', 5)
+
+        # Index mocks by tool name once instead of scanning them on every tool call
+        self.test_mocks: Dict[str, str] = {}
+        for mock in config.get('output', []):
+            self.test_mocks.setdefault(mock.get('id'), mock.get('output', '{}'))
+        self.global_mocks = global_mocks if global_mocks is not None else self.index_global_mocks(self.tools)
+
+    @staticmethod
+    def index_global_mocks(tools: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Map tool name to its global mock output; can be shared by every test's handler."""
+        global_mocks: Dict[str, str] = {}
+        for tool in tools or []:
+            if 'mock' in tool:
+                global_mocks.setdefault(tool.get('name'), tool['mock'].get('output', '{}'))
+        return global_mocks
     
     def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
         """Execute a tool and return the result."""
@@ -21,19 +52,16 @@ class ToolExecutionHandler:
         """Get mock response with priority: test-specific > global tool mock > default."""
         
         # 1. Check test-specific mock output
-        test_mocks = self.config.get('output', [])
-        for mock in test_mocks:
-            if mock.get('id') == tool_name:
-                return mock.get('output', '{}')
+        if tool_name in self.test_mocks:
+            return self.test_mocks[tool_name]
         
         # 2. Check global tool mock
-        for tool in self.tools:
-            if tool.get('name') == tool_name and 'mock' in tool:
-                return tool['mock'].get('output', '{}')
+        if tool_name in self.global_mocks:
+            return self.global_mocks[tool_name]
         
         # 3. Default mock response
         return json.dumps({"message": f"Mock response for {tool_name}"})
     
     def _execute_actual_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> str:
         """Execute actual tool (placeholder for future implementation)."""
-        return json.dumps({"message": f"Actual tool execution for {tool_name}", "input": tool_input}) 
\ No newline at end of file
+        return json.dumps({"message": f"Actual tool execution for {tool_name}", "input": tool_input}) 
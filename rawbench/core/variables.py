@@ -80,6 +80,20 @@ def load_variable_function(module_name: str) -> Callable[[], Any]:
     
     return getattr(module, module_name)
 
+def variable_module_paths(variable_configs) -> List[str]:
+    """Paths of the variable modules a config uses (modules that are not found are skipped)."""
+    if isinstance(variable_configs, list):
+        names = [item["function"] for item in variable_configs if isinstance(item, dict) and "function" in item]
+    else:
+        names = []
+        for var_config in (variable_configs or {}).values():
+            if isinstance(var_config, dict) and "function" in var_config:
+                names.append(var_config["function"])
+            elif isinstance(var_config, str):
+                names.append(var_config)
+    paths = [find_variable_module(name) for name in names]
+    return [path for path in paths if path]
+
 def load_variables(variable_configs: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
     """
     Loads all variable functions from the config and executes them to get their values.
@@ -71,6 +71,39 @@ export async function fetchResultDetail(filename: string): Promise<ResultDetail>
   }
 }
 
+/**
+ * Fetch a result file without transcripts (input/output messages); each result
+ * carries its position as `index`, for fetchResultAt
+ */
+export async function fetchResultRows(filename: string): Promise<ResultDetail> {
+  try {
+    const response = await fetch(`${API_BASE_URL}/results/${encodeURIComponent(filename)}.json/rows`)
+
+    if (!response.ok) {
+      if (response.status === 404) {
+        throw new Error(`Result file not found: ${filename}`)
+      }
+      throw new Error(`HTTP error! status: ${response.status}`)
+    }
+
+    return await response.json()
+  } catch (error) {
+    console.error('Error fetching result rows:', error)
+    throw error
+  }
+}
+
+/**
+ * Fetch one complete result, transcripts included, by its position in the file
+ */
+export async function fetchResultAt(filename: string, index: number): Promise<any> {
+  const response = await fetch(`${API_BASE_URL}/results/${encodeURIComponent(filename)}.json/results/${index}`)
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`)
+  }
+  return response.json()
+}
+
 /**
  * Health check for the API server
  */
@@ -89,3 +122,47 @@ export async function checkApiHealth(): Promise<{ status: string; service: strin
     throw error
   }
 }
+
+export interface ProgressStats {
+  evaluation_id: string | null
+  completed: number
+  total: number
+  finished: boolean
+  elapsed_s: number
+  cells_per_sec: number
+  tokens_per_sec: number
+  eta_s: number | null
+  latency_ms: { p50: number; p90: number; p99: number }
+}
+
+export interface ProgressEvent {
+  type: "snapshot" | "started" | "cell" | "completed"
+  stats: ProgressStats
+  cell?: {
+    id: string
+    model_id: string
+    prompt_id: string
+    test_id: string
+    latency_ms: number | null
+    total_tokens: number
+  }
+  summary?: Record<string, any>
+  result_file?: string | null
+}
+
+/**
+ * Subscribe to live progress of the evaluation running on the server (server-sent events).
+ * Returns a function that closes the stream.
+ */
+export function subscribeToProgress(onEvent: (event: ProgressEvent) => void): () => void {
+  const source = new EventSource(`${API_BASE_URL}/progress/stream`)
+  const handler = (message: MessageEvent) => onEvent(JSON.parse(message.data))
+  for (const type of ["snapshot", "started", "cell", "completed"]) {
+    source.addEventListener(type, handler as EventListener)
+  }
+  // The server ends the stream after each run and the browser reconnects; only report a stream that gave up
+  source.onerror = (error) => {
+    if (source.readyState === EventSource.CLOSED) console.error('Progress stream error:', error)
+  }
+  return () => source.close()
+}
@@ -1,8 +1,12 @@
 "use client"
 
-import { useState, useMemo } from "react"
-import { Grid3X3, List, TrendingUp, Eye, ArrowLeft } from "lucide-react"
+import { useState, useMemo, useRef } from "react"
+import { Grid3X3, List, TrendingUp, Eye, ArrowLeft, Loader2 } from "lucide-react"
 import TestCaseCard from "./TestCaseCard"
+import VirtualList from "./VirtualList"
+import { useResultIndex } from "@/hooks/use-result-index"
+import { useWindowedRange } from "@/hooks/use-windowed-range"
+import { cellKey, type ResultIndex } from "@/utils/resultIndex"
 // Define the EvaluationData interface locally since we're no longer using data.ts
 interface EvaluationData {
   id: string
@@ -23,7 +27,6 @@ interface EvaluationData {
   results: any[]
 }
 
-type TestStatus = "success" | "incomplete" | "error"
 type ViewMode = "overview" | "heatmap" | "focused" | "list"
 
 interface Props {
@@ -31,16 +34,6 @@ interface Props {
   onBack: () => void
 }
 
-function getTestStatus(test: any): TestStatus {
-  if (!test.output_content || test.output_content.trim() === "") {
-    return "incomplete"
-  }
-  if (test.output_content.includes("error") || test.output_content.includes("Error")) {
-    return "error"
-  }
-  return "success"
-}
-
 function getModelColor(modelId: string): string {
   const colors: Record<string, string> = {
     "gpt-4o-mini-conservative": "bg-blue-500",
@@ -59,19 +52,92 @@ function ModelBadge({ modelId, size = "sm" }: { modelId: string; size?: "sm" | "
   )
 }
 
-// Scalable Overview - Shows aggregated metrics first
-function OverviewDashboard({ results }: { results: any[] }) {
-  const models = [...new Set(results.map((r) => r.model_id))]
-  const tests = [...new Set(results.map((r) => r.test_id))]
+type LatencyBreakdown = Record<string, number | null>
+
+// Parts of a call's latency, in the order they happen (see Result.latency_breakdown)
+const LATENCY_COMPONENTS = [
+  { key: "queue_ms", label: "Queue", color: "bg-gray-400" },
+  { key: "connect_ms", label: "Connect", color: "bg-yellow-500" },
+  { key: "server_ms", label: "Server", color: "bg-blue-500" },
+  { key: "transfer_ms", label: "Transfer", color: "bg-green-500" },
+  { key: "parse_ms", label: "Client", color: "bg-purple-500" },
+]
+
+// Stacked bar per model of where the time of its calls went
+function LatencyBreakdownChart({ byModel }: { byModel: Record<string, LatencyBreakdown> }) {
+  const rows = Object.entries(byModel).map(([modelId, breakdown]) => ({
+    modelId,
+    breakdown,
+    total: LATENCY_COMPONENTS.reduce((sum, { key }) => sum + (breakdown[key] || 0), 0),
+  }))
+  const longest = Math.max(...rows.map((row) => row.total), 1)
+
+  return (
+    <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
+      <h3 className="text-lg font-semibold mb-4">Latency Breakdown</h3>
+      <div className="space-y-2">
+        {rows.map(({ modelId, breakdown, total }) => (
+          <div key={modelId} className="flex items-center gap-3">
+            <div className="w-48 truncate font-mono text-xs" title={modelId}>
+              <ModelBadge modelId={modelId} size="xs" />
+              {modelId}
+            </div>
+            <div className="flex-1 flex h-5 rounded overflow-hidden bg-gray-100">
+              {LATENCY_COMPONENTS.map(({ key, label, color }) =>
+                breakdown[key] ? (
+                  <div
+                    key={key}
+                    className={color}
+                    style={{ width: `${((breakdown[key] as number) / longest) * 100}%` }}
+                    title={`${label}: ${(breakdown[key] as number).toFixed(0)}ms`}
+                  ></div>
+                ) : null,
+              )}
+            </div>
+            <div className="w-24 text-right text-xs text-gray-600">
+              {total.toFixed(0)}ms
+              {breakdown.provider_ms != null && (
+                <div className="text-gray-400" title="Processing time reported by the provider">
+                  provider {breakdown.provider_ms.toFixed(0)}ms
+                </div>
+              )}
+            </div>
+          </div>
+        ))}
+      </div>
+      <div className="flex flex-wrap gap-4 mt-4 text-xs text-gray-600">
+        {LATENCY_COMPONENTS.map(({ key, label, color }) => (
+          <span key={key} className="flex items-center gap-1">
+            <span className={`inline-block w-3 h-3 rounded ${color}`}></span>
+            {label}
+          </span>
+        ))}
+      </div>
+    </div>
+  )
+}
+
+// Row and cell sizes of the windowed matrices, in px
+const COVERAGE_ROW_HEIGHT = 32
+const HEATMAP_ROW_HEIGHT = 52
+const HEATMAP_COLUMN_WIDTH = 84
+// Height of a collapsed TestCaseCard, until it is measured
+const CARD_HEIGHT = 120
 
-  const modelStats = models.map((modelId) => {
-    const modelResults = results.filter((r) => r.model_id === modelId)
-    const avgLatency = modelResults.reduce((sum, r) => sum + r.latency_ms, 0) / modelResults.length
-    const avgTokens = modelResults.reduce((sum, r) => sum + r.total_tokens, 0) / modelResults.length
-    const successRate = (modelResults.filter((r) => getTestStatus(r) === "success").length / modelResults.length) * 100
+const resultKey = (result: any): string => result.id
 
-    return { modelId, avgLatency, avgTokens, successRate, count: modelResults.length }
-  })
+// Scalable Overview - Shows aggregated metrics first
+function OverviewDashboard({
+  index,
+  latencyBreakdown,
+}: {
+  index: ResultIndex
+  latencyBreakdown?: Record<string, LatencyBreakdown>
+}) {
+  const { models, tests } = index
+  const coverageRef = useRef<HTMLDivElement>(null)
+  const visibleTests = useWindowedRange(coverageRef, tests.length, COVERAGE_ROW_HEIGHT)
+  const coverageColumns = `120px repeat(${Math.min(models.length, 6) + (models.length > 6 ? 1 : 0)}, 1fr)`
 
   return (
     <div className="space-y-6">
@@ -82,12 +148,12 @@ function OverviewDashboard({ results }: { results: any[] }) {
           Model Performance Ranking
         </h3>
         <div className="space-y-3">
-          {modelStats
+          {[...index.modelStats]
             .sort((a, b) => b.successRate - a.successRate || a.avgLatency - b.avgLatency)
-            .map((stat, index) => (
+            .map((stat, position) => (
               <div key={stat.modelId} className="flex items-center justify-between p-3 bg-gray-50 rounded border border-gray-200">
                 <div className="flex items-center gap-3">
-                  <span className="text-lg font-bold text-gray-500">#{index + 1}</span>
+                  <span className="text-lg font-bold text-gray-500">#{position + 1}</span>
                   <ModelBadge modelId={stat.modelId} />
                   <span className="font-mono text-sm">{stat.modelId}</span>
                 </div>
@@ -110,10 +176,14 @@ function OverviewDashboard({ results }: { results: any[] }) {
         </div>
       </div>
 
+      {latencyBreakdown && Object.keys(latencyBreakdown).length > 0 && (
+        <LatencyBreakdownChart byModel={latencyBreakdown} />
+      )}
+
       {/* Test Coverage Matrix */}
       <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
         <h3 className="text-lg font-semibold mb-4">Test Coverage</h3>
-        <div className="grid gap-2" style={{ gridTemplateColumns: `120px repeat(${Math.min(models.length, 6)}, 1fr)` }}>
+        <div className="grid gap-2 mb-2" style={{ gridTemplateColumns: coverageColumns }}>
           <div></div>
           {models.slice(0, 6).map((model) => (
             <div key={model} className="text-center text-xs">
@@ -122,23 +192,36 @@ function OverviewDashboard({ results }: { results: any[] }) {
             </div>
           ))}
           {models.length > 6 && <div className="text-center text-xs text-gray-500">+{models.length - 6} more</div>}
-
-          {tests.map((testId) => (
-            <div key={testId} className="contents">
-              <div className="text-xs text-gray-700 py-1">{testId}</div>
-              {models.slice(0, 6).map((modelId) => {
-                const hasResult = results.some((r) => r.model_id === modelId && r.test_id === testId)
-                return (
-                  <div
-                    key={`${modelId}-${testId}`}
-                    className={`h-6 rounded ${hasResult ? "bg-green-500" : "bg-gray-300"}`}
-                    title={`${modelId} - ${testId}: ${hasResult ? "✓" : "✗"}`}
-                  ></div>
-                )
-              })}
-              {models.length > 6 && <div className="h-6 bg-gray-300 rounded opacity-50"></div>}
-            </div>
-          ))}
+        </div>
+        {/* Only the rows in view are rendered */}
+        <div ref={coverageRef} className="max-h-96 overflow-auto">
+          <div
+            style={{
+              paddingTop: visibleTests.start * COVERAGE_ROW_HEIGHT,
+              paddingBottom: (tests.length - visibleTests.end) * COVERAGE_ROW_HEIGHT,
+            }}
+          >
+            {tests.slice(visibleTests.start, visibleTests.end).map((testId) => (
+              <div
+                key={testId}
+                className="grid gap-2 items-center"
+                style={{ gridTemplateColumns: coverageColumns, height: COVERAGE_ROW_HEIGHT }}
+              >
+                <div className="text-xs text-gray-700 truncate">{testId}</div>
+                {models.slice(0, 6).map((modelId) => {
+                  const hasResult = cellKey(modelId, testId) in index.cells
+                  return (
+                    <div
+                      key={`${modelId}-${testId}`}
+                      className={`h-6 rounded ${hasResult ? "bg-green-500" : "bg-gray-300"}`}
+                      title={`${modelId} - ${testId}: ${hasResult ? "✓" : "✗"}`}
+                    ></div>
+                  )
+                })}
+                {models.length > 6 && <div className="h-6 bg-gray-300 rounded opacity-50"></div>}
+              </div>
+            ))}
+          </div>
         </div>
       </div>
     </div>
@@ -146,27 +229,41 @@ function OverviewDashboard({ results }: { results: any[] }) {
 }
 
 // Heatmap View - Shows performance metrics as colors
-function HeatmapView({ results }: { results: any[] }) {
-  const models = [...new Set(results.map((r) => r.model_id))]
-  const tests = [...new Set(results.map((r) => r.test_id))]
+function HeatmapView({ results, index }: { results: any[]; index: ResultIndex }) {
+  const { models, tests } = index
   const [metric, setMetric] = useState<"latency" | "tokens" | "success">("latency")
+  const gridRef = useRef<HTMLDivElement>(null)
+  const visibleTests = useWindowedRange(gridRef, tests.length, HEATMAP_ROW_HEIGHT, "vertical")
+  const visibleModels = useWindowedRange(gridRef, models.length, HEATMAP_COLUMN_WIDTH, "horizontal")
 
-  const getMetricValue = (result: any) => {
+  const getMetricValue = (position: number) => {
     switch (metric) {
       case "latency":
-        return result.latency_ms
+        return results[position].latency_ms
       case "tokens":
-        return result.total_tokens
+        return results[position].total_tokens
       case "success":
-        return getTestStatus(result) === "success" ? 100 : 0
+        return index.statuses[position] === "success" ? 100 : 0
       default:
         return 0
     }
   }
 
-  const getMetricColor = (value: number, allValues: number[]) => {
-    const min = Math.min(...allValues)
-    const max = Math.max(...allValues)
+  // Color scale bounds, over every result rather than per cell
+  const [min, max] = useMemo(() => {
+    let low = Infinity
+    let high = -Infinity
+    for (let position = 0; position < results.length; position++) {
+      const value = getMetricValue(position)
+      if (value < low) low = value
+      if (value > high) high = value
+    }
+    return [low, high]
+    // getMetricValue only depends on these
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [results, index, metric])
+
+  const getMetricColor = (value: number) => {
     const normalized = (value - min) / (max - min)
 
     if (metric === "latency") {
@@ -180,7 +277,16 @@ function HeatmapView({ results }: { results: any[] }) {
     }
   }
 
-  const allValues = results.map(getMetricValue)
+  const columns = models.slice(visibleModels.start, visibleModels.end)
+  // Columns before and after the window are kept as empty space so the grid keeps its width
+  const gridTemplateColumns = [
+    "120px",
+    visibleModels.start ? `${visibleModels.start * HEATMAP_COLUMN_WIDTH}px` : "",
+    `repeat(${columns.length}, ${HEATMAP_COLUMN_WIDTH - 4}px)`,
+    visibleModels.end < models.length ? `${(models.length - visibleModels.end) * HEATMAP_COLUMN_WIDTH}px` : "",
+  ].join(" ")
+  const spacerBefore = visibleModels.start > 0
+  const spacerAfter = visibleModels.end < models.length
 
   return (
     <div className="space-y-4">
@@ -199,24 +305,36 @@ function HeatmapView({ results }: { results: any[] }) {
         ))}
       </div>
 
-      <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm overflow-x-auto">
+      {/* Only the cells in view are rendered, in both directions */}
+      <div ref={gridRef} className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm overflow-auto max-h-[70vh]">
         <div className="min-w-max">
-          <div className="grid gap-1" style={{ gridTemplateColumns: `120px repeat(${models.length}, 80px)` }}>
+          <div className="grid gap-1 sticky top-0 bg-white z-10" style={{ gridTemplateColumns }}>
             <div></div>
-            {models.map((model) => (
+            {spacerBefore && <div></div>}
+            {columns.map((model) => (
               <div key={model} className="text-center text-xs p-2">
                 <ModelBadge modelId={model} size="xs" />
                 <div>{model.split("-").pop()}</div>
               </div>
             ))}
+            {spacerAfter && <div></div>}
+          </div>
 
-            {tests.map((testId) => (
-              <div key={testId} className="contents">
-                <div className="text-xs text-gray-700 py-2 pr-2">{testId}</div>
-                {models.map((modelId) => {
-                  const result = results.find((r) => r.model_id === modelId && r.test_id === testId)
-                  const value = result ? getMetricValue(result) : 0
-                  const color = result ? getMetricColor(value, allValues) : "#D1D5DB"
+          <div
+            style={{
+              paddingTop: visibleTests.start * HEATMAP_ROW_HEIGHT,
+              paddingBottom: (tests.length - visibleTests.end) * HEATMAP_ROW_HEIGHT,
+            }}
+          >
+            {tests.slice(visibleTests.start, visibleTests.end).map((testId) => (
+              <div key={testId} className="grid gap-1" style={{ gridTemplateColumns, height: HEATMAP_ROW_HEIGHT }}>
+                <div className="text-xs text-gray-700 py-2 pr-2 truncate">{testId}</div>
+                {spacerBefore && <div></div>}
+                {columns.map((modelId) => {
+                  const position = index.cells[cellKey(modelId, testId)]
+                  const found = position !== undefined
+                  const value = found ? getMetricValue(position) : 0
+                  const color = found ? getMetricColor(value) : "#D1D5DB"
 
                   return (
                     <div
@@ -224,15 +342,16 @@ function HeatmapView({ results }: { results: any[] }) {
                       className="h-12 rounded flex items-center justify-center text-xs font-bold text-white"
                       style={{ backgroundColor: color }}
                       title={
-                        result
+                        found
                           ? `${modelId} - ${testId}: ${value}${metric === "latency" ? "ms" : metric === "tokens" ? "t" : "%"}`
                           : "No result"
                       }
                     >
-                      {result ? (metric === "success" ? (value === 100 ? "✓" : "✗") : value.toFixed(0)) : "-"}
+                      {found ? (metric === "success" ? (value === 100 ? "✓" : "✗") : value.toFixed(0)) : "-"}
                     </div>
                   )
                 })}
+                {spacerAfter && <div></div>}
               </div>
             ))}
           </div>
@@ -245,24 +364,29 @@ function HeatmapView({ results }: { results: any[] }) {
 // Focused Comparison - Select specific items to compare
 function FocusedComparison({
   results,
+  index,
+  source,
   expandedTests,
   toggleTest,
 }: {
   results: any[]
+  index: ResultIndex
+  source: string
   expandedTests: Set<string>
   toggleTest: (testId: string) => void
 }) {
   const [selectedModels, setSelectedModels] = useState<string[]>([])
   const [selectedTest, setSelectedTest] = useState<string>("")
 
-  const models = [...new Set(results.map((r) => r.model_id))]
-  const tests = [...new Set(results.map((r) => r.test_id))]
+  const { models, tests } = index
 
-  const comparisonResults = selectedTest
-    ? results.filter(
-        (r) => r.test_id === selectedTest && (selectedModels.length === 0 || selectedModels.includes(r.model_id)),
-      )
-    : []
+  const comparisonResults = useMemo(() => {
+    if (!selectedTest) return []
+    const modelFilter = new Set(selectedModels)
+    return results
+      .filter((r) => r.test_id === selectedTest && (modelFilter.size === 0 || modelFilter.has(r.model_id)))
+      .sort((a, b) => a.latency_ms - b.latency_ms) // Sort by latency for easy comparison
+  }, [results, selectedTest, selectedModels])
 
   return (
     <div className="space-y-6">
@@ -334,18 +458,20 @@ function FocusedComparison({
           </div>
 
           {/* Use the same expandable component structure as list view */}
-          <div className="space-y-4">
-            {comparisonResults
-              .sort((a, b) => a.latency_ms - b.latency_ms) // Sort by latency for easy comparison
-              .map((result) => (
-                <TestCaseCard
-                  key={result.id}
-                  result={result}
-                  isExpanded={expandedTests.has(result.id)}
-                  onToggle={() => toggleTest(result.id)}
-                />
-              ))}
-          </div>
+          <VirtualList
+            items={comparisonResults}
+            getKey={resultKey}
+            estimatedHeight={CARD_HEIGHT}
+            className="max-h-[80vh]"
+            renderItem={(result) => (
+              <TestCaseCard
+                result={result}
+                source={source}
+                isExpanded={expandedTests.has(result.id)}
+                onToggle={() => toggleTest(result.id)}
+              />
+            )}
+          />
         </div>
       )}
 
@@ -363,7 +489,6 @@ export default function EvalResultsViewer({ evaluation, onBack }: Props) {
   const [selectedModelsFilter, setSelectedModelsFilter] = useState<string[]>([])
   const [selectedPromptsFilter, setSelectedPromptsFilter] = useState<string[]>([])
   const [selectedTestsFilter, setSelectedTestsFilter] = useState<string[]>([])
-  const [searchQuery, _] = useState("")
   const [expandedTests, setExpandedTests] = useState<Set<string>>(new Set())
 
   // Add toggle function
@@ -377,35 +502,28 @@ export default function EvalResultsViewer({ evaluation, onBack }: Props) {
     setExpandedTests(newExpanded)
   }
 
-  const models = [...new Set(evaluation.results.map((r) => r.model_id))]
-  const prompts = [...new Set(evaluation.results.map((r) => r.prompt_id))]
-  const tests = [...new Set(evaluation.results.map((r) => r.test_id))]
+  // Distinct ids, per-model stats and the model × test lookup, built in one pass (off the main thread for large runs)
+  const results = evaluation.results
+  const index = useResultIndex(results)
+  const models = index?.models ?? []
+  const prompts = index?.prompts ?? []
+  const tests = index?.tests ?? []
 
+  // Multi-select filters of the list view
   const filteredResults = useMemo(() => {
-    return evaluation.results.filter((result) => {
-      if (viewMode === "list") {
-        // Use multi-select filters for list view
-        const modelMatch = selectedModelsFilter.length === 0 || selectedModelsFilter.includes(result.model_id)
-        const promptMatch = selectedPromptsFilter.length === 0 || selectedPromptsFilter.includes(result.prompt_id)
-        const testMatch = selectedTestsFilter.length === 0 || selectedTestsFilter.includes(result.test_id)
-        return modelMatch && promptMatch && testMatch
-      } else {
-        // Use search for other views
-        const searchMatch =
-          searchQuery === "" ||
-          result.test_id.toLowerCase().includes(searchQuery.toLowerCase()) ||
-          result.model_id.toLowerCase().includes(searchQuery.toLowerCase()) ||
-          result.prompt_id.toLowerCase().includes(searchQuery.toLowerCase()) ||
-          result.output_content?.toLowerCase().includes(searchQuery.toLowerCase())
-        return searchMatch
-      }
-    })
-  }, [viewMode, selectedModelsFilter, selectedPromptsFilter, selectedTestsFilter, searchQuery, evaluation.results])
-
-  // Calculate summary statistics
-  const results = evaluation.results
-  const avgLatency = results.reduce((sum, r) => sum + r.latency_ms, 0) / results.length
-  const avgTokens = results.reduce((sum, r) => sum + r.total_tokens, 0) / results.length
+    if (!selectedModelsFilter.length && !selectedPromptsFilter.length && !selectedTestsFilter.length) {
+      return results
+    }
+    const modelFilter = new Set(selectedModelsFilter)
+    const promptFilter = new Set(selectedPromptsFilter)
+    const testFilter = new Set(selectedTestsFilter)
+    return results.filter(
+      (result) =>
+        (modelFilter.size === 0 || modelFilter.has(result.model_id)) &&
+        (promptFilter.size === 0 || promptFilter.has(result.prompt_id)) &&
+        (testFilter.size === 0 || testFilter.has(result.test_id)),
+    )
+  }, [selectedModelsFilter, selectedPromptsFilter, selectedTestsFilter, results])
 
   return (
     <div className="min-h-screen bg-gray-50 text-gray-900 p-6">
@@ -436,11 +554,11 @@ export default function EvalResultsViewer({ evaluation, onBack }: Props) {
             <div className="text-sm text-gray-600">Total Results</div>
           </div>
           <div className="bg-white p-4 rounded-lg border border-gray-200 shadow-sm">
-            <div className="text-2xl font-bold text-purple-600">{avgLatency.toFixed(0)}ms</div>
+            <div className="text-2xl font-bold text-purple-600">{(index?.avgLatency ?? 0).toFixed(0)}ms</div>
             <div className="text-sm text-gray-600">Avg Latency</div>
           </div>
           <div className="bg-white p-4 rounded-lg border border-gray-200 shadow-sm">
-            <div className="text-2xl font-bold text-orange-600">{avgTokens.toFixed(0)}</div>
+            <div className="text-2xl font-bold text-orange-600">{(index?.avgTokens ?? 0).toFixed(0)}</div>
             <div className="text-sm text-gray-600">Avg Tokens</div>
           </div>
         </div>
@@ -633,20 +751,40 @@ export default function EvalResultsViewer({ evaluation, onBack }: Props) {
 
         {/* Content */}
         <div className="space-y-6">
-          {viewMode === "overview" && <OverviewDashboard results={filteredResults} />}
-          {viewMode === "heatmap" && <HeatmapView results={filteredResults} />}
-          {viewMode === "focused" && <FocusedComparison results={filteredResults} expandedTests={expandedTests} toggleTest={toggleTest} />}
+          {!index && viewMode !== "list" && (
+            <div className="text-center py-12 text-gray-500">
+              <Loader2 className="w-6 h-6 animate-spin mx-auto mb-2 text-blue-600" />
+              Indexing {results.length} results...
+            </div>
+          )}
+          {index && viewMode === "overview" && (
+            <OverviewDashboard index={index} latencyBreakdown={evaluation.summary.latency_breakdown?.by_model} />
+          )}
+          {index && viewMode === "heatmap" && <HeatmapView results={results} index={index} />}
+          {index && viewMode === "focused" && (
+            <FocusedComparison
+              results={results}
+              index={index}
+              source={evaluation.id}
+              expandedTests={expandedTests}
+              toggleTest={toggleTest}
+            />
+          )}
           {viewMode === "list" && (
-            <div className="space-y-4">
-              {filteredResults.map((result) => (
+            <VirtualList
+              items={filteredResults}
+              getKey={resultKey}
+              estimatedHeight={CARD_HEIGHT}
+              className="max-h-[80vh]"
+              renderItem={(result) => (
                 <TestCaseCard
-                  key={result.id}
                   result={result}
+                  source={evaluation.id}
                   isExpanded={expandedTests.has(result.id)}
                   onToggle={() => toggleTest(result.id)}
                 />
-              ))}
-            </div>
+              )}
+            />
           )}
         </div>
       </div>
@@ -1,10 +1,12 @@
 "use client"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useCallback } from "react"
 import { useParams, useNavigate } from "react-router-dom"
-import { fetchResultDetail, type ResultDetail } from "../api/results"
+import { fetchResultRows, subscribeToProgress, type ResultDetail } from "../api/results"
 import { Loader2 } from "lucide-react"
 import EvalResultsViewer from "./EvalResultsViewer"
+import LiveProgress from "./LiveProgress"
+import LoadTestViewer, { type LoadTestResult } from "./LoadTestViewer"
 
 // Transform API result to match the expected EvaluationData format
 function transformResultToEvaluationData(result: ResultDetail, filename: string) {
@@ -27,8 +29,17 @@ export default function EvaluationDetail() {
   const { id } = useParams<{ id: string }>()
   const navigate = useNavigate()
   const [evaluation, setEvaluation] = useState<any>(null)
+  const [loadTest, setLoadTest] = useState<LoadTestResult | null>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  // Set when the result file is not written yet because the evaluation is still running
+  const [running, setRunning] = useState(false)
+  const [reloadKey, setReloadKey] = useState(0)
+
+  const handleCompleted = useCallback(() => {
+    setRunning(false)
+    setReloadKey((key) => key + 1)
+  }, [])
   
   useEffect(() => {
     const loadEvaluation = async () => {
@@ -41,10 +52,19 @@ export default function EvaluationDetail() {
       try {
         setLoading(true)
         setError(null)
-        const result = await fetchResultDetail(decodeURIComponent(id))
+        // Transcripts are left out and fetched per result when opened
+        const result = await fetchResultRows(decodeURIComponent(id))
+        if (result.type === "load") {
+          setLoadTest(result as LoadTestResult)
+          return
+        }
         const transformedEvaluation = transformResultToEvaluationData(result, decodeURIComponent(id))
         setEvaluation(transformedEvaluation)
       } catch (err) {
+        if (err instanceof Error && err.message.startsWith('Result file not found')) {
+          setRunning(true)
+          return
+        }
         setError(err instanceof Error ? err.message : 'Failed to load evaluation')
         console.error('Error loading evaluation:', err)
       } finally {
@@ -53,6 +73,17 @@ export default function EvaluationDetail() {
     }
 
     loadEvaluation()
+  }, [id, reloadKey])
+
+  // Reload when a watch-mode run (rawbench run --watch) rewrites this result file
+  useEffect(() => {
+    if (!id) return
+    const name = decodeURIComponent(id)
+    return subscribeToProgress((event) => {
+      if (event.type === "completed" && event.result_file?.replace(/\.(json|rbz)$/, '') === name) {
+        setReloadKey((key) => key + 1)
+      }
+    })
   }, [id])
   
   if (!id) {
@@ -74,6 +105,16 @@ export default function EvaluationDetail() {
     )
   }
 
+  if (running) {
+    return (
+      <div className="min-h-screen bg-gray-50 text-gray-900 p-6">
+        <div className="max-w-6xl mx-auto">
+          <LiveProgress onCompleted={handleCompleted} />
+        </div>
+      </div>
+    )
+  }
+
   if (loading) {
     return (
       <div className="min-h-screen bg-gray-50 text-gray-900 p-6">
@@ -87,6 +128,10 @@ export default function EvaluationDetail() {
     )
   }
 
+  if (loadTest) {
+    return <LoadTestViewer name={decodeURIComponent(id)} result={loadTest} onBack={() => navigate("/")} />
+  }
+
   if (error || !evaluation) {
     return (
       <div className="min-h-screen bg-gray-50 text-gray-900 p-6">
@@ -30,13 +30,13 @@ export default function EvaluationsList() {
   }, [])
 
   const handleSelectEvaluation = (evaluation: ResultSummary) => {
-    navigate(`/evaluation/${encodeURIComponent(evaluation.filename.slice(0, -5))}`)
+    navigate(`/evaluation/${encodeURIComponent(evaluation.filename.replace(/\.(json|rbz)$/, ''))}`)
   }
 
   // Transform API data to match the expected format
   const transformedEvaluations = evaluations.map(evaluation => ({
     id: evaluation.filename,
-    name: evaluation.filename.replace(/\.json$/, '').replace(/_/g, ' '),
+    name: evaluation.filename.replace(/\.(json|rbz)$/, '').replace(/_/g, ' '),
     description: `Evaluation results from ${evaluation.filename}`,
     count_models: evaluation.summary.count_models,
     count_prompts: evaluation.summary.count_prompts,
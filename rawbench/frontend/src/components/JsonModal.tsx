@@ -2,23 +2,28 @@
 
 import type React from "react"
 
-import { useState } from "react"
-import { X, Copy, Check } from "lucide-react"
+import { useMemo, useState } from "react"
+import { X, Copy, Check, Loader2 } from "lucide-react"
 
 interface JsonModalProps {
   isOpen: boolean
   onClose: () => void
+  // Undefined while the data is still loading
   data: any
+  error?: string | null
   title: string
 }
 
-export default function JsonModal({ isOpen, onClose, data, title }: JsonModalProps) {
+export default function JsonModal({ isOpen, onClose, data, error, title }: JsonModalProps) {
   const [copied, setCopied] = useState(false)
+  // Serialized only while open and once loaded; transcripts can be large
+  const jsonString = useMemo(
+    () => (isOpen && data !== undefined ? JSON.stringify(data, null, 2) : ""),
+    [isOpen, data],
+  )
 
   if (!isOpen) return null
 
-  const jsonString = JSON.stringify(data, null, 2)
-
   const handleCopy = async () => {
     try {
       await navigator.clipboard.writeText(jsonString)
@@ -74,9 +79,22 @@ export default function JsonModal({ isOpen, onClose, data, title }: JsonModalPro
 
         {/* Content */}
         <div className="flex-1 overflow-auto">
-          <pre className="p-4 text-xs font-mono text-gray-700 bg-gray-50 whitespace-pre-wrap break-words">
-            <code>{jsonString}</code>
-          </pre>
+          {data === undefined ? (
+            <div className="flex items-center justify-center gap-2 p-8 text-sm text-gray-500">
+              {error ? (
+                <span className="text-red-600">{error}</span>
+              ) : (
+                <>
+                  <Loader2 className="w-4 h-4 animate-spin" />
+                  Loading...
+                </>
+              )}
+            </div>
+          ) : (
+            <pre className="p-4 text-xs font-mono text-gray-700 bg-gray-50 whitespace-pre-wrap break-words">
+              <code>{jsonString}</code>
+            </pre>
+          )}
         </div>
 
         {/* Footer */}
@@ -0,0 +1,104 @@
+"use client"
+
+import { useEffect, useState } from "react"
+import { Activity, Loader2 } from "lucide-react"
+import { subscribeToProgress, type ProgressEvent, type ProgressStats } from "../api/results"
+
+const MAX_RECENT_CELLS = 10
+
+interface Props {
+  onCompleted: () => void
+}
+
+function formatEta(seconds: number | null): string {
+  if (seconds === null) return "—"
+  if (seconds < 60) return `${seconds.toFixed(0)}s`
+  return `${Math.floor(seconds / 60)}m ${Math.round(seconds % 60)}s`
+}
+
+// Live view of an evaluation that is still running (rawbench run --serve)
+export default function LiveProgress({ onCompleted }: Props) {
+  const [stats, setStats] = useState<ProgressStats | null>(null)
+  const [recentCells, setRecentCells] = useState<NonNullable<ProgressEvent["cell"]>[]>([])
+
+  useEffect(() => {
+    return subscribeToProgress((event) => {
+      setStats(event.stats)
+      if (event.type === "cell" && event.cell) {
+        const cell = event.cell
+        setRecentCells((cells) => [cell, ...cells].slice(0, MAX_RECENT_CELLS))
+      }
+      if (event.type === "completed") {
+        onCompleted()
+      }
+    })
+  }, [onCompleted])
+
+  if (!stats || stats.total === 0) {
+    return (
+      <div className="text-center py-12">
+        <Loader2 className="w-8 h-8 animate-spin mx-auto mb-4 text-blue-600" />
+        <h3 className="text-lg font-semibold text-gray-500 mb-2">Waiting for the evaluation to start...</h3>
+      </div>
+    )
+  }
+
+  const percent = (stats.completed / stats.total) * 100
+
+  return (
+    <div className="space-y-6">
+      <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
+        <h3 className="text-lg font-semibold mb-4 flex items-center gap-2">
+          <Activity className="w-5 h-5" />
+          Running {stats.evaluation_id}
+        </h3>
+        <div className="w-full h-3 bg-gray-200 rounded">
+          <div className="h-3 bg-blue-600 rounded transition-all" style={{ width: `${percent}%` }}></div>
+        </div>
+        <div className="text-sm text-gray-600 mt-2">
+          {stats.completed} / {stats.total} cells · ETA {formatEta(stats.eta_s)}
+        </div>
+        <div className="grid grid-cols-5 gap-4 mt-4 text-xs">
+          <div className="text-center">
+            <div className="text-gray-500">Cells/s</div>
+            <div className="font-bold text-gray-700">{stats.cells_per_sec.toFixed(2)}</div>
+          </div>
+          <div className="text-center">
+            <div className="text-gray-500">Tokens/s</div>
+            <div className="font-bold text-purple-600">{stats.tokens_per_sec.toFixed(0)}</div>
+          </div>
+          <div className="text-center">
+            <div className="text-gray-500">p50</div>
+            <div className="font-bold text-blue-600">{stats.latency_ms.p50.toFixed(0)}ms</div>
+          </div>
+          <div className="text-center">
+            <div className="text-gray-500">p90</div>
+            <div className="font-bold text-blue-600">{stats.latency_ms.p90.toFixed(0)}ms</div>
+          </div>
+          <div className="text-center">
+            <div className="text-gray-500">p99</div>
+            <div className="font-bold text-blue-600">{stats.latency_ms.p99.toFixed(0)}ms</div>
+          </div>
+        </div>
+      </div>
+
+      {recentCells.length > 0 && (
+        <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
+          <h3 className="text-sm font-semibold mb-3 text-gray-600">Recently completed</h3>
+          <div className="space-y-1">
+            {recentCells.map((cell) => (
+              <div key={cell.id} className="flex justify-between text-xs font-mono">
+                <span>
+                  {cell.model_id} · {cell.prompt_id} · {cell.test_id}
+                </span>
+                <span className="text-gray-500">
+                  {cell.latency_ms ?? "-"}ms · {cell.total_tokens}t
+                </span>
+              </div>
+            ))}
+          </div>
+        </div>
+      )}
+    </div>
+  )
+}
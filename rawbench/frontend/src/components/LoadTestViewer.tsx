@@ -0,0 +1,172 @@
+"use client"
+
+import { ArrowLeft, Gauge } from "lucide-react"
+import { CartesianGrid, Legend, Line, LineChart, ResponsiveContainer, Tooltip, XAxis, YAxis } from "recharts"
+
+interface Distribution {
+  p50: number
+  p90: number
+  p99: number
+  mean: number
+}
+
+export interface LoadStepStats {
+  model_id: string
+  step: number
+  offered_qps: number
+  sent_qps: number
+  requests: number
+  errors: number
+  error_rate: number
+  throughput_rps: number
+  output_tokens_per_sec: number
+  latency_ms: Distribution
+  ttft_ms: Distribution
+}
+
+export interface LoadTestResult {
+  type: "load"
+  summary: {
+    evaluation_id: string
+    arrival: string
+    models: Record<string, { max_throughput_rps: number; saturation_qps: number | null; max_unsaturated_qps: number | null }>
+    [key: string]: any
+  }
+  steps: LoadStepStats[]
+}
+
+interface Props {
+  name: string
+  result: LoadTestResult
+  onBack: () => void
+}
+
+const COLORS = ["#2563eb", "#9333ea", "#16a34a", "#ea580c", "#dc2626", "#0891b2"]
+
+// Saturation curves of a `rawbench load` result: throughput and latency against offered load
+export default function LoadTestViewer({ name, result, onBack }: Props) {
+  const modelIds = Object.keys(result.summary.models)
+  // One row per offered rate, one column per model and metric
+  const rows = new Map<number, Record<string, number>>()
+  for (const step of result.steps) {
+    const row = rows.get(step.offered_qps) ?? { offered_qps: step.offered_qps }
+    row[`${step.model_id}:throughput`] = step.throughput_rps
+    row[`${step.model_id}:p50`] = step.latency_ms.p50
+    row[`${step.model_id}:p99`] = step.latency_ms.p99
+    row[`${step.model_id}:ttft`] = step.ttft_ms.p50
+    rows.set(step.offered_qps, row)
+  }
+  const data = Array.from(rows.values()).sort((a, b) => a.offered_qps - b.offered_qps)
+
+  return (
+    <div className="min-h-screen bg-gray-50 text-gray-900 p-6">
+      <div className="max-w-6xl mx-auto space-y-6">
+        <button onClick={onBack} className="flex items-center gap-2 text-sm text-gray-600 hover:text-gray-900">
+          <ArrowLeft className="w-4 h-4" />
+          Back to Evaluations
+        </button>
+
+        <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
+          <h1 className="text-2xl font-bold flex items-center gap-2">
+            <Gauge className="w-6 h-6" />
+            {name}
+          </h1>
+          <p className="text-sm text-gray-500 mt-1">
+            Load test of {result.summary.evaluation_id} · {result.summary.arrival} arrivals · {result.steps.length} steps
+          </p>
+          <div className="grid grid-cols-3 gap-4 mt-4 text-sm">
+            {modelIds.map((modelId) => {
+              const model = result.summary.models[modelId]
+              return (
+                <div key={modelId} className="border border-gray-200 rounded p-3">
+                  <div className="font-semibold">{modelId}</div>
+                  <div className="text-gray-600">Max throughput: {model.max_throughput_rps.toFixed(2)} rps</div>
+                  <div className="text-gray-600">
+                    Saturation: {model.saturation_qps !== null ? `${model.saturation_qps} qps` : "not reached"}
+                  </div>
+                </div>
+              )
+            })}
+          </div>
+        </div>
+
+        <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
+          <h3 className="text-lg font-semibold mb-4">Throughput vs offered load</h3>
+          <ResponsiveContainer width="100%" height={300}>
+            <LineChart data={data}>
+              <CartesianGrid strokeDasharray="3 3" />
+              <XAxis dataKey="offered_qps" label={{ value: "offered qps", position: "insideBottom", offset: -5 }} />
+              <YAxis label={{ value: "rps", angle: -90, position: "insideLeft" }} />
+              <Tooltip />
+              <Legend />
+              <Line dataKey="offered_qps" name="ideal" stroke="#9ca3af" strokeDasharray="4 4" dot={false} />
+              {modelIds.map((modelId, index) => (
+                <Line
+                  key={modelId}
+                  dataKey={`${modelId}:throughput`}
+                  name={modelId}
+                  stroke={COLORS[index % COLORS.length]}
+                />
+              ))}
+            </LineChart>
+          </ResponsiveContainer>
+        </div>
+
+        <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm">
+          <h3 className="text-lg font-semibold mb-4">Latency vs offered load</h3>
+          <ResponsiveContainer width="100%" height={300}>
+            <LineChart data={data}>
+              <CartesianGrid strokeDasharray="3 3" />
+              <XAxis dataKey="offered_qps" label={{ value: "offered qps", position: "insideBottom", offset: -5 }} />
+              <YAxis label={{ value: "ms", angle: -90, position: "insideLeft" }} />
+              <Tooltip />
+              <Legend />
+              {modelIds.flatMap((modelId, index) => [
+                <Line key={`${modelId}:p50`} dataKey={`${modelId}:p50`} name={`${modelId} p50`}
+                      stroke={COLORS[index % COLORS.length]} />,
+                <Line key={`${modelId}:p99`} dataKey={`${modelId}:p99`} name={`${modelId} p99`}
+                      stroke={COLORS[index % COLORS.length]} strokeDasharray="4 4" />,
+                <Line key={`${modelId}:ttft`} dataKey={`${modelId}:ttft`} name={`${modelId} TTFT p50`}
+                      stroke={COLORS[index % COLORS.length]} strokeOpacity={0.5} />,
+              ])}
+            </LineChart>
+          </ResponsiveContainer>
+        </div>
+
+        <div className="bg-white rounded-lg p-6 border border-gray-200 shadow-sm overflow-x-auto">
+          <h3 className="text-lg font-semibold mb-4">Steps</h3>
+          <table className="w-full text-xs font-mono">
+            <thead>
+              <tr className="text-left text-gray-500">
+                <th className="py-1">model</th>
+                <th>offered qps</th>
+                <th>sent qps</th>
+                <th>rps</th>
+                <th>tok/s</th>
+                <th>p50</th>
+                <th>p99</th>
+                <th>TTFT p50</th>
+                <th>errors</th>
+              </tr>
+            </thead>
+            <tbody>
+              {result.steps.map((step) => (
+                <tr key={`${step.model_id}:${step.step}`} className="border-t border-gray-100">
+                  <td className="py-1">{step.model_id}</td>
+                  <td>{step.offered_qps}</td>
+                  <td>{step.sent_qps.toFixed(2)}</td>
+                  <td>{step.throughput_rps.toFixed(2)}</td>
+                  <td>{step.output_tokens_per_sec.toFixed(0)}</td>
+                  <td>{step.latency_ms.p50.toFixed(0)}ms</td>
+                  <td>{step.latency_ms.p99.toFixed(0)}ms</td>
+                  <td>{step.ttft_ms.p50.toFixed(0)}ms</td>
+                  <td className={step.errors ? "text-red-600" : ""}>{(step.error_rate * 100).toFixed(1)}%</td>
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      </div>
+    </div>
+  )
+}
@@ -1,15 +1,58 @@
 "use client"
 
-import { useState } from "react"
-import { ChevronRight, Code } from "lucide-react"
+import { useEffect, useState } from "react"
+import { ChevronRight, Code, Loader2 } from "lucide-react"
 import JsonModal from "./JsonModal"
+import { fetchResultAt } from "../api/results"
 
 interface TestCaseCardProps {
   result: any
+  // Result file the result comes from; rows without transcripts load them from it on demand
+  source?: string
   isExpanded: boolean
   onToggle: () => void
 }
 
+// Complete results fetched so far, by file and position; cards are unmounted as they scroll out of view
+const fullResults = new Map<string, any>()
+const FULL_RESULTS_CACHE_SIZE = 200
+
+// The result with its transcripts, fetched when `needed` and the row doesn't carry them
+function useFullResult(result: any, source: string | undefined, needed: boolean) {
+  const complete = result.output_messages !== undefined || source === undefined || result.index === undefined
+  const cacheKey = `${source}:${result.index}`
+  const [full, setFull] = useState<any>(() => (complete ? result : fullResults.get(cacheKey)))
+  const [error, setError] = useState<string | null>(null)
+
+  useEffect(() => {
+    if (complete) {
+      setFull(result)
+      return
+    }
+    const cached = fullResults.get(cacheKey)
+    if (cached) {
+      setFull(cached)
+      return
+    }
+    if (!needed) return
+    let cancelled = false
+    fetchResultAt(source as string, result.index)
+      .then((data) => {
+        fullResults.set(cacheKey, data)
+        if (fullResults.size > FULL_RESULTS_CACHE_SIZE) {
+          fullResults.delete(fullResults.keys().next().value as string)
+        }
+        if (!cancelled) setFull(data)
+      })
+      .catch((err) => !cancelled && setError(err instanceof Error ? err.message : "Failed to load transcript"))
+    return () => {
+      cancelled = true
+    }
+  }, [result, source, cacheKey, complete, needed])
+
+  return { full, error }
+}
+
 function ModelBadge({ modelId, size = "sm" }: { modelId: string; size?: "sm" | "xs" }) {
   const getModelColor = (modelId: string): string => {
     const colors: Record<string, string> = {
@@ -28,8 +71,9 @@ function ModelBadge({ modelId, size = "sm" }: { modelId: string; size?: "sm" | "
   )
 }
 
-export default function TestCaseCard({ result, isExpanded, onToggle }: TestCaseCardProps) {
+export default function TestCaseCard({ result, source, isExpanded, onToggle }: TestCaseCardProps) {
   const [showJsonModal, setShowJsonModal] = useState(false)
+  const { full, error } = useFullResult(result, source, isExpanded || showJsonModal)
 
   const handleJsonClick = (e: React.MouseEvent) => {
     e.stopPropagation() // Prevent card expansion when clicking JSON button
@@ -55,20 +99,58 @@ export default function TestCaseCard({ result, isExpanded, onToggle }: TestCaseC
               >
                 <Code className="w-3 h-3" />
               </button>
-              <span>{result.latency_ms}ms</span>
+              <span
+                title={Object.entries(result.latency_breakdown || {})
+                  .filter(([, value]) => value !== null && value !== undefined)
+                  .map(([key, value]) => `${key.replace(/_ms$/, "")}: ${(value as number).toFixed(0)}ms`)
+                  .join("\n")}
+              >
+                {result.latency_ms}ms
+              </span>
               <span>{result.total_tokens}t</span>
               <ChevronRight className={`w-4 h-4 transition-transform ${isExpanded ? "rotate-90" : ""}`} />
             </div>
           </div>
+          {result.status === "error" && (
+            <div className="text-xs text-red-600 mb-1">
+              {result.error_type}: {result.error_message} (after {result.attempts} attempt{result.attempts !== 1 ? "s" : ""})
+            </div>
+          )}
+          {result.scores?.length > 0 && (
+            <div className="flex flex-wrap gap-1 mb-1">
+              {result.scores.map((score: any, index: number) => (
+                <span
+                  key={index}
+                  className={`text-xs px-2 py-0.5 rounded border ${score.passed ? "bg-green-50 text-green-700 border-green-200" : "bg-red-50 text-red-700 border-red-200"}`}
+                  title={score.reason || ""}
+                >
+                  {score.passed ? "✓" : "✗"} {score.name}
+                  {score.score !== null && score.score !== undefined ? ` ${score.score.toFixed(2)}` : ""}
+                </span>
+              ))}
+            </div>
+          )}
           <div className="text-sm text-gray-700">{result.output_content || "No output"}</div>
         </div>
 
         {isExpanded && (
           <div className="px-4 pb-4 border-t border-gray-200 bg-gray-50">
             <div className="pt-4 space-y-4">
+              {!full && (
+                <div className="flex items-center gap-2 text-sm text-gray-500">
+                  {error ? (
+                    <span className="text-red-600">{error}</span>
+                  ) : (
+                    <>
+                      <Loader2 className="w-4 h-4 animate-spin" />
+                      Loading transcript...
+                    </>
+                  )}
+                </div>
+              )}
               <div>
                 <h4 className="text-sm font-semibold text-gray-700 mb-2">Input Messages</h4>
-                {result.input_messages?.map((msg: any, index: number) => (
+                {full?.input_messages?.map((msg: any, index: number) => (
                   <div key={index} className="border-l-2 border-l-blue-400 bg-blue-50 pl-3 py-2 mb-3">
                     <div className="text-xs text-gray-500 uppercase tracking-wide mb-1">{msg.role}</div>
                     <div className="text-sm font-mono whitespace-pre-wrap text-gray-700">{msg.content || "No content"}</div>
@@ -78,7 +160,7 @@ export default function TestCaseCard({ result, isExpanded, onToggle }: TestCaseC
 
               <div>
                 <h4 className="text-sm font-semibold text-gray-700 mb-2">Output Messages</h4>
-                {result.output_messages?.map((msg: any, index: number) => (
+                {full?.output_messages?.map((msg: any, index: number) => (
                   <div key={index} className="border-l-2 border-l-green-400 bg-green-50 pl-3 py-2 mb-3">
                     <div className="text-xs text-gray-500 uppercase tracking-wide mb-1">{msg.role}</div>
                     <div className="text-sm font-mono whitespace-pre-wrap text-gray-700">{msg.content || "No content"}</div>
@@ -124,7 +206,8 @@ export default function TestCaseCard({ result, isExpanded, onToggle }: TestCaseC
       <JsonModal
         isOpen={showJsonModal}
         onClose={() => setShowJsonModal(false)}
-        data={result}
+        data={full}
+        error={error}
         title={`Raw JSON - ${result.test_id}`}
       />
     </>
@@ -0,0 +1,110 @@
+import { type ReactNode, useCallback, useLayoutEffect, useMemo, useRef, useState } from "react"
+
+interface VirtualListProps<T> {
+  items: T[]
+  getKey: (item: T) => string
+  renderItem: (item: T, index: number) => ReactNode
+  // Height assumed for items that haven't been rendered yet
+  estimatedHeight: number
+  gap?: number
+  overscan?: number
+  className?: string
+}
+
+/**
+ * A scrolling list that only renders the items in view. Item heights may vary
+ * (e.g. expanded cards); each rendered item is measured and remembered by key.
+ */
+export default function VirtualList<T>({
+  items,
+  getKey,
+  renderItem,
+  estimatedHeight,
+  gap = 16,
+  overscan = 3,
+  className = "",
+}: VirtualListProps<T>) {
+  const containerRef = useRef<HTMLDivElement>(null)
+  const heights = useRef(new Map<string, number>())
+  const [measured, setMeasured] = useState(0)
+  const [viewport, setViewport] = useState({ top: 0, height: 800 })
+
+  const observer = useMemo(
+    () =>
+      new ResizeObserver((entries, observer) => {
+        let changed = false
+        for (const entry of entries) {
+          const element = entry.target as HTMLElement
+          if (!element.isConnected) {
+            // Scrolled out of view; keep its last height
+            observer.unobserve(element)
+            continue
+          }
+          const key = element.dataset.key as string
+          const height = element.offsetHeight
+          if (heights.current.get(key) !== height) {
+            heights.current.set(key, height)
+            changed = true
+          }
+        }
+        if (changed) setMeasured((count) => count + 1)
+      }),
+    [],
+  )
+  useLayoutEffect(() => () => observer.disconnect(), [observer])
+
+  const measure = useCallback(
+    (element: HTMLDivElement | null) => {
+      if (element) observer.observe(element)
+    },
+    [observer],
+  )
+
+  useLayoutEffect(() => {
+    const container = containerRef.current
+    if (!container) return
+    const update = () => setViewport({ top: container.scrollTop, height: container.clientHeight })
+    update()
+    container.addEventListener("scroll", update, { passive: true })
+    return () => container.removeEventListener("scroll", update)
+  }, [])
+
+  // Offset of each item from the top of the list
+  const offsets = useMemo(() => {
+    const positions = new Float64Array(items.length + 1)
+    items.forEach((item, index) => {
+      positions[index + 1] = positions[index] + (heights.current.get(getKey(item)) ?? estimatedHeight) + gap
+    })
+    return positions
+    // measured changes whenever a rendered item's height does
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [items, getKey, estimatedHeight, gap, measured])
+
+  // First item ending below the top of the viewport
+  let low = 0
+  let high = items.length
+  while (low < high) {
+    const middle = (low + high) >> 1
+    if (offsets[middle + 1] <= viewport.top) low = middle + 1
+    else high = middle
+  }
+  const start = Math.max(0, low - overscan)
+  let end = low
+  while (end < items.length && offsets[end] < viewport.top + viewport.height) end++
+  end = Math.min(items.length, end + overscan)
+
+  return (
+    <div ref={containerRef} className={`overflow-auto ${className}`}>
+      <div style={{ paddingTop: offsets[start], paddingBottom: offsets[items.length] - offsets[end] }}>
+        {items.slice(start, end).map((item, position) => {
+          const key = getKey(item)
+          return (
+            <div key={key} data-key={key} ref={measure} style={{ marginBottom: gap }}>
+              {renderItem(item, start + position)}
+            </div>
+          )
+        })}
+      </div>
+    </div>
+  )
+}
@@ -0,0 +1,45 @@
+import { useEffect, useMemo, useRef, useState } from "react"
+import { indexResults, type ResultIndex } from "@/utils/resultIndex"
+
+// Below this many results, indexing in place is cheaper than a round trip to the worker
+const WORKER_MIN_RESULTS = 2000
+
+/**
+ * The ResultIndex of a results array, built in a Web Worker for large runs.
+ * Null while the worker is indexing a new array.
+ */
+export function useResultIndex(results: any[]): ResultIndex | null {
+  const inPlace = results.length < WORKER_MIN_RESULTS || typeof Worker === "undefined"
+  const localIndex = useMemo(() => (inPlace ? indexResults(results) : null), [results, inPlace])
+  const [workerIndex, setWorkerIndex] = useState<{ results: any[]; index: ResultIndex } | null>(null)
+  const workerRef = useRef<Worker | null>(null)
+  const requestRef = useRef(0)
+
+  useEffect(() => {
+    if (inPlace) return
+    if (!workerRef.current) {
+      workerRef.current = new Worker(new URL("../utils/resultIndex.worker.ts", import.meta.url), { type: "module" })
+    }
+    const worker = workerRef.current
+    const id = ++requestRef.current
+    const onMessage = (event: MessageEvent<{ id: number; index: ResultIndex }>) => {
+      if (event.data.id === id) {
+        setWorkerIndex({ results, index: event.data.index })
+      }
+    }
+    worker.addEventListener("message", onMessage)
+    worker.postMessage({ id, results })
+    return () => worker.removeEventListener("message", onMessage)
+  }, [results, inPlace])
+
+  useEffect(
+    () => () => {
+      workerRef.current?.terminate()
+      workerRef.current = null
+    },
+    [],
+  )
+
+  if (localIndex) return localIndex
+  return workerIndex && workerIndex.results === results ? workerIndex.index : null
+}
@@ -0,0 +1,42 @@
+import { type RefObject, useLayoutEffect, useState } from "react"
+
+export interface WindowedRange {
+  start: number
+  end: number
+}
+
+/**
+ * The items of a fixed-size list visible in a scroll container, plus `overscan`
+ * items on each side. Only [start, end) need to be rendered.
+ */
+export function useWindowedRange(
+  containerRef: RefObject<HTMLElement>,
+  count: number,
+  itemSize: number,
+  axis: "vertical" | "horizontal" = "vertical",
+  overscan = 4,
+): WindowedRange {
+  const [range, setRange] = useState<WindowedRange>({ start: 0, end: Math.min(count, 20) })
+
+  useLayoutEffect(() => {
+    const container = containerRef.current
+    if (!container) return
+    const update = () => {
+      const offset = axis === "vertical" ? container.scrollTop : container.scrollLeft
+      const size = axis === "vertical" ? container.clientHeight : container.clientWidth
+      const start = Math.max(0, Math.floor(offset / itemSize) - overscan)
+      const end = Math.min(count, Math.ceil((offset + size) / itemSize) + overscan)
+      setRange((previous) => (previous.start === start && previous.end === end ? previous : { start, end }))
+    }
+    update()
+    container.addEventListener("scroll", update, { passive: true })
+    const observer = new ResizeObserver(update)
+    observer.observe(container)
+    return () => {
+      container.removeEventListener("scroll", update)
+      observer.disconnect()
+    }
+  }, [containerRef, count, itemSize, axis, overscan])
+
+  return range
+}
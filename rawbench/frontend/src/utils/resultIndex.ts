@@ -0,0 +1,95 @@
+// One-pass aggregation of an evaluation's results, shared by the dashboard views.
+// Runs in a Web Worker (resultIndex.worker.ts) so large runs don't block rendering.
+
+export type TestStatus = "success" | "incomplete" | "error"
+
+export interface ModelStats {
+  modelId: string
+  count: number
+  avgLatency: number
+  avgTokens: number
+  successRate: number
+}
+
+export interface ResultIndex {
+  models: string[]
+  prompts: string[]
+  tests: string[]
+  // Status of each result, by position
+  statuses: TestStatus[]
+  modelStats: ModelStats[]
+  // First result of each model × test pair, by position
+  cells: Record<string, number>
+  avgLatency: number
+  avgTokens: number
+}
+
+export function getTestStatus(test: any): TestStatus {
+  if (test.status === "error") {
+    return "error"
+  }
+  // Tests with an assert block are scored by the backend
+  if (typeof test.passed === "boolean") {
+    return test.passed ? "success" : "error"
+  }
+  if (!test.output_content || test.output_content.trim() === "") {
+    return "incomplete"
+  }
+  if (test.output_content.includes("error") || test.output_content.includes("Error")) {
+    return "error"
+  }
+  return "success"
+}
+
+export function cellKey(modelId: string, testId: string): string {
+  return `${modelId}\u0000${testId}`
+}
+
+export function indexResults(results: any[]): ResultIndex {
+  const models = new Map<string, { count: number; latency: number; tokens: number; successes: number }>()
+  const prompts = new Set<string>()
+  const tests = new Set<string>()
+  const statuses: TestStatus[] = new Array(results.length)
+  const cells: Record<string, number> = {}
+  let latency = 0
+  let tokens = 0
+
+  results.forEach((result, position) => {
+    let model = models.get(result.model_id)
+    if (!model) {
+      model = { count: 0, latency: 0, tokens: 0, successes: 0 }
+      models.set(result.model_id, model)
+    }
+    prompts.add(result.prompt_id)
+    tests.add(result.test_id)
+    const status = getTestStatus(result)
+    statuses[position] = status
+    model.count += 1
+    model.latency += result.latency_ms || 0
+    model.tokens += result.total_tokens || 0
+    model.successes += status === "success" ? 1 : 0
+    latency += result.latency_ms || 0
+    tokens += result.total_tokens || 0
+    const key = cellKey(result.model_id, result.test_id)
+    if (!(key in cells)) {
+      cells[key] = position
+    }
+  })
+
+  return {
+    models: [...models.keys()],
+    prompts: [...prompts],
+    tests: [...tests],
+    statuses,
+    modelStats: [...models].map(([modelId, model]) => ({
+      modelId,
+      count: model.count,
+      avgLatency: model.latency / model.count,
+      avgTokens: model.tokens / model.count,
+      successRate: (model.successes / model.count) * 100,
+    })),
+    cells,
+    avgLatency: results.length ? latency / results.length : 0,
+    avgTokens: results.length ? tokens / results.length : 0,
+  }
+}
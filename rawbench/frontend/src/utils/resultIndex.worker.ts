@@ -0,0 +1,10 @@
+import { indexResults } from "./resultIndex"
+
+// The worker's global scope; typed as a Worker since the project only has the DOM lib
+const scope = self as unknown as Worker
+
+// Receives { id, results } and answers { id, index }
+scope.onmessage = (event: MessageEvent<{ id: number; results: any[] }>) => {
+  const { id, results } = event.data
+  scope.postMessage({ id, index: indexResults(results) })
+}
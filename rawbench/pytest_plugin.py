@@ -0,0 +1,140 @@
+"""
+pytest plugin: every model×prompt×test cell of a rawbench config is a pytest item.
+
+Config files matching the `rawbench_files` ini patterns (rawbench_*.yaml by default)
+are collected. Items can be selected with -k on their model, prompt, test or
+evaluation id. Without pytest-xdist, the selected cells of a file run concurrently in
+one background run and each item waits for its own result; under xdist each worker
+runs the cells it is given, compiling each file once and reusing its evaluation
+(plan, connection pool and limiters) for every cell of that file.
+
+A cell fails when its model call errored or when any check of its 'assert' block failed.
+
+The plugin is not registered automatically, since importing rawbench imports litellm
+(several seconds); enable it with `-p rawbench.pytest_plugin` or
+`pytest_plugins = ["rawbench.pytest_plugin"]` in a conftest.py.
+"""
+
+import fnmatch
+from typing import Any, Dict, Optional
+
+import pytest
+
+from .services.evaluation import EvaluationService
+
+DEFAULT_FILE_PATTERNS = ["rawbench_*.yaml", "rawbench_*.yml"]
+# Compiled evaluations of an xdist worker, by config path
+_worker_evaluations = pytest.StashKey[Dict[str, Any]]()
+
+
+def pytest_addoption(parser):
+    parser.addini("rawbench_files", type="args", default=DEFAULT_FILE_PATTERNS,
+                  help="glob patterns of rawbench evaluation configs to collect as tests")
+
+
+def pytest_unconfigure(config):
+    for evaluation in config.stash.get(_worker_evaluations, {}).values():
+        evaluation.close()
+
+
+def pytest_collect_file(parent, file_path):
+    patterns = parent.config.getini("rawbench_files")
+    if any(fnmatch.fnmatch(file_path.name, pattern) for pattern in patterns):
+        return RawbenchFile.from_parent(parent, path=file_path)
+    return None
+
+
+class CellFailure(Exception):
+    """A cell whose call errored or whose checks did not all pass."""
+
+    def __init__(self, result):
+        super().__init__(result.id)
+        self.result = result
+
+
+class _Recorder:
+    """Progress listener keeping the Results of a run."""
+
+    def __init__(self):
+        self.results = []
+
+    def start(self, evaluation_id, total_cells):
+        pass
+
+    def record(self, result):
+        self.results.append(result)
+
+
+class RawbenchFile(pytest.File):
+    """An evaluation config; its cells are collected without calling any model."""
+
+    def collect(self):
+        plan = EvaluationService().plan_evaluation(str(self.path))
+        for cell_id, model_id, prompt_id, test_id in plan.cell_labels():
+            item = RawbenchItem.from_parent(self, name=f"{test_id}[{model_id}-{prompt_id}]", cell_id=cell_id)
+            item.extra_keyword_matches.update({plan.evaluation_id, model_id, prompt_id, test_id})
+            yield item
+
+    def setup(self):
+        self._stream = None
+        self._results = {}
+
+    def teardown(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def result(self, item: "RawbenchItem"):
+        """The item's Result, or None when its cell was not run (e.g. the budget ran out)."""
+        if hasattr(self.config, "workerinput"):
+            # Under xdist, items arrive at each worker one by one, possibly interleaved with other files
+            evaluations = self.config.stash.setdefault(_worker_evaluations, {})
+            if str(self.path) not in evaluations:
+                evaluations[str(self.path)] = EvaluationService().build_evaluation(str(self.path))
+            recorder = _Recorder()
+            evaluations[str(self.path)].run(progress=recorder, select={item.cell_id}, quiet=True)
+            return next(iter(recorder.results), None)
+        if self._stream is None:
+            # Run every selected cell of the file at once; -k has already deselected the others
+            selected = [other.cell_id for other in self.session.items if other.parent is self]
+            self._stream = EvaluationService().stream(str(self.path), select=selected)
+        for result in self._stream:
+            if result.id == item.cell_id:
+                return result
+            self._results[result.id] = result
+        return self._results.pop(item.cell_id, None)
+
+
+class RawbenchItem(pytest.Item):
+    """One model×prompt×test cell."""
+
+    def __init__(self, *, cell_id: str, **kwargs):
+        super().__init__(**kwargs)
+        self.cell_id = cell_id
+
+    def runtest(self):
+        result = self.parent.result(self)
+        if result is None:
+            pytest.skip("cell was not run")
+        self.user_properties.extend([
+            ("latency_ms", result.latency_ms),
+            ("total_tokens", result.total_tokens),
+            ("cost", result.cost),
+        ])
+        if result.status == "error" or result.passed is False:
+            raise CellFailure(result)
+
+    def repr_failure(self, excinfo, style: Optional[str] = None):
+        if not isinstance(excinfo.value, CellFailure):
+            return super().repr_failure(excinfo, style)
+        result = excinfo.value.result
+        if result.status == "error":
+            return f"{result.error_type}: {result.error_message}"
+        lines = [f"{score['name']}: {score['reason']}"
+                 for score in result.scores if not score["passed"]]
+        output = result.output_content or ""
+        lines.append(f"output: {output[:500]}{'…' if len(output) > 500 else ''}")
+        return "\n".join(lines)
+
+    def reportinfo(self):
+        return self.path, None, f"rawbench: {self.cell_id}"
@@ -6,5 +6,9 @@ Results management and reporting.
 
 # Import core result classes
 from .result import Result, ResultCollector
+from .store import CompactResultStore
+from .archive import ResultArchive, ResultArchiveWriter, load_result_file, write_archive
+from .search import SearchIndex
 
-__all__ = ['Result', 'ResultCollector']
+__all__ = ['CompactResultStore', 'Result', 'ResultArchive', 'ResultArchiveWriter', 'ResultCollector',
+           'SearchIndex', 'load_result_file', 'write_archive']
@@ -0,0 +1,309 @@
+"""
+Compressed result archives (.rbz).
+
+Layout:
+
+    header   b"RBZ\\0", format version, codec (b"z" zstd, b"d" zlib)
+    blocks   compressed JSON lines, BLOCK_SIZE results each
+    summary  compressed JSON
+    strings  compressed JSON list of shared strings (the input messages of each test)
+    extra    compressed JSON of the file's other top-level keys (e.g. a suite's
+             evaluations or a load test's steps), when it has any
+    index    compressed JSON: result count, ids, created_at, section and block offsets
+    trailer  index offset and length (two little-endian uint64) and b"RBZ1"
+
+Results reference their input messages by position in the strings section, and an
+output_content equal to the content of the last output message is left out. Blocks are
+compressed independently, so reading one result only decompresses its block.
+"""
+
+import json
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib is always available
+    zstandard = None
+
+ARCHIVE_SUFFIX = ".rbz"
+MAGIC = b"RBZ\x00"
+VERSION = 1
+TRAILER = struct.Struct("<QQ4s")
+TRAILER_MAGIC = b"RBZ1"
+BLOCK_SIZE = 64
+ZSTD = b"z"
+ZLIB = b"d"
+# Decompressed blocks kept per open archive
+BLOCK_CACHE_SIZE = 8
+
+
+def is_archive(path) -> bool:
+    return Path(path).suffix == ARCHIVE_SUFFIX
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class _Codec:
+    def __init__(self, codec: bytes, level: Optional[int] = None):
+        if codec == ZSTD and zstandard is None:
+            raise RuntimeError("Reading this archive requires zstandard (pip install 'raw-bench[compression]')")
+        self.codec = codec
+        if codec == ZSTD:
+            self._compressor = zstandard.ZstdCompressor(level=level or 10)
+            self._decompressor = zstandard.ZstdDecompressor()
+        self.level = level or 6
+
+    def compress(self, data: bytes) -> bytes:
+        if self.codec == ZSTD:
+            return self._compressor.compress(data)
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.codec == ZSTD:
+            # Frames written by compress() carry their content size
+            return self._decompressor.decompress(data)
+        return zlib.decompress(data)
+
+
+class ResultArchiveWriter:
+    """Streams results into an archive; the summary is written on close."""
+
+    def __init__(self, filepath: str, compression: Optional[str] = None, block_size: int = BLOCK_SIZE):
+        if compression is None:
+            compression = "zstd" if zstandard is not None else "zlib"
+        self._codec = _Codec(ZSTD if compression == "zstd" else ZLIB)
+        self.block_size = block_size
+        self.summary: Dict[str, Any] = {}
+        # Top-level keys of the result file besides summary and results
+        self.extra: Dict[str, Any] = {}
+        self._file = open(filepath, "wb")
+        self._file.write(MAGIC + bytes([VERSION]) + self._codec.codec)
+        self._strings: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._created_at: Optional[str] = None
+        self._blocks: List[Tuple[int, int, int]] = []
+        self._pending: List[bytes] = []
+
+    def add(self, result: Dict[str, Any]):
+        """Add one result, as produced by Result.to_dict()."""
+        row = dict(result)
+        inputs = row.pop("input_messages", None)
+        if inputs is not None:
+            encoded = _dumps(inputs).decode("utf-8")
+            row["input_ref"] = self._strings.setdefault(encoded, len(self._strings))
+        messages = row.get("output_messages") or []
+        last = messages[-1] if messages else None
+        if isinstance(last, dict) and row.get("output_content") is not None \
+                and last.get("content") == row["output_content"]:
+            del row["output_content"]
+        self._ids.append(row.get("id"))
+        if self._created_at is None:
+            self._created_at = row.get("created_at")
+        self._pending.append(_dumps(row))
+        if len(self._pending) >= self.block_size:
+            self._flush_block()
+
+    def _flush_block(self):
+        if not self._pending:
+            return
+        offset, length = self._write(b"\n".join(self._pending))
+        self._blocks.append((offset, length, len(self._pending)))
+        self._pending = []
+
+    def _write(self, data: bytes) -> Tuple[int, int]:
+        compressed = self._codec.compress(data)
+        offset = self._file.tell()
+        self._file.write(compressed)
+        return offset, len(compressed)
+
+    def close(self):
+        self._flush_block()
+        strings = [None] * len(self._strings)
+        for value, index in self._strings.items():
+            strings[index] = value
+        index = {
+            "version": VERSION,
+            "count": len(self._ids),
+            "block_size": self.block_size,
+            "ids": self._ids,
+            "created_at": self._created_at,
+            "summary": self._write(_dumps(self.summary)),
+            "strings": self._write(_dumps(strings)),
+            "blocks": self._blocks,
+        }
+        if self.extra:
+            index["extra"] = self._write(_dumps(self.extra))
+        index_offset, index_length = self._write(_dumps(index))
+        self._file.write(TRAILER.pack(index_offset, index_length, TRAILER_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+
+def write_archive(filepath: str, summary: Dict[str, Any], results: Iterable[Dict[str, Any]],
+                  compression: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+    """Write an archive from a summary, result dicts and any other top-level keys of the file."""
+    with ResultArchiveWriter(filepath, compression) as writer:
+        writer.summary = summary
+        writer.extra = extra or {}
+        for result in results:
+            writer.add(result)
+
+
+class ResultArchive:
+    """Random access to the results of an archive without decompressing the whole file."""
+
+    def __init__(self, filepath: str):
+        self.filepath = str(filepath)
+        self._file = open(self.filepath, "rb")
+        self._lock = threading.Lock()
+        header = self._file.read(len(MAGIC) + 2)
+        if header[:len(MAGIC)] != MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.filepath} is not a rawbench result archive")
+        if header[len(MAGIC)] > VERSION:
+            self._file.close()
+            raise ValueError(f"{self.filepath} has archive version {header[len(MAGIC)]}, "
+                             f"this rawbench reads up to {VERSION}")
+        self._codec = _Codec(header[len(MAGIC) + 1:])
+        self._file.seek(-TRAILER.size, 2)
+        index_offset, index_length, magic = TRAILER.unpack(self._file.read(TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.filepath} is truncated")
+        self._index = json.loads(self._read(index_offset, index_length))
+        self.ids: List[str] = self._index["ids"]
+        self.created_at: Optional[str] = self._index.get("created_at")
+        self._positions: Optional[Dict[str, int]] = None
+        self._block_starts: List[int] = []
+        start = 0
+        for _, _, count in self._index["blocks"]:
+            self._block_starts.append(start)
+            start += count
+        self._summary: Optional[Dict[str, Any]] = None
+        self._extra: Optional[Dict[str, Any]] = None
+        self._strings: Optional[List[str]] = None
+        self._blocks: "OrderedDict[int, List[bytes]]" = OrderedDict()
+
+    def _read(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return self._codec.decompress(data)
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        if self._summary is None:
+            self._summary = json.loads(self._read(*self._index["summary"]))
+        return self._summary
+
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """Top-level keys of the original file besides summary and results."""
+        if self._extra is None:
+            section = self._index.get("extra")
+            self._extra = json.loads(self._read(*section)) if section else {}
+        return self._extra
+
+    def __len__(self) -> int:
+        return self._index["count"]
+
+    def _block(self, block: int) -> List[bytes]:
+        with self._lock:
+            lines = self._blocks.get(block)
+            if lines is not None:
+                self._blocks.move_to_end(block)
+                return lines
+        offset, length, _ = self._index["blocks"][block]
+        lines = self._read(offset, length).split(b"\n")
+        with self._lock:
+            self._blocks[block] = lines
+            while len(self._blocks) > BLOCK_CACHE_SIZE:
+                self._blocks.popitem(last=False)
+        return lines
+
+    def _expand(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if "input_ref" in row:
+            if self._strings is None:
+                self._strings = json.loads(self._read(*self._index["strings"]))
+            row["input_messages"] = json.loads(self._strings[row.pop("input_ref")])
+        if "output_content" not in row:
+            messages = row.get("output_messages") or []
+            row["output_content"] = messages[-1].get("content") if messages else None
+        # Keep Result.to_dict() field order
+        ordered = {"id": row.pop("id"), "prompt_id": row.pop("prompt_id", None),
+                   "model_id": row.pop("model_id", None), "test_id": row.pop("test_id", None),
+                   "input_messages": row.pop("input_messages", None),
+                   "output_content": row.pop("output_content")}
+        ordered.update(row)
+        return ordered
+
+    def get(self, index: int) -> Dict[str, Any]:
+        """The result at a position, as a dict."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result index out of range")
+        block = index // self._index["block_size"]
+        lines = self._block(block)
+        return self._expand(json.loads(lines[index - self._block_starts[block]]))
+
+    def find(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """The result with an id, or None."""
+        if self._positions is None:
+            self._positions = {result_id: index for index, result_id in enumerate(self.ids)}
+        index = self._positions.get(result_id)
+        return None if index is None else self.get(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for block in range(len(self._index["blocks"])):
+            for line in self._block(block):
+                yield self._expand(json.loads(line))
+
+    def export_to_json(self, filepath: str):
+        """Write the archive as a regular result JSON file."""
+        with open(filepath, "w") as f:
+            f.write("{")
+            for key, value in self.extra.items():
+                f.write(f"{json.dumps(key)}: ")
+                json.dump(value, f, indent=2)
+                f.write(",\n")
+            f.write('"summary": ')
+            json.dump(self.summary, f, indent=2)
+            f.write(',\n"results": [')
+            for position, result in enumerate(self):
+                f.write("\n" if position == 0 else ",\n")
+                f.write(json.dumps(result))
+            f.write("\n]}\n")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_result_file(filepath) -> Dict[str, Any]:
+    """The summary and results of a result JSON file or archive."""
+    if is_archive(filepath):
+        with ResultArchive(filepath) as archive:
+            return {**archive.extra, "summary": archive.summary, "results": list(archive)}
+    with open(filepath, "r") as f:
+        return json.load(f)
@@ -1,9 +1,12 @@
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from litellm import ModelResponse
 
+# Parts of Result.latency_breakdown, in ms (see core.model.call_breakdown)
+LATENCY_COMPONENTS = ("queue_ms", "connect_ms", "server_ms", "provider_ms", "transfer_ms", "parse_ms")
+
 @dataclass
 class Result:
     id: str
@@ -16,7 +19,21 @@ class Result:
     completion_tokens: int = 0
     prompt_tokens: int = 0
     total_tokens: int = 0
+    cached_tokens: int = 0
+    cost: Optional[float] = None
     latency_ms: Optional[int] = None
+    # Connection setup (TCP + TLS) of the cell's calls, not included in latency_ms
+    connect_ms: int = 0
+    # Where the time of the cell's calls went (LATENCY_COMPONENTS); None for parts that weren't measured
+    latency_breakdown: Dict[str, Optional[float]] = field(default_factory=dict)
+    # "success" or "error"; failed cells keep whatever output was produced before the failure
+    status: str = "success"
+    error_type: Optional[str] = None
+    error_message: Optional[str] = None
+    attempts: int = 1
+    # Outcome of each check of the test's 'assert' block; passed is None when the test has none
+    scores: List[Dict[str, Any]] = field(default_factory=list)
+    passed: Optional[bool] = None
     created_at: datetime = field(default_factory=datetime.now)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -26,13 +43,94 @@ class Result:
         return data
 
 
+def summarize_scores(rows: Iterable[Tuple[str, List[Dict[str, Any]], Optional[bool]]]) -> Optional[Dict[str, Any]]:
+    """Pass rates and mean scores per assertion and per model from (model_id, scores, passed) rows,
+    and the spend of the judge calls behind them."""
+    scored = passed = 0
+    judge_cost, judge_tokens = 0.0, 0
+    assertions: Dict[str, Dict[str, Any]] = {}
+    by_model: Dict[str, Dict[str, Any]] = {}
+    for model_id, scores, result_passed in rows:
+        if result_passed is None:
+            continue
+        scored += 1
+        passed += result_passed
+        model = by_model.setdefault(model_id, {'scored': 0, 'passed': 0})
+        model['scored'] += 1
+        model['passed'] += result_passed
+        for score in scores:
+            entry = assertions.setdefault(score['name'], {
+                'type': score['type'], 'count': 0, 'passed': 0, 'score_sum': 0.0, 'errors': 0,
+            })
+            entry['count'] += 1
+            entry['passed'] += score['passed']
+            judge_cost += score.get('judge_cost', 0.0)
+            judge_tokens += score.get('judge_tokens', 0)
+            if score['score'] is None:
+                entry['errors'] += 1
+            else:
+                entry['score_sum'] += score['score']
+    if not scored:
+        return None
+    for entry in assertions.values():
+        graded = entry['count'] - entry['errors']
+        entry['pass_rate'] = entry['passed'] / entry['count']
+        score_sum = entry.pop('score_sum')
+        entry['avg_score'] = score_sum / graded if graded else None
+    for model in by_model.values():
+        model['pass_rate'] = model['passed'] / model['scored']
+    return {
+        'scored_results': scored,
+        'passed_results': passed,
+        'pass_rate': passed / scored,
+        'assertions': assertions,
+        'by_model': by_model,
+        'judge_cost': judge_cost,
+        'judge_tokens': judge_tokens,
+    }
+
+
+def summarize_latency(rows: Iterable[Tuple[str, Dict[str, Optional[float]]]]) -> Optional[Dict[str, Any]]:
+    """Mean of each latency component, overall and per model, from (model_id, latency_breakdown) rows.
+
+    Each component is averaged over the results that measured it.
+    """
+    totals: Dict[str, list] = {}
+    by_model: Dict[str, Dict[str, list]] = {}
+    for model_id, breakdown in rows:
+        model = by_model.setdefault(model_id, {})
+        for key, value in (breakdown or {}).items():
+            if value is None:
+                continue
+            for sums in (totals, model):
+                entry = sums.setdefault(key, [0.0, 0])
+                entry[0] += value
+                entry[1] += 1
+    if not totals:
+        return None
+
+    def means(sums):
+        return {key: sums[key][0] / sums[key][1] if key in sums else None for key in LATENCY_COMPONENTS}
+
+    return {
+        'avg': means(totals),
+        'by_model': {model_id: means(sums) for model_id, sums in by_model.items() if sums},
+    }
+
+
 class ResultCollector:
     def __init__(self):
         self.results = []
+        # Run-level information merged into the summary (budget, stop reason, ...)
+        self.metadata: Dict[str, Any] = {}
     
     def add_result(self, result: Result):
         """Add a result to the collector."""
         self.results.append(result)
+
+    def sort_by_id(self, positions: Dict[str, int]):
+        """Reorder results by the position of their id (e.g. the plan's cell order)."""
+        self.results.sort(key=lambda r: positions.get(r.id, 0))
     
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of all results."""
@@ -44,23 +142,64 @@ class ResultCollector:
                 'success_rate': 0.0,
                 'total_tokens': 0,
                 'total_cost': 0.0,
-                'avg_latency': 0.0
+                'avg_latency': 0.0,
+                **self.metadata
             }
         
         total_results = len(self.results)
+        failed = [r for r in self.results if r.status != "success"]
+        errors_by_type: Dict[str, int] = {}
+        for r in failed:
+            errors_by_type[r.error_type or "other"] = errors_by_type.get(r.error_type or "other", 0) + 1
         
         total_tokens = sum(r.total_tokens or 0 for r in self.results)
+        total_cost = sum(r.cost or 0.0 for r in self.results)
         avg_latency = sum(r.latency_ms or 0 for r in self.results) / total_results if total_results > 0 else 0
         count_models = len(set(r.model_id for r in self.results))
         count_prompts = len(set(r.prompt_id for r in self.results))
-        return {
+
+        cost_by_model: Dict[str, Dict[str, Any]] = {}
+        for r in self.results:
+            model_cost = cost_by_model.setdefault(r.model_id, {
+                'results': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                'cached_tokens': 0, 'total_tokens': 0, 'total_cost': 0.0,
+            })
+            model_cost['results'] += 1
+            model_cost['prompt_tokens'] += r.prompt_tokens or 0
+            model_cost['completion_tokens'] += r.completion_tokens or 0
+            model_cost['cached_tokens'] += r.cached_tokens or 0
+            model_cost['total_tokens'] += r.total_tokens or 0
+            model_cost['total_cost'] += r.cost or 0.0
+
+        summary = {
             'total_results': total_results,
+            'successful_results': total_results - len(failed),
+            'failed_results': len(failed),
+            'success_rate': (total_results - len(failed)) / total_results,
+            'errors_by_type': errors_by_type,
             'total_tokens': total_tokens,
+            'total_cost': total_cost,
             'avg_latency': avg_latency,
             'count_models': count_models,
-            'count_prompts': count_prompts
+            'count_prompts': count_prompts,
+            'cost_by_model': cost_by_model,
         }
+        scores = summarize_scores((r.model_id, r.scores, r.passed) for r in self.results)
+        if scores:
+            summary['scores'] = scores
+            # Grading is part of what the run cost
+            summary['total_cost'] += scores['judge_cost']
+        latency = summarize_latency((r.model_id, r.latency_breakdown) for r in self.results)
+        if latency:
+            summary['latency_breakdown'] = latency
+        summary.update(self.metadata)
+        return summary
     
+    def export_to_archive(self, filepath: str, compression: Optional[str] = None):
+        """Export all results to a compressed archive (see results.archive)."""
+        from .archive import write_archive
+        write_archive(filepath, self.get_summary(), (r.to_dict() for r in self.results), compression)
+
     def export_to_json(self, filepath: str):
         """Export all results to JSON file."""
         data = {
@@ -0,0 +1,273 @@
+"""
+Full-text search over result files.
+
+An SQLite FTS5 index of every result's output, tool calls and test input, kept next to
+the results (results/.rawbench-search.db). update() re-indexes only the files whose
+mtime or size changed and drops the ones that were deleted, so keeping it current costs
+one directory listing.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .archive import ARCHIVE_SUFFIX, ResultArchive, is_archive
+
+INDEX_FILENAME = ".rawbench-search.db"
+SCHEMA_VERSION = 1
+# Minimum time between two directory scans triggered by searches
+UPDATE_INTERVAL_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    rowid INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    result_id TEXT,
+    evaluation_id TEXT,
+    model_id TEXT,
+    prompt_id TEXT,
+    test_id TEXT,
+    status TEXT,
+    passed INTEGER,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS results_file ON results (file_id);
+CREATE INDEX IF NOT EXISTS results_model ON results (model_id);
+CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS results_text USING fts5 (
+    output, tools, input,
+    -- Keeps identifiers such as tool names whole
+    tokenize = "unicode61 tokenchars '_'"
+);
+"""
+
+FILTERS = {
+    "model": "r.model_id = ?",
+    "prompt": "r.prompt_id = ?",
+    "test": "r.test_id = ?",
+    "evaluation": "r.evaluation_id = ?",
+    "status": "r.status = ?",
+    "file": "f.name = ?",
+    "since": "r.created_at >= ?",
+    "until": "r.created_at < ?",
+}
+
+
+def _text(content: Any) -> str:
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    # Multi-part content (text blocks, images)
+    if isinstance(content, list):
+        return "\n".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def _tool_calls(messages: List[Dict[str, Any]]) -> str:
+    """Tool calls of a transcript as 'name arguments' lines."""
+    calls = []
+    for message in messages or []:
+        for call in (message.get("tool_calls") or []) if isinstance(message, dict) else []:
+            function = call.get("function") or {}
+            calls.append(f"{function.get('name', '')} {function.get('arguments') or ''}")
+    return "\n".join(calls)
+
+
+def _iter_results(path: Path) -> Iterator[Dict[str, Any]]:
+    if is_archive(path):
+        with ResultArchive(str(path)) as archive:
+            yield from archive
+        return
+    with open(path, "r") as f:
+        data = json.load(f)
+    results = data.get("results") if isinstance(data, dict) else None
+    # Suite summaries and load test files have no per-cell results
+    for result in results if isinstance(results, list) else []:
+        if isinstance(result, dict):
+            yield result
+
+
+def _match_expression(query: str) -> str:
+    """Each whitespace-separated term as an FTS5 string, for queries that are not valid FTS5 syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class SearchIndex:
+    """Full-text index of the result files of a directory."""
+
+    def __init__(self, results_dir: str = "results", index_path: Optional[str] = None):
+        self.results_dir = Path(results_dir)
+        self.index_path = Path(index_path) if index_path else self.results_dir / INDEX_FILENAME
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._updated_at: Optional[float] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # Rebuilt from the result files, which remain the source of truth
+                for table in ("results_text", "results", "files"):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _result_files(self) -> Dict[str, os.stat_result]:
+        if not self.results_dir.exists():
+            return {}
+        return {
+            path.name: path.stat()
+            for path in [*self.results_dir.glob("*.json"), *self.results_dir.glob(f"*{ARCHIVE_SUFFIX}")]
+            if path.is_file()
+        }
+
+    def update(self) -> Dict[str, int]:
+        """Index new and changed result files and forget deleted ones."""
+        with self._lock:
+            connection = self._connect()
+            indexed = {name: (file_id, mtime_ns, size) for file_id, name, mtime_ns, size
+                       in connection.execute("SELECT id, name, mtime_ns, size FROM files")}
+            stats = {"indexed": 0, "removed": 0, "unchanged": 0, "results": 0}
+            current = self._result_files()
+            for name, (file_id, _, _) in indexed.items():
+                if name not in current:
+                    with connection:
+                        self._remove(connection, file_id)
+                    stats["removed"] += 1
+            for name, stat in current.items():
+                known = indexed.get(name)
+                if known and known[1:] == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    with connection:
+                        if known:
+                            self._remove(connection, known[0])
+                        stats["results"] += self._add(connection, name, stat)
+                    stats["indexed"] += 1
+                except (OSError, ValueError) as e:
+                    # Still being written, or not a result file; skipped until it changes
+                    print(f"⚠️  Skipping {name} in the search index: {e}")
+                    with connection:
+                        if known:
+                            self._remove(connection, known[0])
+                        connection.execute("INSERT INTO files (name, mtime_ns, size) VALUES (?, ?, ?)",
+                                           (name, stat.st_mtime_ns, stat.st_size))
+            self._updated_at = time.monotonic()
+            return stats
+
+    def _remove(self, connection: sqlite3.Connection, file_id: int):
+        connection.execute("DELETE FROM results_text WHERE rowid IN (SELECT rowid FROM results WHERE file_id = ?)",
+                           (file_id,))
+        connection.execute("DELETE FROM results WHERE file_id = ?", (file_id,))
+        connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def _add(self, connection: sqlite3.Connection, name: str, stat) -> int:
+        file_id = connection.execute("INSERT INTO files (name, mtime_ns, size) VALUES (?, ?, ?)",
+                                     (name, stat.st_mtime_ns, stat.st_size)).lastrowid
+        # Test inputs repeat for every model and prompt; encode each distinct one once
+        inputs: Dict[str, str] = {}
+        count = 0
+        for position, result in enumerate(_iter_results(self.results_dir / name)):
+            result_id = result.get("id") or ""
+            rowid = connection.execute(
+                "INSERT INTO results (file_id, position, result_id, evaluation_id, model_id, prompt_id, test_id,"
+                " status, passed, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_id, position, result_id, result_id.split("::")[0], result.get("model_id"),
+                 result.get("prompt_id"), result.get("test_id"), result.get("status", "success"),
+                 None if result.get("passed") is None else int(result["passed"]), result.get("created_at")),
+            ).lastrowid
+            messages = result.get("input_messages") or []
+            key = json.dumps(messages, sort_keys=True, default=str)
+            if key not in inputs:
+                inputs[key] = "\n".join(_text(message.get("content")) for message in messages
+                                        if isinstance(message, dict))
+            connection.execute(
+                "INSERT INTO results_text (rowid, output, tools, input) VALUES (?, ?, ?, ?)",
+                (rowid, _text(result.get("output_content")), _tool_calls(result.get("output_messages")),
+                 inputs[key]),
+            )
+            count += 1
+        return count
+
+    def search(self, query: str, limit: int = 50, offset: int = 0, refresh: bool = True,
+               **filters: Optional[str]) -> Dict[str, Any]:
+        """
+        Results matching an FTS5 query, best matches first.
+
+        Columns can be targeted with FTS5 syntax (tools:search_tool, output:"exact phrase").
+        filters: model, prompt, test, evaluation, status, file, since and until (ISO dates).
+        """
+        started = time.perf_counter()
+        if refresh and (self._updated_at is None or time.monotonic() - self._updated_at > UPDATE_INTERVAL_SECONDS):
+            self.update()
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown search filter {', '.join(sorted(unknown))}")
+        conditions, parameters = [], []
+        for name, value in filters.items():
+            if value:
+                conditions.append(FILTERS[name])
+                parameters.append(value)
+        where = "".join(f" AND {condition}" for condition in conditions)
+        with self._lock:
+            connection = self._connect()
+            try:
+                total, hits = self._query(connection, query, where, parameters, limit, offset)
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax (e.g. stray quotes or dashes); search the plain terms
+                total, hits = self._query(connection, _match_expression(query), where, parameters, limit, offset)
+        return {
+            "query": query,
+            "total": total,
+            "hits": hits,
+            "took_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    def _query(self, connection: sqlite3.Connection, match: str, where: str, parameters: List[Any],
+               limit: int, offset: int) -> Tuple[int, List[Dict[str, Any]]]:
+        # CROSS JOIN keeps the full-text match as the outer loop, rather than scanning
+        # every result of a filtered model and testing the match row by row
+        source = (" FROM results_text CROSS JOIN results r ON r.rowid = results_text.rowid"
+                  " CROSS JOIN files f ON f.id = r.file_id WHERE results_text MATCH ?" + where)
+        total = connection.execute("SELECT COUNT(*)" + source, [match, *parameters]).fetchone()[0]
+        rows = connection.execute(
+            "SELECT f.name, r.position, r.result_id, r.evaluation_id, r.model_id, r.prompt_id, r.test_id,"
+            " r.status, r.passed, r.created_at, snippet(results_text, -1, '[', ']', '…', 16)"
+            + source + " ORDER BY rank LIMIT ? OFFSET ?",
+            [match, *parameters, limit, offset],
+        ).fetchall()
+        hits = [
+            {
+                "file": name, "index": position, "id": result_id, "evaluation_id": evaluation_id,
+                "model_id": model_id, "prompt_id": prompt_id, "test_id": test_id, "status": status,
+                "passed": None if passed is None else bool(passed), "created_at": created_at,
+                "snippet": snippet,
+            }
+            for (name, position, result_id, evaluation_id, model_id, prompt_id, test_id, status, passed,
+                 created_at, snippet) in rows
+        ]
+        return total, hits
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,336 @@
+import json
+import math
+import tempfile
+import threading
+import zlib
+from array import array
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .result import LATENCY_COMPONENTS, Result, ResultCollector, summarize_latency, summarize_scores
+
+# Transcripts kept in memory before new ones are spilled to a temporary file
+DEFAULT_SPILL_THRESHOLD = 64 * 1024 * 1024
+# Transcripts at least this large are zlib-compressed
+COMPRESS_MIN_BYTES = 512
+
+_NONE_INT = -1
+# Marks an output_content equal to the content of the last transcript message
+_FROM_TRANSCRIPT = object()
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class StringPool:
+    """Interns strings so repeated values are stored once and referenced by index."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE_INT
+        index = self._ids.get(value)
+        if index is None:
+            index = len(self._values)
+            self._ids[value] = index
+            self._values.append(value)
+        return index
+
+    def get(self, index: int) -> Optional[str]:
+        return None if index == _NONE_INT else self._values[index]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class TranscriptStore:
+    """
+    Output transcripts as compact JSON bytes, spilled to a temporary file past a threshold.
+
+    Each entry starts with a marker byte: b"j" for plain JSON, b"z" for zlib-compressed JSON.
+    """
+
+    def __init__(self, spill_threshold: int = DEFAULT_SPILL_THRESHOLD):
+        self.spill_threshold = spill_threshold
+        self.memory_bytes = 0
+        self._memory: List[Optional[bytes]] = []
+        # (offset, length) in the spill file, or None for in-memory entries
+        self._spilled: List[Optional[tuple]] = []
+        self._spill_file = None
+        self._lock = threading.Lock()
+
+    def add(self, messages: List[Dict[str, Any]]) -> int:
+        data = _dumps(messages)
+        if len(data) >= COMPRESS_MIN_BYTES:
+            data = b"z" + zlib.compress(data, 1)
+        else:
+            data = b"j" + data
+        with self._lock:
+            index = len(self._memory)
+            if self.memory_bytes + len(data) <= self.spill_threshold:
+                self._memory.append(data)
+                self._spilled.append(None)
+                self.memory_bytes += len(data)
+            else:
+                if self._spill_file is None:
+                    self._spill_file = tempfile.TemporaryFile(prefix="rawbench-transcripts-")
+                self._spill_file.seek(0, 2)
+                self._memory.append(None)
+                self._spilled.append((self._spill_file.tell(), len(data)))
+                self._spill_file.write(data)
+            return index
+
+    def get_bytes(self, index: int) -> bytes:
+        """The JSON encoding of a transcript."""
+        with self._lock:
+            data = self._memory[index]
+            if data is None:
+                offset, length = self._spilled[index]
+                self._spill_file.seek(offset)
+                data = self._spill_file.read(length)
+        return zlib.decompress(data[1:]) if data[:1] == b"z" else data[1:]
+
+    def get(self, index: int) -> List[Dict[str, Any]]:
+        return json.loads(self.get_bytes(index))
+
+    @property
+    def spilled(self) -> int:
+        return sum(1 for entry in self._spilled if entry is not None)
+
+    def close(self):
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+
+class CompactResultStore(ResultCollector):
+    """
+    Memory-compact drop-in for ResultCollector.
+
+    Scalars live in typed array columns, ids and statuses are interned, each distinct
+    input conversation is stored once (the same test messages are shared by every
+    model × prompt) and output transcripts are kept as compact JSON bytes, spilled to
+    disk past spill_threshold. Results are materialized only when read.
+    """
+
+    INT_COLUMNS = ("completion_tokens", "prompt_tokens", "total_tokens", "cached_tokens",
+                   "latency_ms", "connect_ms", "attempts")
+    POOLED_COLUMNS = ("prompt_id", "model_id", "test_id", "status", "error_type")
+
+    def __init__(self, spill_threshold: int = DEFAULT_SPILL_THRESHOLD):
+        self.metadata: Dict[str, Any] = {}
+        self._strings = StringPool()
+        self._inputs = StringPool()
+        # Input message lists are shared by every cell of a test; skip re-encoding them
+        self._input_cache: Dict[int, tuple] = {}
+        self.transcripts = TranscriptStore(spill_threshold)
+
+        self._ids: List[str] = []
+        self._pooled = {column: array("l") for column in self.POOLED_COLUMNS}
+        self._ints = {column: array("q") for column in self.INT_COLUMNS}
+        # NaN marks a missing cost
+        self._cost = array("d")
+        self._created_at = array("d")
+        self._input = array("l")
+        self._output_content: List[Any] = []
+        self._error_message: List[Optional[str]] = []
+        self._transcript = array("l")
+        # Assertion scores are small and only present for tests with an 'assert' block
+        self._scores: List[Optional[list]] = []
+        self._passed = array("b")
+        # One column per latency component; NaN where it wasn't measured
+        self._latency = {key: array("d") for key in LATENCY_COMPONENTS}
+        self._lock = threading.Lock()
+
+    def add_result(self, result: Result):
+        cached = self._input_cache.get(id(result.input_messages))
+        if cached is not None and cached[0] is result.input_messages:
+            input_index = cached[1]
+        else:
+            input_index = self._inputs.add(_dumps(result.input_messages).decode("utf-8"))
+            # Holding the list keeps its id from being reused by another object
+            self._input_cache[id(result.input_messages)] = (result.input_messages, input_index)
+        transcript_index = self.transcripts.add(result.output_messages)
+        output_content = result.output_content
+        last_message = result.output_messages[-1] if result.output_messages else None
+        if isinstance(last_message, dict) and output_content is not None \
+                and last_message.get("content") == output_content:
+            output_content = _FROM_TRANSCRIPT
+        with self._lock:
+            self._ids.append(result.id)
+            for column in self.POOLED_COLUMNS:
+                self._pooled[column].append(self._strings.add(getattr(result, column)))
+            for column in self.INT_COLUMNS:
+                value = getattr(result, column)
+                self._ints[column].append(_NONE_INT if value is None else int(value))
+            self._cost.append(math.nan if result.cost is None else result.cost)
+            self._created_at.append(result.created_at.timestamp())
+            self._input.append(input_index)
+            self._output_content.append(output_content)
+            self._error_message.append(result.error_message)
+            self._transcript.append(transcript_index)
+            self._scores.append(result.scores or None)
+            self._passed.append(_NONE_INT if result.passed is None else int(result.passed))
+            for key, values in self._latency.items():
+                value = result.latency_breakdown.get(key)
+                values.append(math.nan if value is None else value)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _int(self, column: str, row: int) -> Optional[int]:
+        value = self._ints[column][row]
+        return None if value == _NONE_INT else value
+
+    def _row(self, row: int) -> Result:
+        cost = self._cost[row]
+        output_messages = self.transcripts.get(self._transcript[row])
+        output_content = self._output_content[row]
+        if output_content is _FROM_TRANSCRIPT:
+            output_content = output_messages[-1]["content"]
+        values = {column: self._strings.get(self._pooled[column][row]) for column in self.POOLED_COLUMNS}
+        values.update({column: self._int(column, row) for column in self.INT_COLUMNS})
+        passed = self._passed[row]
+        return Result(
+            latency_breakdown=self._latency_breakdown(row),
+            id=self._ids[row],
+            input_messages=json.loads(self._inputs.get(self._input[row])),
+            output_content=output_content,
+            output_messages=output_messages,
+            cost=None if math.isnan(cost) else cost,
+            error_message=self._error_message[row],
+            scores=self._scores[row] or [],
+            passed=None if passed == _NONE_INT else bool(passed),
+            created_at=datetime.fromtimestamp(self._created_at[row]),
+            **values,
+        )
+
+    def _latency_breakdown(self, row: int) -> Dict[str, Optional[float]]:
+        values = {key: column[row] for key, column in self._latency.items()}
+        if all(math.isnan(value) for value in values.values()):
+            # No calls were timed (e.g. the cell failed before any call)
+            return {}
+        return {key: None if math.isnan(value) else value for key, value in values.items()}
+
+    @property
+    def results(self) -> Sequence:
+        """Results materialized on access; prefer iterating over holding the whole list."""
+        return _ResultView(self)
+
+    def sort_by_id(self, positions: Dict[str, int]):
+        """Reorder rows by the position of their result id (e.g. the plan's cell order)."""
+        with self._lock:
+            order = sorted(range(len(self._ids)), key=lambda row: positions.get(self._ids[row], 0))
+            self._ids = [self._ids[row] for row in order]
+            self._output_content = [self._output_content[row] for row in order]
+            self._error_message = [self._error_message[row] for row in order]
+            self._scores = [self._scores[row] for row in order]
+            for columns in (self._pooled, self._ints, self._latency):
+                for column, values in columns.items():
+                    columns[column] = array(values.typecode, (values[row] for row in order))
+            for name in ("_cost", "_created_at", "_input", "_transcript", "_passed"):
+                values = getattr(self, name)
+                setattr(self, name, array(values.typecode, (values[row] for row in order)))
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Same summary as ResultCollector, computed from the columns."""
+        total_results = len(self._ids)
+        if not total_results:
+            return super().get_summary()
+
+        status = [self._strings.get(index) for index in self._pooled["status"]]
+        error_type = self._pooled["error_type"]
+        errors_by_type: Dict[str, int] = {}
+        for row, row_status in enumerate(status):
+            if row_status != "success":
+                name = self._strings.get(error_type[row]) or "other"
+                errors_by_type[name] = errors_by_type.get(name, 0) + 1
+        failed = sum(errors_by_type.values())
+
+        def total(column):
+            return sum(value for value in self._ints[column] if value != _NONE_INT)
+
+        costs = [0.0 if math.isnan(cost) else cost for cost in self._cost]
+        model_ids = self._pooled["model_id"]
+        cost_by_model: Dict[str, Dict[str, Any]] = {}
+        for row in range(total_results):
+            model_cost = cost_by_model.setdefault(self._strings.get(model_ids[row]), {
+                'results': 0, 'prompt_tokens': 0, 'completion_tokens': 0,
+                'cached_tokens': 0, 'total_tokens': 0, 'total_cost': 0.0,
+            })
+            model_cost['results'] += 1
+            for column in ('prompt_tokens', 'completion_tokens', 'cached_tokens', 'total_tokens'):
+                model_cost[column] += max(self._ints[column][row], 0)
+            model_cost['total_cost'] += costs[row]
+
+        summary = {
+            'total_results': total_results,
+            'successful_results': total_results - failed,
+            'failed_results': failed,
+            'success_rate': (total_results - failed) / total_results,
+            'errors_by_type': errors_by_type,
+            'total_tokens': total('total_tokens'),
+            'total_cost': sum(costs),
+            'avg_latency': total('latency_ms') / total_results,
+            'count_models': len(set(model_ids)),
+            'count_prompts': len(set(self._pooled["prompt_id"])),
+            'cost_by_model': cost_by_model,
+        }
+        scores = summarize_scores(
+            (self._strings.get(model_ids[row]), self._scores[row] or [], None if passed == _NONE_INT else bool(passed))
+            for row, passed in enumerate(self._passed)
+        )
+        if scores:
+            summary['scores'] = scores
+            # Grading is part of what the run cost
+            summary['total_cost'] += scores['judge_cost']
+        latency = summarize_latency(
+            (self._strings.get(model_ids[row]), self._latency_breakdown(row)) for row in range(total_results)
+        )
+        if latency:
+            summary['latency_breakdown'] = latency
+        summary.update(self.metadata)
+        return summary
+
+    def export_to_json(self, filepath: str):
+        """Export all results to a JSON file, one result per line, without building them all at once."""
+        with open(filepath, 'w') as f:
+            f.write('{"summary": ')
+            json.dump(self.get_summary(), f, indent=2)
+            f.write(',\n"results": [')
+            for row in range(len(self._ids)):
+                f.write("\n" if row == 0 else ",\n")
+                f.write(json.dumps(self._row(row).to_dict(), default=str))
+            f.write("\n]}\n")
+
+    def close(self):
+        self.transcripts.close()
+
+
+class _ResultView(Sequence):
+    """Read-only sequence of a store's results."""
+
+    def __init__(self, store: CompactResultStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store._row(row) for row in range(len(self._store))[index]]
+        if index < 0:
+            index += len(self._store)
+        if not 0 <= index < len(self._store):
+            raise IndexError("result index out of range")
+        return self._store._row(index)
+
+    def __iter__(self) -> Iterator[Result]:
+        for row in range(len(self._store)):
+            yield self._store._row(row)
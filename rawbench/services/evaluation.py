@@ -1,26 +1,277 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
+import glob
 import json
+import time
 from datetime import datetime
 
 from ..config import load_config, validate_config 
-from ..core import Evaluation
-from ..results import ResultCollector
+from ..core import Evaluation, ExecutionPlan, ProgressTracker
+from ..core.concurrency import ConcurrencyLimiterRegistry
+from ..core.cost import Budget, PricingTable
+from ..core.estimate import estimate_plan, load_completion_history
+from ..core.http_clients import HttpClientRegistry
+from ..core.load import LoadProfile, LoadRunner
+from ..core.retry import CircuitBreakerRegistry, RetryPolicy
+from ..core.stream import ResultStream
+from ..core.suite import Suite
+from ..core.variables import load_variables, variable_module_paths
+from ..core.watch import FileWatcher
+from ..results import ResultArchive, ResultCollector, load_result_file, write_archive
+from ..results.archive import ARCHIVE_SUFFIX, is_archive
+from ..utils.instrumentation import get_tracer
 
 class EvaluationService:
     """Handles core benchmarking operations"""
     
     def run_evaluation(self, 
                      config_path: str, 
-                     output_path: Optional[str] = None) -> Dict[str, Any]:
-        config = load_config(config_path)
-        if validate_config(config) is not True:
-            raise ValueError("Invalid configuration file")
-        evaluator = Evaluation(config)
-        collector = evaluator.run()
-        
-        self._save_results(collector, output_path)
+                     output_path: Optional[str] = None,
+                     progress: Optional[ProgressTracker] = None,
+                     budget: Optional[Budget] = None,
+                     pricing_path: Optional[str] = None,
+                     output_format: str = "json") -> Dict[str, Any]:
+        with get_tracer().span("rawbench.run", config=config_path):
+            config = self._load_config(config_path)
+            pricing = PricingTable.load(pricing_path, config.get("pricing"))
+            with Evaluation(config, pricing=pricing) as evaluator:
+                collector = evaluator.run(progress=progress, budget=budget)
+            
+            json_path = self._save_results(collector, output_path, output_format)
+        if progress:
+            progress.finish(collector.get_summary(), result_file=Path(json_path).name)
     
+    def run_suite(self,
+                  pattern: str,
+                  output_dir: Optional[str] = None,
+                  progress: Optional[ProgressTracker] = None,
+                  budget: Optional[Budget] = None,
+                  pricing_path: Optional[str] = None,
+                  output_format: str = "json") -> Dict[str, Any]:
+        """
+        Run every evaluation of a directory or glob in one process, sharing the scheduler,
+        connection pools, concurrency limiters and circuit breakers. Writes one result file
+        per evaluation plus a suite summary and returns the summary.
+        """
+        config_paths = self.suite_config_paths(pattern)
+        if not config_paths:
+            raise ValueError(f"No evaluation configs match {pattern}")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = Path(output_dir or "results")
+
+        with get_tracer().span("rawbench.suite", pattern=pattern, evaluations=len(config_paths)):
+            configs = [self._load_config(str(path)) for path in config_paths]
+            pricing_tables = [PricingTable.load(pricing_path, config.get("pricing")) for config in configs]
+            with Suite(configs, pricing_tables) as suite:
+                collectors = suite.run(progress=progress, budget=budget)
+                result_files = [
+                    self._save_results(collector, str(output / f"{name}_{timestamp}"), output_format)
+                    for collector, name in zip(collectors, self._suite_names(config_paths))
+                ]
+                data = suite.summary([Path(path).name for path in result_files], [str(path) for path in config_paths])
+
+        summary_path = output / f"suite_{timestamp}.json"
+        print(f"Saving suite summary to {summary_path}")
+        with open(summary_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        if progress:
+            progress.finish(data["summary"], result_file=summary_path.name)
+        return data
+
+    def stream(self,
+               config_or_path: Union[str, Path, Dict[str, Any], List[Any]],
+               budget: Optional[Budget] = None,
+               pricing_path: Optional[str] = None,
+               select: Optional[Any] = None) -> ResultStream:
+        """
+        Start an evaluation in the background and return a ResultStream of its Results.
+
+        config_or_path is a config dict, a config file, or a directory, glob or list of
+        configs run together as a suite. select limits the run to the given cell ids.
+        Nothing is printed and no result file is written; ResultStream.wait() returns
+        the result collectors.
+        """
+        if isinstance(config_or_path, (str, Path)):
+            path = str(config_or_path)
+            suite = Path(path).is_dir() or glob.has_magic(path)
+            sources = self.suite_config_paths(path) if suite else [path]
+            if not sources:
+                raise ValueError(f"No evaluation configs match {path}")
+        elif isinstance(config_or_path, dict):
+            suite, sources = False, [config_or_path]
+        else:
+            suite, sources = True, list(config_or_path)
+        configs = [
+            self._load_config(str(source)) if isinstance(source, (str, Path)) else source
+            for source in sources
+        ]
+        pricing_tables = [PricingTable.load(pricing_path, config.get("pricing")) for config in configs]
+        selected = set(select) if select is not None else None
+
+        def run(progress, cancel):
+            with get_tracer().span("rawbench.stream", evaluations=len(configs)):
+                if suite:
+                    with Suite(configs, pricing_tables) as evaluations:
+                        return evaluations.run(progress=progress, budget=budget, cancel=cancel,
+                                               select=selected, quiet=True)
+                with Evaluation(configs[0], pricing=pricing_tables[0]) as evaluator:
+                    return [evaluator.run(progress=progress, budget=budget, cancel=cancel,
+                                          select=selected, quiet=True)]
+
+        return ResultStream(run)
+
+    @staticmethod
+    def suite_config_paths(pattern: str) -> List[Path]:
+        """Evaluation configs of a directory (recursively) or a glob, sorted."""
+        path = Path(pattern)
+        if path.is_dir():
+            return sorted({*path.glob("**/*.yaml"), *path.glob("**/*.yml")})
+        anchor = Path(path.anchor) if path.is_absolute() else Path(".")
+        relative = str(path.relative_to(anchor)) if path.is_absolute() else pattern
+        return sorted(match for match in anchor.glob(relative) if match.is_file())
+
+    @staticmethod
+    def _suite_names(config_paths: List[Path]) -> List[str]:
+        """Result file names of a suite's configs: the file stem, or the path when stems collide."""
+        stems = [path.stem for path in config_paths]
+        return [
+            stem if stems.count(stem) == 1 else "_".join(path.with_suffix("").parts).lstrip("_/")
+            for stem, path in zip(stems, config_paths)
+        ]
+
+    def watch_evaluation(self,
+                         config_path: str,
+                         output_path: str,
+                         progress: Optional[ProgressTracker] = None,
+                         pricing_path: Optional[str] = None,
+                         output_format: str = "json",
+                         watch_paths: Optional[List[str]] = None,
+                         max_cost: Optional[float] = None,
+                         max_tokens: Optional[int] = None):
+        """
+        Run an evaluation, then re-run it whenever the config, its variable modules or
+        watch_paths change, until interrupted.
+
+        The process stays warm: pooled connections, learned concurrency limits and the
+        results of unchanged cells carry over, so only the affected cells are called again.
+        Budgets apply to each run separately.
+        """
+        cache: Dict[str, Any] = {}
+        limiters = None
+        http_clients = None
+        scorer = None
+        watcher = FileWatcher()
+        config = None
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    config = self._load_config(config_path)
+                    # Taken before the run so edits made while it is running are picked up
+                    watcher.set_paths(self._watched_paths(config_path, config, watch_paths))
+                    if http_clients is None:
+                        execution = config.get("execution", {})
+                        limiters = ConcurrencyLimiterRegistry.from_config(execution)
+                        http_clients = HttpClientRegistry.from_config(execution)
+                    pricing = PricingTable.load(pricing_path, config.get("pricing"))
+                    evaluator = Evaluation(config, pricing=pricing, limiters=limiters, http_clients=http_clients,
+                                           scorer=scorer)
+                    # The judge cache carries over, so unchanged outputs are not judged again
+                    scorer = scorer or evaluator.scorer
+                    budget = Budget(max_cost, max_tokens) if max_cost or max_tokens else None
+                    collector = evaluator.run(progress=progress, budget=budget, cache=cache)
+                    result_path = self._save_results(collector, output_path, output_format)
+                    summary = collector.get_summary()
+                    if progress:
+                        progress.finish(summary, result_file=Path(result_path).name)
+                    print(f"🔁 {summary['total_results']} results, {summary.get('reused_results', 0)} reused, "
+                          f"in {time.perf_counter() - started:.1f}s")
+                except Exception as e:
+                    print(f"❌ Error running evaluation: {e}")
+                    if not watcher.paths:
+                        watcher.set_paths(self._watched_paths(config_path, config, watch_paths))
+
+                print(f"👀 Watching {len(watcher.paths)} paths for changes (Ctrl-C to stop)")
+                changed = watcher.wait()
+                print(f"\n🔄 Changed: {', '.join(changed)}")
+        finally:
+            if http_clients:
+                http_clients.close()
+            if scorer:
+                scorer.close()
+
+    def _watched_paths(self, config_path: str, config: Optional[Dict[str, Any]],
+                       watch_paths: Optional[List[str]]) -> List[str]:
+        paths = [config_path, *(watch_paths or [])]
+        if config:
+            paths.extend(variable_module_paths(config.get("variables", {})))
+        return paths
+
+    def build_evaluation(self, config_path: str, pricing_path: Optional[str] = None) -> Evaluation:
+        """Compile an evaluation from its config file, ready to run (possibly several times)."""
+        config = self._load_config(config_path)
+        return Evaluation(config, pricing=PricingTable.load(pricing_path, config.get("pricing")))
+
+    def plan_evaluation(self, config_path: str) -> ExecutionPlan:
+        """Compile the execution plan of an evaluation without calling any model."""
+        config = self._load_config(config_path)
+        execution = config.get("execution", {})
+        return ExecutionPlan.compile(
+            config,
+            load_variables(config.get("variables", {})),
+            RetryPolicy.from_config(execution),
+            CircuitBreakerRegistry.from_config(execution),
+        )
+
+    def estimate_evaluation(self,
+                            config_path: str,
+                            pricing_path: Optional[str] = None,
+                            history_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Project the tokens and cost of an evaluation with local tokenizers."""
+        config = self._load_config(config_path)
+        plan = ExecutionPlan.compile(config, load_variables(config.get("variables", {})))
+        pricing = PricingTable.load(pricing_path, config.get("pricing"))
+        history = load_completion_history(history_paths) if history_paths else None
+        return estimate_plan(plan, pricing, history)
+
+    def run_load_test(self,
+                      config_path: str,
+                      output_path: str,
+                      model_ids: Optional[List[str]] = None,
+                      **profile_overrides: Any) -> Dict[str, Any]:
+        """Replay the tests of an evaluation at fixed arrival rates and save the saturation curve."""
+        config = self._load_config(config_path)
+        profile = LoadProfile.from_config(config.get("load", {}), **profile_overrides)
+        http_clients = HttpClientRegistry.from_config(config.get("execution", {}))
+        try:
+            plan = ExecutionPlan.compile(config, load_variables(config.get("variables", {})),
+                                         http_clients=http_clients)
+            data = LoadRunner(plan, profile).run(model_ids)
+        finally:
+            http_clients.close()
+
+        output_file = Path(output_path).with_suffix(".json")
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        print(f"Saving load test results to {output_file}")
+        with open(output_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        return data
+
+    def export_results(self, input_path: str, output_path: Optional[str] = None) -> str:
+        """Convert a result archive to JSON, or a result JSON file to an archive."""
+        source = Path(input_path)
+        if is_archive(source):
+            target = Path(output_path) if output_path else source.with_suffix(".json")
+            with ResultArchive(str(source)) as archive:
+                archive.export_to_json(str(target))
+        else:
+            target = Path(output_path) if output_path else source.with_suffix(ARCHIVE_SUFFIX)
+            data = load_result_file(source)
+            # Suite and load test files carry more than a summary and results
+            extra = {key: value for key, value in data.items() if key not in ("summary", "results")}
+            write_archive(str(target), data.get("summary", {}), data.get("results", []), extra=extra)
+        return str(target)
+
     def list(self, dir) -> List[Dict[str, Any]]:
         tests_dir = Path(dir)
         if not tests_dir.exists():
@@ -37,11 +288,38 @@ class EvaluationService:
             })
         return evaluations
     
-    def _save_results(self, collector: ResultCollector, output_path: str):
-        print(f"Saving results to {output_path}")
+    def _load_config(self, config_path: str) -> Dict[str, Any]:
+        with get_tracer().span("config.load", path=config_path):
+            config = load_config(config_path)
+            if validate_config(config) is not True:
+                raise ValueError("Invalid configuration file")
+        return config
+
+    def _save_results(self, collector: ResultCollector, output_path: str, output_format: str = "json") -> str:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
-        json_path = str(output_file.with_suffix(".json"))
+        suffix = ARCHIVE_SUFFIX if output_format == "archive" else ".json"
+        json_path = str(output_file.with_suffix(suffix))
         print(f"Saving results to {json_path}")
-        collector.export_to_json(str(json_path))
\ No newline at end of file
+        with get_tracer().span("results.export", path=json_path):
+            if output_format == "archive":
+                collector.export_to_archive(json_path)
+            else:
+                collector.export_to_json(str(json_path))
+        return json_path
+
+
+def run(config_or_path: Union[str, Path, Dict[str, Any], List[Any]],
+        budget: Optional[Budget] = None,
+        pricing_path: Optional[str] = None,
+        select: Optional[Any] = None) -> ResultStream:
+    """
+    Run an evaluation (or suite) from Python, yielding each Result as it completes.
+
+        for result in rawbench.run("evals/support.yaml"):
+            print(result.id, result.passed)
+
+    See EvaluationService.stream for the arguments.
+    """
+    return EvaluationService().stream(config_or_path, budget=budget, pricing_path=pricing_path, select=select)
@@ -0,0 +1,176 @@
+"""
+A local fake OpenAI-compatible LLM server for trying out load tests.
+
+It serves /v1/chat/completions (streamed or not) with a simulated time to first
+token, decode speed and a fixed number of concurrent slots, so a load test against
+it shows a clear saturation point:
+
+    python -m rawbench.services.fake_llm --port 8555 --capacity 4
+
+Then point a model at it with provider openai and OPENAI_API_BASE=http://localhost:8555/v1.
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+import click
+
+
+class FakeLLMServer:
+    """
+    Simulated inference endpoint.
+
+    Args:
+        port: Port to listen on
+        capacity: Requests processed at once; the rest wait for a free slot
+        ttft_ms: Time to first token of a request once it holds a slot
+        tokens_per_sec: Decode speed of each request
+        output_tokens: Completion tokens generated per request
+        error_rate: Share of requests answered with a 500
+    """
+
+    def __init__(self, port: int = 8555, capacity: int = 4, ttft_ms: float = 100.0,
+                 tokens_per_sec: float = 100.0, output_tokens: int = 20, error_rate: float = 0.0):
+        self.port = port
+        self.ttft_ms = ttft_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self._slots = threading.BoundedSemaphore(capacity)
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> threading.Thread:
+        """Serve in a daemon thread."""
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", self.port), self._handler())
+        self._httpd.daemon_threads = True
+        thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def serve_forever(self):
+        self.start().join()
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json({"object": "list", "data": [{"id": "fake", "object": "model"}]})
+                else:
+                    self._send_json({"error": {"message": "Not found"}}, status=404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json({"error": {"message": "Not found"}}, status=404)
+                    return
+                with server._slots:
+                    started = time.perf_counter()
+                    if random.random() < server.error_rate:
+                        self._send_json({"error": {"message": "Simulated overload", "type": "server_error"}},
+                                        status=500)
+                        return
+                    time.sleep(server.ttft_ms / 1000)
+                    if body.get("stream"):
+                        self._stream(body, started)
+                    else:
+                        time.sleep(server.output_tokens / server.tokens_per_sec)
+                        self._send_json(server._completion(body), processing_ms=started)
+
+            def _stream(self, body: Dict[str, Any], started: float):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.send_header("openai-processing-ms", str(int((time.perf_counter() - started) * 1000)))
+                self.end_headers()
+                for chunk in server._chunks(body):
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def _send_json(self, data: Dict[str, Any], status: int = 200, processing_ms: Optional[float] = None):
+                payload = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if processing_ms is not None:
+                    self.send_header("openai-processing-ms", str(int((time.perf_counter() - processing_ms) * 1000)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def _usage(self, body: Dict[str, Any]) -> Dict[str, int]:
+        # Rough prompt size: about four characters per token
+        prompt_tokens = sum(len(str(message.get("content") or "")) for message in body.get("messages", [])) // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": self.output_tokens,
+            "total_tokens": prompt_tokens + self.output_tokens,
+        }
+
+    def _completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": " ".join(["token"] * self.output_tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": self._usage(body),
+        }
+
+    def _chunks(self, body: Dict[str, Any]):
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+        }
+        for index in range(self.output_tokens):
+            if index:
+                time.sleep(1.0 / self.tokens_per_sec)
+            delta = {"content": "token "}
+            if index == 0:
+                delta["role"] = "assistant"
+            yield dict(base, choices=[{"index": 0, "delta": delta, "finish_reason": None}])
+        yield dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if (body.get("stream_options") or {}).get("include_usage"):
+            yield dict(base, choices=[], usage=self._usage(body))
+
+
+@click.command()
+@click.option('--port', default=8555, help='Port to listen on (default: 8555)')
+@click.option('--capacity', default=4, help='Requests processed concurrently (default: 4)')
+@click.option('--ttft-ms', default=100.0, help='Time to first token in milliseconds (default: 100)')
+@click.option('--tokens-per-sec', default=100.0, help='Decode speed per request (default: 100)')
+@click.option('--output-tokens', default=20, help='Completion tokens per request (default: 20)')
+@click.option('--error-rate', default=0.0, type=click.FloatRange(0.0, 1.0), help='Share of requests failing with a 500')
+def main(port: int, capacity: int, ttft_ms: float, tokens_per_sec: float, output_tokens: int, error_rate: float):
+    """Run a fake OpenAI-compatible LLM server"""
+    click.echo(f"🤖 Fake LLM server on http://localhost:{port}/v1 ({capacity} slots)")
+    FakeLLMServer(port, capacity, ttft_ms, tokens_per_sec, output_tokens, error_rate).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,70 @@
+import gzip
+import hashlib
+import hmac
 import json
 import os
+import queue
 import webbrowser
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from flask import Flask, jsonify, send_from_directory, request
+from typing import Dict, Any, List, Optional, Tuple
+from flask import Flask, Response, jsonify, send_from_directory, request
 from flask_cors import CORS
 
+from ..core.progress import ProgressTracker
+from ..results.archive import ARCHIVE_SUFFIX, ResultArchive, is_archive
+from ..results.search import FILTERS as SEARCH_FILTERS, SearchIndex
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# Hashed Vite bundles never change under the same name, so they can be cached forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/css", "application/javascript"}
+MIN_COMPRESS_SIZE = 1024
+COMPRESSED_CACHE_SIZE = 64
+ROWS_CACHE_SIZE = 8
+# JSON result files kept parsed for single-result requests (cards opened one after another)
+RESULT_FILE_CACHE_SIZE = 2
+# Heavy per-result fields left out of /rows; fetched one result at a time when opened
+TRANSCRIPT_FIELDS = ("input_messages", "output_messages")
+# Comment line sent on idle SSE streams so proxies don't drop the connection
+SSE_HEARTBEAT_SECONDS = 15
+# SSE streams end once a run is over, or after these limits, so they don't hold a worker thread
+# forever; browsers reconnect after SSE_RETRY_MS and resume with a fresh snapshot
+SSE_IDLE_TIMEOUT_SECONDS = 300
+SSE_MAX_LIFETIME_SECONDS = 3600
+SSE_RETRY_MS = 5000
+SSE_FINAL_EVENTS = ("completed", "error")
+# Without a push token, progress events are only accepted from this machine
+LOOPBACK_ADDRESSES = ("127.0.0.1", "::1")
+
+
 class WebServer:
     def __init__(self):
         self.app = Flask(__name__)
+        # Live progress of an evaluation running in this process (rawbench run --serve)
+        self.progress = ProgressTracker()
+        # Shared secret required from runs pushing progress (rawbench run --push-to --push-token)
+        self.push_token = os.environ.get("RAWBENCH_PUSH_TOKEN")
+        self._cache_lock = threading.Lock()
+        # (etag, encoding) -> compressed body, so repeated requests skip recompression
+        self._compressed_cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        # result path -> ((mtime_ns, size), listing entry)
+        self._summary_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        # result path -> ((mtime_ns, size), encoded /rows payload), most recently used last
+        self._rows_cache: "OrderedDict[str, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+        # JSON result path -> ((mtime_ns, size), each result encoded as JSON, result id -> position)
+        self._result_file_cache: "OrderedDict[str, Tuple[Tuple[int, int], List[bytes], Dict[str, int]]]" = OrderedDict()
+        # archive path -> ((mtime_ns, size), open archive)
+        self._archives: Dict[str, Tuple[Tuple[int, int], ResultArchive]] = {}
+        self._archives_lock = threading.Lock()
+        # Full-text index of results/, brought up to date by searches
+        self.search_index = SearchIndex("results")
         
         # Enable CORS for development (when frontend runs on different port)
         CORS(self.app)
@@ -26,8 +80,22 @@ class WebServer:
         
         # Don't set static_folder - we'll handle static files manually
         self.app.static_folder = None
+
+        # Index the build once instead of stat-ing the filesystem on every request
+        self._static_files = self._index_static_files()
         
         self.setup_routes()
+        self.app.after_request(self._compress_response)
+
+    def _index_static_files(self) -> set:
+        """Collect the relative paths of all files in the frontend build"""
+        if not self.frontend_build_path.exists():
+            return set()
+        return {
+            path.relative_to(self.frontend_build_path).as_posix()
+            for path in self.frontend_build_path.rglob("*")
+            if path.is_file()
+        }
         
     def setup_routes(self):
         # API Routes
@@ -37,42 +105,192 @@ class WebServer:
             results_dir = Path("results")
             if not results_dir.exists():
                 return jsonify({"results": []})
+
+            json_files = sorted([*results_dir.glob("*.json"), *results_dir.glob(f"*{ARCHIVE_SUFFIX}")])
+            stats = {json_file: json_file.stat() for json_file in json_files}
+            etag = self._etag_for(
+                (json_file.name, stat.st_mtime_ns, stat.st_size)
+                for json_file, stat in stats.items()
+            )
+            last_modified = max((stat.st_mtime for stat in stats.values()), default=None)
                 
             results = []
-            for json_file in results_dir.glob("*.json"):
+            for json_file, stat in stats.items():
                 try:
-                    with open(json_file, 'r') as f:
-                        data = json.load(f)
-                        results.append({
-                            "filename": json_file.name,
-                            "path": str(json_file),
-                            "summary": data.get("summary", {}),
-                            "created_at": self._extract_creation_time(data),
-                            "file_size": json_file.stat().st_size
-                        })
+                    results.append(self._summarize_result_file(json_file, stat))
                 except Exception as e:
                     print(f"Error reading {json_file}: {e}")
                     
             # Sort by creation time (newest first)
             results.sort(key=lambda x: x["created_at"], reverse=True)
-            return jsonify({"results": results})
+            return self._conditional(jsonify({"results": results}), etag, last_modified)
             
         @self.app.route('/api/results/<filename>')
         def get_specific_result(filename):
             """Get specific evaluation result by filename"""
-            results_dir = Path("results")
-            json_file = results_dir / filename
-            
-            if not json_file.exists():
+            json_file = self._result_path(filename)
+            if json_file is None:
                 return jsonify({"error": "Result file not found"}), 404
                 
             try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                return jsonify(data)
+                stat = json_file.stat()
+                etag = self._etag_for([(json_file.name, stat.st_mtime_ns, stat.st_size)])
+                if request.if_none_match.contains_weak(etag):
+                    response = Response(mimetype="application/json")
+                elif is_archive(json_file):
+                    response = Response(self._archive_json(self._archive(json_file, stat)),
+                                        mimetype="application/json")
+                else:
+                    # Result files are already JSON, so they are sent as-is without re-encoding
+                    response = Response(json_file.read_bytes(), mimetype="application/json")
+                return self._conditional(response, etag, stat.st_mtime)
+            except Exception as e:
+                return jsonify({"error": f"Error reading file: {str(e)}"}), 500
+
+        @self.app.route('/api/results/<filename>/rows')
+        def get_result_rows(filename):
+            """A result file without transcripts; each row has its position as 'index' for /results/<index>"""
+            json_file = self._result_path(filename)
+            if json_file is None:
+                return jsonify({"error": "Result file not found"}), 404
+            try:
+                stat = json_file.stat()
+                etag = self._etag_for([(json_file.name, stat.st_mtime_ns, stat.st_size, "rows")])
+                if request.if_none_match.contains_weak(etag):
+                    response = Response(mimetype="application/json")
+                else:
+                    response = Response(self._rows_json(json_file, stat), mimetype="application/json")
+                return self._conditional(response, etag, stat.st_mtime)
             except Exception as e:
                 return jsonify({"error": f"Error reading file: {str(e)}"}), 500
+
+        @self.app.route('/api/results/<filename>/results')
+        def get_result_page(filename):
+            """A page of results (offset, limit) or a single result by id
+
+            Archives are read block by block; JSON files are parsed once and kept while unchanged.
+            """
+            json_file = self._result_path(filename)
+            if json_file is None:
+                return jsonify({"error": "Result file not found"}), 404
+            offset = request.args.get("offset", 0, type=int)
+            limit = request.args.get("limit", 100, type=int)
+            result_id = request.args.get("id")
+            if is_archive(json_file):
+                archive = self._archive(json_file, json_file.stat())
+                if result_id is not None:
+                    result = archive.find(result_id)
+                    return jsonify(result) if result else (jsonify({"error": "Result not found"}), 404)
+                results = [archive.get(index) for index in range(offset, min(offset + limit, len(archive)))]
+                return jsonify({"total": len(archive), "offset": offset, "results": results})
+
+            stat = json_file.stat()
+            encoded = self._encoded_results(json_file, stat)
+            if result_id is not None:
+                position = self._result_positions(json_file, stat).get(result_id)
+                if position is None:
+                    return jsonify({"error": "Result not found"}), 404
+                return Response(encoded[position], mimetype="application/json")
+            page = b",".join(encoded[max(offset, 0):max(offset, 0) + max(limit, 0)])
+            body = b'{"total": %d, "offset": %d, "results": [%s]}' % (len(encoded), offset, page)
+            return Response(body, mimetype="application/json")
+
+        @self.app.route('/api/results/<filename>/results/<int:index>')
+        def get_result_at(filename, index):
+            """A single result by position"""
+            json_file = self._result_path(filename)
+            if json_file is None:
+                return jsonify({"error": "Result file not found"}), 404
+            try:
+                stat = json_file.stat()
+                if is_archive(json_file):
+                    return jsonify(self._archive(json_file, stat).get(index))
+                return Response(self._encoded_results(json_file, stat)[index], mimetype="application/json")
+            except IndexError:
+                return jsonify({"error": "Result not found"}), 404
+
+        @self.app.route('/api/search')
+        def search_results():
+            """Full-text search over every result file (q, plus model/prompt/test/evaluation/status/file/since/until)"""
+            query = request.args.get("q", "").strip()
+            if not query:
+                return jsonify({"error": "Missing search query 'q'"}), 400
+            filters = {name: request.args.get(name) for name in SEARCH_FILTERS if request.args.get(name)}
+            try:
+                return jsonify(self.search_index.search(
+                    query,
+                    limit=min(request.args.get("limit", 50, type=int), 500),
+                    offset=request.args.get("offset", 0, type=int),
+                    **filters,
+                ))
+            except Exception as e:
+                return jsonify({"error": f"Search failed: {str(e)}"}), 500
         
+        @self.app.route('/api/progress')
+        def get_progress():
+            """Current statistics of the in-flight evaluation"""
+            return jsonify(self.progress.snapshot())
+
+        @self.app.route('/api/progress/events', methods=['POST'])
+        def relay_progress():
+            """Progress events pushed by a run in another process (rawbench run --push-to)"""
+            if not self._push_allowed():
+                return jsonify({"error": "Pushing progress requires the server's push token"}), 403
+            event = request.get_json(silent=True)
+            if not isinstance(event, dict) or "type" not in event:
+                return jsonify({"error": "Expected a progress event"}), 400
+            self.progress.relay(event)
+            return jsonify({"status": "ok"})
+
+        @self.app.route('/api/progress/stream')
+        def stream_progress():
+            """Server-sent events with per-cell completions of the in-flight evaluation"""
+            last_event_id = request.headers.get("Last-Event-ID")
+            missed = self.progress.last_completed
+            subscriber = self.progress.subscribe()
+
+            def format_event(event):
+                # The id is the last completion the client knows of; browsers send it back on
+                # reconnect, so a completion that happened in between can be replayed
+                if event["type"] == "completed":
+                    event_id = f"id: {event['ts']}\n"
+                elif event["type"] == "snapshot":
+                    event_id = f"id: {missed['ts'] if missed else 0}\n"
+                else:
+                    event_id = ""
+                return f"{event_id}event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+            def events():
+                started = last_event = time.monotonic()
+                try:
+                    yield f"retry: {SSE_RETRY_MS}\n\n"
+                    if last_event_id is not None and missed and last_event_id != str(missed["ts"]):
+                        # A run completed while this client was reconnecting
+                        yield format_event(missed)
+                        return
+                    while time.monotonic() - started < SSE_MAX_LIFETIME_SECONDS:
+                        try:
+                            event = subscriber.get(timeout=SSE_HEARTBEAT_SECONDS)
+                        except queue.Empty:
+                            if time.monotonic() - last_event > SSE_IDLE_TIMEOUT_SECONDS:
+                                return
+                            yield ": heartbeat\n\n"
+                            continue
+                        last_event = time.monotonic()
+                        yield format_event(event)
+                        if event["type"] in SSE_FINAL_EVENTS:
+                            return
+                        if event["type"] == "snapshot" and event["stats"].get("finished"):
+                            # Nothing in flight; the client reconnects to catch the next run
+                            return
+                finally:
+                    self.progress.unsubscribe(subscriber)
+
+            response = Response(events(), mimetype="text/event-stream")
+            response.headers["Cache-Control"] = "no-cache"
+            response.headers["X-Accel-Buffering"] = "no"
+            return response
+
         @self.app.route('/api/health')
         def health_check():
             """Health check endpoint"""
@@ -84,7 +302,9 @@ class WebServer:
             """Serve static assets from Vite build"""
             assets_dir = str(self.frontend_build_path / 'assets')
             try:
-                return send_from_directory(assets_dir, filename)
+                response = send_from_directory(assets_dir, filename, max_age=31536000)
+                response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+                return response
             except Exception as e:
                 print(f"Error serving asset {filename} from {assets_dir}: {e}")
                 return f"Asset not found: {filename}", 404
@@ -114,11 +334,194 @@ class WebServer:
         def serve_react(path=''):
             """Serve React app - handles client-side routing"""
             # Check if the path exists as a static file in the build directory
-            if path and os.path.exists(os.path.join(self.frontend_build_path, path)):
+            if path and path in self._static_files:
                 return send_from_directory(self.frontend_build_path, path)
             
             # For client-side routing, always serve index.html
-            return send_from_directory(self.frontend_build_path, 'index.html')
+            # index.html references the hashed assets, so it must be revalidated
+            response = send_from_directory(self.frontend_build_path, 'index.html')
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+
+    def _result_path(self, filename: str) -> Optional[Path]:
+        """The result file behind a filename; <name>.json also finds <name>.rbz"""
+        results_dir = Path("results")
+        json_file = results_dir / Path(filename).name
+        if json_file.exists():
+            return json_file
+        archive_file = json_file.with_suffix(ARCHIVE_SUFFIX)
+        if json_file.suffix == ".json" and archive_file.exists():
+            return archive_file
+        return None
+
+    def _archive(self, archive_file: Path, stat: os.stat_result) -> ResultArchive:
+        """An open archive, reopened when the file changes"""
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._archives_lock:
+            cached = self._archives.get(str(archive_file))
+            if cached and cached[0] == key:
+                return cached[1]
+            if cached:
+                cached[1].close()
+            archive = ResultArchive(str(archive_file))
+            self._archives[str(archive_file)] = (key, archive)
+            return archive
+
+    def _archive_json(self, archive: ResultArchive):
+        """Stream an archive in the result JSON layout"""
+        yield "{" + "".join(f"{json.dumps(key)}: {json.dumps(value)}, " for key, value in archive.extra.items())
+        yield '"summary": ' + json.dumps(archive.summary) + ', "results": ['
+        for position, result in enumerate(archive):
+            yield ("" if position == 0 else ",") + json.dumps(result)
+        yield "]}"
+
+    def _rows_json(self, json_file: Path, stat: os.stat_result) -> bytes:
+        """The /rows payload of a result file, reused while the file is unchanged"""
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            cached = self._rows_cache.get(str(json_file))
+            if cached and cached[0] == key:
+                self._rows_cache.move_to_end(str(json_file))
+                return cached[1]
+
+        if is_archive(json_file):
+            results = self._archive(json_file, stat)
+            data = {"summary": results.summary}
+        else:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+            results = data.get("results") or []
+        rows = []
+        for position, result in enumerate(results):
+            row = {field: value for field, value in result.items() if field not in TRANSCRIPT_FIELDS}
+            row["index"] = position
+            rows.append(row)
+        # Load tests and suite summaries keep their other top-level entries
+        payload = json.dumps({**data, "results": rows}).encode("utf-8")
+
+        with self._cache_lock:
+            self._rows_cache[str(json_file)] = (key, payload)
+            while len(self._rows_cache) > ROWS_CACHE_SIZE:
+                self._rows_cache.popitem(last=False)
+        return payload
+
+    def _push_allowed(self) -> bool:
+        """Whether the current request may push progress events"""
+        if self.push_token:
+            supplied = request.headers.get("Authorization", "")
+            return hmac.compare_digest(supplied.encode(), f"Bearer {self.push_token}".encode())
+        return request.remote_addr in LOOPBACK_ADDRESSES
+
+    def _encoded_results(self, json_file: Path, stat: os.stat_result) -> List[bytes]:
+        """The results of a JSON result file, each encoded on its own, parsed once while the file is unchanged"""
+        return self._parsed_result_file(json_file, stat)[0]
+
+    def _result_positions(self, json_file: Path, stat: os.stat_result) -> Dict[str, int]:
+        """Result id -> position in a JSON result file"""
+        return self._parsed_result_file(json_file, stat)[1]
+
+    def _parsed_result_file(self, json_file: Path, stat: os.stat_result) -> Tuple[List[bytes], Dict[str, int]]:
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            cached = self._result_file_cache.get(str(json_file))
+            if cached and cached[0] == key:
+                self._result_file_cache.move_to_end(str(json_file))
+                return cached[1], cached[2]
+        with open(json_file, 'r') as f:
+            results = json.load(f).get("results", [])
+        encoded = [json.dumps(result).encode("utf-8") for result in results]
+        positions = {result.get("id"): index for index, result in reversed(list(enumerate(results)))}
+        with self._cache_lock:
+            self._result_file_cache[str(json_file)] = (key, encoded, positions)
+            while len(self._result_file_cache) > RESULT_FILE_CACHE_SIZE:
+                self._result_file_cache.popitem(last=False)
+        return encoded, positions
+
+    def _summarize_result_file(self, json_file: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """Build the listing entry for a result file, reusing it while the file is unchanged"""
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._summary_cache.get(str(json_file))
+        if cached and cached[0] == key:
+            return cached[1]
+
+        if is_archive(json_file):
+            # Only the summary section and the index are decompressed
+            archive = self._archive(json_file, stat)
+            summary, created_at = archive.summary, archive.created_at or ""
+        else:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+            summary, created_at = data.get("summary", {}), self._extract_creation_time(data)
+        entry = {
+            "filename": json_file.name,
+            "path": str(json_file),
+            "summary": summary,
+            "created_at": created_at,
+            "file_size": stat.st_size
+        }
+        self._summary_cache[str(json_file)] = (key, entry)
+        return entry
+
+    def _etag_for(self, parts) -> str:
+        """Derive an ETag from (name, mtime, size) tuples of the files behind a response"""
+        digest = hashlib.sha1(repr(list(parts)).encode()).hexdigest()
+        return digest[:20]
+
+    def _conditional(self, response: Response, etag: str, last_modified: Optional[float]) -> Response:
+        """Attach validators and turn the response into a 304 when the client copy is fresh"""
+        # Weak ETags stay valid across gzip/brotli encodings of the same payload
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+
+    def _negotiate_encoding(self) -> Optional[str]:
+        """Pick the best compression supported by both the client and the server"""
+        accepted = request.accept_encodings
+        if brotli is not None and accepted["br"]:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return None
+
+    def _compress_response(self, response: Response) -> Response:
+        """Compress API and HTML responses when the client accepts it"""
+        response.vary.add("Accept-Encoding")
+        if (response.direct_passthrough
+                or response.status_code != 200
+                or "Content-Encoding" in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        encoding = self._negotiate_encoding()
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return response
+
+        etag, _ = response.get_etag()
+        cache_key = (etag, encoding) if etag else None
+        with self._cache_lock:
+            compressed = self._compressed_cache.get(cache_key) if cache_key else None
+            if compressed is not None:
+                self._compressed_cache.move_to_end(cache_key)
+        if compressed is None:
+            if encoding == "br":
+                compressed = brotli.compress(data, quality=5)
+            else:
+                compressed = gzip.compress(data, compresslevel=6)
+            if cache_key:
+                with self._cache_lock:
+                    self._compressed_cache[cache_key] = compressed
+                    while len(self._compressed_cache) > COMPRESSED_CACHE_SIZE:
+                        self._compressed_cache.popitem(last=False)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
     
     def _extract_creation_time(self, data: Dict[str, Any]) -> str:
         """Extract creation time from result data"""
@@ -126,26 +529,41 @@ class WebServer:
             # Get the first result's creation time
             first_result = data["results"][0]
             return first_result.get("created_at", "")
-        return ""
+        # Suite summaries carry no results of their own
+        return data.get("summary", {}).get("created_at", "")
     
-    def serve_all_results(self, port: int = 8000):
+    def serve_all_results(self, port: int = 8000, production: bool = False, workers: int = 8):
         """Serve all results in the results directory"""
-        self._start_server(port)
+        self._start_server(port, production=production, workers=workers)
         
-    def serve_specific_result(self, result_path: str, port: int = 8000):
+    def serve_specific_result(self, result_path: str, port: int = 8000,
+                              production: bool = False, workers: int = 8):
         """Serve a specific result file"""
         # The result_path should be like "results/results_20250701_192446"
         # We need to find the actual JSON file
-        results_dir = Path("results")
-        json_file = results_dir / f"{Path(result_path).name}.json"
+        json_file = self._result_path(f"{Path(result_path).name}.json")
         
-        if not json_file.exists():
-            print(f"❌ Result file not found: {json_file}")
+        if json_file is None:
+            print(f"❌ Result file not found: results/{Path(result_path).name}.json")
             return
         server_route = f"{Path(result_path).name}"
-        self._start_server(port, specific_file=server_route)
+        self._start_server(port, specific_file=server_route, production=production, workers=workers)
+
+    def serve_live_result(self, result_path: str, port: int = 8000,
+                          production: bool = False, workers: int = 8) -> threading.Thread:
+        """Serve a result that is still being produced, streaming progress until it is saved"""
+        server_route = f"{Path(result_path).name}"
+        server_thread = threading.Thread(
+            target=self._start_server,
+            args=(port,),
+            kwargs={"specific_file": server_route, "production": production, "workers": workers},
+        )
+        server_thread.daemon = True
+        server_thread.start()
+        return server_thread
     
-    def _start_server(self, port: int = 8000, specific_file: Optional[str] = None):
+    def _start_server(self, port: int = 8000, specific_file: Optional[str] = None,
+                      production: bool = False, workers: int = 8):
         """Start the Flask server"""
         # Get port and host from environment variables if available
         env_port = os.environ.get('RAWBENCH_SERVER_PORT')
@@ -175,8 +593,24 @@ class WebServer:
         if not self.frontend_build_path.exists():
             print("⚠️  To build the frontend, run: cd frontend && make build")
         
-        # Start Flask server
-        self.app.run(host=host, port=port, debug=False)
+        if production:
+            self._run_production(host, port, workers)
+        else:
+            # Start Flask server
+            self.app.run(host=host, port=port, debug=False, threaded=True)
+
+    def _run_production(self, host: str, port: int, workers: int):
+        """Serve the app with a multi-threaded production WSGI server"""
+        try:
+            from waitress import serve
+        except ImportError:
+            print("⚠️  waitress is not installed (pip install 'raw-bench[server]'), "
+                  "falling back to the development server")
+            self.app.run(host=host, port=port, debug=False, threaded=True)
+            return
+
+        print(f"🚀 Production mode: waitress with {workers} worker threads")
+        serve(self.app, host=host, port=port, threads=workers, ident="rawbench")
 
 if __name__ == "__main__":
     server = WebServer()
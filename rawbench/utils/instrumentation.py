@@ -0,0 +1,266 @@
+"""
+Structured logging and tracing for evaluation runs.
+
+Spans follow the OpenTelemetry data model and are exported as OTLP/JSON, so a
+trace file can be loaded by any OpenTelemetry collector or viewer.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# OpenTelemetry status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        span = _current_span.get()
+        if span:
+            entry["trace_id"] = span.trace_id
+            entry["span_id"] = span.span_id
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: Union[int, str] = logging.WARNING, fmt: str = "text") -> None:
+    """
+    Configure the rawbench loggers.
+
+    Args:
+        level: Log level name or number (e.g. "debug", logging.INFO)
+        fmt: "text" for human readable lines, "json" for structured lines
+    """
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonLogFormatter() if fmt == "json" else logging.Formatter(LOG_FORMAT))
+
+    logger = logging.getLogger("rawbench")
+    logger.handlers = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+class Span:
+    """A timed operation with attributes, recorded by a Tracer."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_ns", "end_ns", "status", "status_message", "events")
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.events: List[Dict[str, Any]] = []
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = str(exc)
+        self.events.append({
+            "name": "exception",
+            "timeUnixNano": time.time_ns(),
+            "attributes": {"exception.type": type(exc).__name__, "exception.message": str(exc)},
+        })
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert the span to its OTLP/JSON representation."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status, "message": self.status_message},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.events:
+            span["events"] = [
+                {
+                    "name": event["name"],
+                    "timeUnixNano": str(event["timeUnixNano"]),
+                    "attributes": _otlp_attributes(event["attributes"]),
+                }
+                for event in self.events
+            ]
+        return span
+
+
+class _NoopSpan:
+    """Stand-in for spans that are filtered out by level or sampling."""
+
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+# Current span of the running thread/task; NOOP_SPAN marks an unsampled subtree
+_current_span: contextvars.ContextVar = contextvars.ContextVar("rawbench_span", default=None)
+
+
+class Tracer:
+    """
+    Records spans around the stages of an evaluation.
+
+    Args:
+        enabled: When False every span is a no-op, which keeps the hot path cheap
+        level: Minimum level of the spans to record (logging.INFO or logging.DEBUG)
+        sample_rate: Fraction of sampled subtrees (e.g. evaluation cells) to keep
+    """
+
+    def __init__(self, enabled: bool = False, level: int = logging.INFO, sample_rate: float = 1.0):
+        self.enabled = enabled
+        self.level = level
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._finished: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, level: int = logging.INFO, sampled: bool = False,
+             **attributes: Any) -> Iterator[Union[Span, _NoopSpan]]:
+        """
+        Time a block of code as a span.
+
+        Args:
+            name: Span name, e.g. "model.call"
+            level: Level of the span, spans below the tracer level are skipped
+            sampled: Apply the sampling rate to this span and everything below it
+            **attributes: Initial span attributes
+        """
+        parent = _current_span.get()
+        if (not self.enabled or level < self.level or parent is NOOP_SPAN
+                or (sampled and random.random() >= self.sample_rate)):
+            token = _current_span.set(NOOP_SPAN) if sampled and self.enabled else None
+            try:
+                yield NOOP_SPAN
+            finally:
+                if token is not None:
+                    _current_span.reset(token)
+            return
+
+        trace_id = parent.trace_id if parent else "%032x" % random.getrandbits(128)
+        span = Span(self, name, trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            with self._lock:
+                self._finished.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        """Finished spans, in completion order."""
+        with self._lock:
+            return list(self._finished)
+
+    def export(self, filepath: str) -> None:
+        """Write all finished spans to an OTLP/JSON trace file."""
+        data = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({
+                    "service.name": "rawbench",
+                    "process.pid": os.getpid(),
+                })},
+                "scopeSpans": [{
+                    "scope": {"name": "rawbench"},
+                    "spans": [span.to_otlp() for span in self.spans],
+                }],
+            }]
+        }
+        path = Path(filepath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert a flat dict to OTLP key/value attributes."""
+    converted = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        converted.append({"key": key, "value": typed})
+    return converted
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer (disabled unless configure_tracing was called)."""
+    return _tracer
+
+
+def configure_tracing(level: Union[int, str] = logging.INFO, sample_rate: float = 1.0) -> Tracer:
+    """
+    Enable the process-wide tracer.
+
+    Args:
+        level: "info" records run, config, variable, cell and export spans;
+               "debug" additionally records every model and tool call
+        sample_rate: Fraction of evaluation cells to trace, between 0 and 1
+    """
+    global _tracer
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    _tracer = Tracer(enabled=True, level=level, sample_rate=sample_rate)
+    return _tracer
@@ -0,0 +1,39 @@
+import os
+import socket
+
+# Use litellm's bundled price map instead of fetching it
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+import pytest
+
+from rawbench.services.fake_llm import FakeLLMServer
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def start_fake_llm(monkeypatch):
+    """Start fake OpenAI-compatible servers; returns the api_base of each, stopped after the test."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    servers = []
+
+    def start(**options):
+        options = {"capacity": 8, "ttft_ms": 5, "tokens_per_sec": 1000, "output_tokens": 5, **options}
+        server = FakeLLMServer(port=free_port(), **options)
+        server.start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.port}/v1"
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def fake_llm(start_fake_llm):
+    """api_base of a fast fake OpenAI-compatible server."""
+    return start_fake_llm()
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from rawbench.results.archive import ResultArchive, load_result_file, write_archive
+from rawbench.services.evaluation import EvaluationService
+
+MESSAGES = [{"role": "user", "content": "say hello"}]
+
+
+def result(index):
+    content = f"answer {index}"
+    return {
+        "id": f"eval::gpt::default::t{index}",
+        "prompt_id": "default",
+        "model_id": "gpt",
+        "test_id": f"t{index}",
+        "input_messages": MESSAGES,
+        "output_content": content,
+        "output_messages": [{"role": "assistant", "content": content}],
+        "total_tokens": 5,
+        "status": "success",
+        "created_at": "2026-01-01T00:00:00",
+    }
+
+
+@pytest.fixture(params=["zlib", "zstd"])
+def compression(request):
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    return request.param
+
+
+def test_round_trip_keeps_every_result(tmp_path, compression):
+    results = [result(index) for index in range(150)]
+    path = tmp_path / "results.rbz"
+
+    write_archive(str(path), {"total_results": 150}, results, compression=compression)
+
+    with ResultArchive(str(path)) as archive:
+        assert len(archive) == 150
+        assert archive.summary == {"total_results": 150}
+        assert archive.created_at == "2026-01-01T00:00:00"
+        assert list(archive) == results
+
+
+def test_random_access_reads_single_results(tmp_path):
+    results = [result(index) for index in range(200)]
+    path = tmp_path / "results.rbz"
+    write_archive(str(path), {}, results, compression="zlib")
+
+    with ResultArchive(str(path)) as archive:
+        assert archive.get(130) == results[130]
+        assert archive.get(-1) == results[-1]
+        assert archive.find("eval::gpt::default::t64") == results[64]
+        assert archive.find("missing") is None
+        with pytest.raises(IndexError):
+            archive.get(200)
+        # Only the blocks that were read are decompressed
+        assert len(archive._blocks) == 3
+
+
+def test_rejects_files_that_are_not_archives(tmp_path):
+    path = tmp_path / "results.rbz"
+    path.write_bytes(b"{}")
+
+    with pytest.raises(ValueError, match="not a rawbench result archive"):
+        ResultArchive(str(path))
+
+
+def test_export_keeps_the_other_top_level_keys(tmp_path):
+    suite = {
+        "type": "suite",
+        "summary": {"count_evaluations": 1},
+        "evaluations": [{"id": "eval", "result_file": "eval.json"}],
+        "results": [result(0)],
+    }
+    source = tmp_path / "suite.json"
+    source.write_text(json.dumps(suite))
+    service = EvaluationService()
+
+    archive_path = service.export_results(str(source))
+    assert load_result_file(archive_path) == suite
+
+    json_path = service.export_results(archive_path, str(tmp_path / "back.json"))
+    with open(json_path) as f:
+        assert json.load(f) == suite
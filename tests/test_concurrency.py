@@ -0,0 +1,88 @@
+from rawbench.core.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimiterRegistry, endpoint_key
+from rawbench.core.retry import RATE_LIMIT
+
+
+def saturated_window(limiter, latency_s=0.1, error_type=None):
+    """Run one window of requests that all wait on the limit."""
+    for _ in range(int(limiter.limit)):
+        limiter.acquire()
+    for _ in range(int(limiter.limit)):
+        limiter.release(latency_s, error_type)
+
+
+def test_limit_grows_by_one_per_saturated_window():
+    limiter = AdaptiveConcurrencyLimiter("openai", initial=2, max_limit=4)
+
+    saturated_window(limiter)
+    assert limiter.limit == 3
+    saturated_window(limiter)
+    saturated_window(limiter)
+    assert limiter.limit == 4
+    assert limiter.peak_limit == 4
+    assert limiter.increases == 2
+
+
+def test_limit_does_not_grow_when_never_reached():
+    limiter = AdaptiveConcurrencyLimiter("openai", initial=4)
+
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release(0.1)
+
+    assert limiter.limit == 4
+
+
+def test_rate_limits_halve_the_limit_once_per_window():
+    limiter = AdaptiveConcurrencyLimiter("openai", initial=8)
+    for _ in range(8):
+        limiter.acquire()
+
+    for _ in range(8):
+        limiter.release(0.1, RATE_LIMIT)
+
+    assert limiter.limit == 4
+    assert limiter.decreases == {RATE_LIMIT: 1}
+    assert limiter.in_flight == 0
+
+
+def test_latency_inflation_backs_off():
+    limiter = AdaptiveConcurrencyLimiter("openai", initial=8, latency_tolerance=2.0)
+    limiter.acquire()
+    limiter.release(0.1)
+
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release(1.0)
+
+    assert limiter.limit < 8
+    assert limiter.decreases["latency"] == 1
+
+
+def test_fixed_limit_never_adapts():
+    limiter = AdaptiveConcurrencyLimiter("openai", initial=2, adaptive=False)
+
+    saturated_window(limiter, error_type=RATE_LIMIT)
+    saturated_window(limiter)
+
+    assert limiter.limit == 2
+
+
+def test_release_unused_frees_the_slot_without_adapting():
+    limiter = AdaptiveConcurrencyLimiter("openai", initial=1)
+    limiter.acquire()
+
+    limiter.release_unused()
+
+    assert limiter.in_flight == 0
+    assert limiter.limit == 1
+    assert not limiter.decisions
+
+
+def test_registry_keeps_one_limiter_per_endpoint():
+    registry = ConcurrencyLimiterRegistry.from_config({"concurrency": 3})
+    local = endpoint_key("openai", "http://localhost:8000/v1")
+
+    assert registry.get("openai") is registry.get("openai")
+    assert registry.get(local) is not registry.get("openai")
+    assert registry.current_limit(local) == 3
+    assert registry.max_workers(["openai", local, "openai"]) == 6
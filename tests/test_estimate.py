@@ -0,0 +1,57 @@
+import litellm
+import pytest
+
+from rawbench.core import estimate
+from rawbench.core.estimate import TokenCounter, estimate_plan
+from rawbench.core.plan import ExecutionPlan
+
+TEXT = "The quick brown fox jumps over the lazy dog."
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters(monkeypatch):
+    monkeypatch.setattr(TokenCounter, "_by_family", {})
+    monkeypatch.setattr(TokenCounter, "_family_of_model", {})
+
+
+def test_models_of_a_family_share_a_counter():
+    counter = TokenCounter.for_model("gpt-4o")
+
+    assert TokenCounter.for_model("gpt-4o-mini") is counter
+    assert counter.count(TEXT) == len(litellm.encode(model="gpt-4o", text=TEXT))
+
+
+def test_counts_with_litellm_encode_without_the_tokenizer_lookup(monkeypatch):
+    monkeypatch.setattr(estimate, "_select_tokenizer", None)
+    counter = TokenCounter.for_model("gpt-4o")
+
+    assert counter.family == "litellm:gpt-4o"
+    assert counter.count_many([TEXT, TEXT]) == [len(litellm.encode(model="gpt-4o", text=TEXT))] * 2
+
+
+def test_estimates_from_text_length_when_no_tokenizer_works(monkeypatch):
+    monkeypatch.setattr(estimate, "_select_tokenizer", None)
+
+    def broken(**kwargs):
+        raise RuntimeError("no tokenizer")
+
+    monkeypatch.setattr(litellm, "encode", broken)
+    counter = TokenCounter.for_model("some/model")
+
+    assert counter.count("a" * 10) == 3
+    assert counter.count("") == 0
+
+
+def test_estimate_plan_projects_max_tokens_per_cell():
+    config = {
+        "id": "estimate",
+        "models": [{"id": "m", "provider": "openai", "name": "openai/gpt-4o-mini", "max_tokens": 50}],
+        "prompts": [{"id": "p1", "system": "Be brief."}, {"id": "p2", "system": "Be kind."}],
+        "tests": [{"id": "t", "messages": [{"role": "user", "content": TEXT}]}],
+    }
+    [model] = estimate_plan(ExecutionPlan.compile(config, {}))["models"]
+
+    assert model["cells"] == 2
+    assert model["completion_tokens"] == 100
+    assert model["completion_source"] == "max_tokens"
+    assert model["prompt_tokens"] > 0
@@ -0,0 +1,40 @@
+from rawbench.core.evaluation import Evaluation
+from rawbench.core.suite import Suite
+
+
+def config(evaluation_id, api_base):
+    return {
+        "id": evaluation_id,
+        "models": [{"id": "gpt", "provider": "openai", "name": "openai/gpt-4o-mini", "api_base": api_base}],
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [{"id": "hello", "messages": [{"role": "user", "content": "say hello"}]}],
+    }
+
+
+def test_evaluation_warms_up_its_endpoints_before_the_first_cell(fake_llm):
+    with Evaluation(config("warm", fake_llm)) as evaluation:
+        connections = evaluation.run(quiet=True).metadata["connections"]
+
+    assert list(connections) == [fake_llm]
+    assert connections[fake_llm]["warmup_ms"] is not None
+    assert connections[fake_llm]["warmup_connect_ms"] is not None
+
+
+def test_suite_warms_up_every_endpoint_once(start_fake_llm):
+    first, second = start_fake_llm(), start_fake_llm()
+
+    with Suite([config("first", first), config("second", second)]) as suite:
+        suite.run(quiet=True)
+        connections = suite.http_clients.to_dict()
+
+    assert sorted(connections) == sorted([first, second])
+    assert all(client["warmup_ms"] is not None for client in connections.values())
+
+
+def test_warmup_can_be_disabled(fake_llm):
+    evaluation_config = {**config("cold", fake_llm), "execution": {"http": {"warmup": False}}}
+
+    with Evaluation(evaluation_config) as evaluation:
+        connections = evaluation.run(quiet=True).metadata["connections"]
+
+    assert connections[fake_llm]["warmup_ms"] is None
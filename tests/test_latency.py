@@ -0,0 +1,87 @@
+import pytest
+
+from rawbench.core.evaluation import Evaluation
+from rawbench.core.model import Response, call_breakdown
+from rawbench.results.result import LATENCY_COMPONENTS, Result, summarize_latency
+from rawbench.results.store import CompactResultStore
+
+
+def test_call_breakdown_splits_a_timed_call():
+    # Call started at 10.0s: request sent 2ms in, headers after 50ms (5ms of which connecting),
+    # body read 10ms later, response parsed 3ms after that
+    timing = {"sent_at": 10.002, "headers_at": 10.052, "body_at": 10.062, "provider_ms": 30.0}
+
+    breakdown = call_breakdown(0.25, 10.0, 10.065, 5, timing)
+
+    assert list(breakdown) == list(LATENCY_COMPONENTS)
+    assert breakdown["queue_ms"] == pytest.approx(250)
+    assert breakdown["connect_ms"] == 5.0
+    assert breakdown["server_ms"] == pytest.approx(45)
+    assert breakdown["provider_ms"] == 30.0
+    assert breakdown["transfer_ms"] == pytest.approx(10)
+    assert breakdown["parse_ms"] == pytest.approx(5)
+
+
+def test_call_breakdown_leaves_unmeasured_parts_empty():
+    breakdown = call_breakdown(0.0, 1.0, 1.5, 0, {})
+
+    assert breakdown == {"queue_ms": 0.0, "connect_ms": 0.0, "server_ms": None, "provider_ms": None,
+                         "transfer_ms": None, "parse_ms": None}
+
+
+def test_response_sums_the_breakdown_of_every_call():
+    response = Response(output_messages=[], latencies=[])
+
+    response.add_breakdown({"queue_ms": 1.0, "server_ms": 10.0, "provider_ms": None})
+    response.add_breakdown({"queue_ms": 2.0, "server_ms": None, "provider_ms": None})
+
+    assert response.breakdown == {"queue_ms": 3.0, "server_ms": 10.0, "provider_ms": None}
+
+
+def test_summary_averages_each_component_over_the_results_that_measured_it():
+    rows = [
+        ("gpt", {"queue_ms": 10.0, "server_ms": 100.0, "provider_ms": None}),
+        ("gpt", {"queue_ms": 20.0, "server_ms": None, "provider_ms": 40.0}),
+        ("claude", {"queue_ms": 30.0}),
+        # Failed before any call was timed
+        ("claude", {}),
+    ]
+
+    latency = summarize_latency(rows)
+
+    assert latency["avg"]["queue_ms"] == 20.0
+    assert latency["avg"]["server_ms"] == 100.0
+    assert latency["avg"]["provider_ms"] == 40.0
+    assert latency["avg"]["parse_ms"] is None
+    assert latency["by_model"]["gpt"]["queue_ms"] == 15.0
+    assert latency["by_model"]["claude"]["queue_ms"] == 30.0
+    assert summarize_latency([("gpt", {})]) is None
+
+
+def test_store_keeps_missing_breakdowns_empty():
+    store = CompactResultStore()
+    store.add_result(Result(id="e::m::p::t", prompt_id="p", model_id="m", test_id="t", input_messages=[],
+                            output_content=None, output_messages=[], status="error", error_type="timeout"))
+
+    assert store.results[0].latency_breakdown == {}
+    assert "latency_breakdown" not in store.get_summary()
+
+
+def test_run_measures_every_part_through_the_pooled_client(fake_llm):
+    config = {
+        "id": "latency",
+        "models": [{"id": "gpt", "provider": "openai", "name": "openai/gpt-4o-mini", "api_base": fake_llm}],
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [{"id": "hello", "messages": [{"role": "user", "content": "say hello"}]}],
+    }
+
+    with Evaluation(config) as evaluation:
+        collector = evaluation.run(quiet=True)
+
+    (result,) = collector.results
+    assert set(result.latency_breakdown) == set(LATENCY_COMPONENTS)
+    # The fake server reports its processing time in openai-processing-ms
+    assert all(result.latency_breakdown[key] is not None
+               for key in ("queue_ms", "server_ms", "provider_ms", "transfer_ms", "parse_ms"))
+    assert result.latency_breakdown["server_ms"] >= result.latency_breakdown["provider_ms"] - 1
+    assert collector.get_summary()["latency_breakdown"]["avg"]["server_ms"] == result.latency_breakdown["server_ms"]
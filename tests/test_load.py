@@ -0,0 +1,55 @@
+import pytest
+
+from rawbench.core.http_clients import HttpClientRegistry
+from rawbench.core.load import LoadProfile, LoadRunner, LoadStep
+from rawbench.core.plan import ExecutionPlan
+
+
+def config(api_base):
+    return {
+        "id": "load",
+        "models": [
+            {"id": "small", "provider": "openai", "name": "openai/gpt-4o-mini", "api_base": api_base},
+            {"id": "large", "provider": "openai", "name": "openai/gpt-4o", "api_base": api_base,
+             "frequency_penalty": 0.5},
+        ],
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [
+            {"id": "hello", "messages": [{"role": "user", "content": "say hello"}]},
+            {"id": "bye", "messages": [{"role": "user", "content": "say bye"}]},
+        ],
+    }
+
+
+def run_load(api_base, model_ids=None):
+    http_clients = HttpClientRegistry.from_config({})
+    try:
+        plan = ExecutionPlan.compile(config(api_base), {}, http_clients=http_clients)
+        profile = LoadProfile([LoadStep(qps=5, duration=1)], timeout=10)
+        return LoadRunner(plan, profile).run(model_ids)
+    finally:
+        http_clients.close()
+
+
+def test_load_runs_every_model_against_its_endpoint(fake_llm):
+    data = run_load(fake_llm)
+
+    assert [stats["model_id"] for stats in data["steps"]] == ["small", "large"]
+    for stats in data["steps"]:
+        assert stats["requests"] == 5
+        assert stats["errors"] == 0, stats["errors_by_type"]
+        assert stats["ttft_ms"]["p50"] > 0
+    assert data["summary"]["count_models"] == 2
+    assert data["summary"]["success_rate"] == 1.0
+
+
+def test_load_runs_only_selected_models(fake_llm):
+    data = run_load(fake_llm, model_ids=["large"])
+
+    assert [stats["model_id"] for stats in data["steps"]] == ["large"]
+    assert data["steps"][0]["successes"] == 5
+
+
+def test_load_rejects_unknown_models(fake_llm):
+    with pytest.raises(ValueError, match="No models matching"):
+        run_load(fake_llm, model_ids=["missing"])
@@ -0,0 +1,78 @@
+import pytest
+
+from rawbench.services.evaluation import EvaluationService
+
+pytest_plugins = ["pytester"]
+
+CONFIG = """
+id: plugin
+models:
+  - id: gpt
+    provider: openai
+    name: openai/gpt-4o-mini
+    api_base: {api_base}
+prompts:
+  - id: default
+    system: You are helpful.
+tests:
+  - id: passing
+    messages: [{{role: user, content: say token}}]
+    assert:
+      - type: contains
+        value: token
+  - id: failing
+    messages: [{{role: user, content: say hello}}]
+    assert:
+      - type: contains
+        value: hello
+  - id: unchecked
+    messages: [{{role: user, content: say anything}}]
+"""
+
+
+@pytest.fixture
+def evals(pytester, fake_llm):
+    pytester.makefile(".yaml", rawbench_plugin=CONFIG.format(api_base=fake_llm))
+    return pytester
+
+
+def test_every_cell_is_a_test(evals):
+    outcome = evals.runpytest("-p", "rawbench.pytest_plugin", "-v")
+
+    outcome.assert_outcomes(passed=2, failed=1)
+    outcome.stdout.fnmatch_lines([
+        "*rawbench_plugin.yaml::passing?gpt-default? PASSED*",
+        "*rawbench_plugin.yaml::failing?gpt-default? FAILED*",
+        "*contains: missing 'hello'*",
+    ])
+
+
+def test_cells_are_selected_with_k(evals):
+    outcome = evals.runpytest("-p", "rawbench.pytest_plugin", "-k", "passing or unchecked")
+
+    outcome.assert_outcomes(passed=2, deselected=1)
+
+
+def test_files_are_not_collected_without_the_plugin(evals):
+    evals.runpytest().assert_outcomes()
+
+
+def test_xdist_workers_compile_each_file_once(evals, monkeypatch):
+    built = []
+    build_evaluation = EvaluationService.build_evaluation
+
+    def counting(self, config_path, pricing_path=None):
+        built.append(config_path)
+        return build_evaluation(self, config_path, pricing_path)
+
+    monkeypatch.setattr(EvaluationService, "build_evaluation", counting)
+    # Makes the session behave like an xdist worker
+    evals.makeconftest("""
+def pytest_configure(config):
+    config.workerinput = {"workerid": "gw0"}
+""")
+
+    outcome = evals.runpytest("-p", "rawbench.pytest_plugin")
+
+    outcome.assert_outcomes(passed=2, failed=1)
+    assert len(built) == 1
@@ -0,0 +1,121 @@
+import threading
+import time
+
+from rawbench.core.cost import Budget
+from rawbench.core.evaluation import Evaluation
+from rawbench.core.scheduler import Scheduler
+
+
+class Recorder:
+    """Progress listener keeping the results in completion order."""
+
+    def __init__(self):
+        self.results = []
+
+    def start(self, evaluation_id, total_cells):
+        pass
+
+    def record(self, result):
+        self.results.append(result)
+
+
+def config(models, tests=4, execution=None):
+    return {
+        "id": "sched",
+        "models": models,
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [{"id": f"t{index}", "messages": [{"role": "user", "content": f"say {index}"}]}
+                  for index in range(tests)],
+        "execution": execution or {},
+    }
+
+
+def model(model_id, api_base):
+    return {"id": model_id, "provider": "openai", "name": "openai/gpt-4o-mini", "api_base": api_base}
+
+
+def test_scheduler_yields_every_item():
+    results = list(Scheduler(4).run(lambda item: item * 2, range(10)))
+
+    assert sorted(result for _, result, _ in results) == [item * 2 for item in range(10)]
+    assert all(exception is None for _, _, exception in results)
+
+
+def test_scheduler_reports_exceptions_per_item():
+    def fn(item):
+        if item == 3:
+            raise ValueError("boom")
+        return item
+
+    errors = [(item, exception) for item, _, exception in Scheduler(2).run(fn, range(5)) if exception]
+
+    assert len(errors) == 1
+    assert errors[0][0] == 3 and isinstance(errors[0][1], ValueError)
+
+
+def test_scheduler_starts_nothing_once_stopped():
+    started = []
+
+    def fn(item):
+        started.append(item)
+        return item
+
+    stop = threading.Event()
+    for item, _, _ in Scheduler(1).run(fn, range(10), stop.is_set):
+        if item == 2:
+            stop.set()
+
+    assert started == [0, 1, 2]
+
+
+def test_lanes_respect_their_capacity():
+    running = {"slow": 0, "fast": 0}
+    peaks = {"slow": 0, "fast": 0}
+    lock = threading.Lock()
+
+    def fn(item):
+        lane, _ = item
+        with lock:
+            running[lane] += 1
+            peaks[lane] = max(peaks[lane], running[lane])
+        time.sleep(0.02 if lane == "slow" else 0.001)
+        with lock:
+            running[lane] -= 1
+
+    lanes = {"slow": [("slow", index) for index in range(6)], "fast": [("fast", index) for index in range(6)]}
+    results = list(Scheduler(16).run_lanes(fn, lanes, capacity=lambda lane: 2 if lane == "slow" else 1))
+
+    assert len(results) == 12
+    assert peaks == {"slow": 2, "fast": 1}
+
+
+def test_budget_stop_runs_at_most_the_cells_in_flight(start_fake_llm):
+    api_base = start_fake_llm(ttft_ms=50)
+    evaluation = Evaluation(config([model("gpt", api_base)], tests=40,
+                                   execution={"concurrency": {"initial": 4, "max": 32}}))
+
+    try:
+        collector = evaluation.run(budget=Budget(max_tokens=1), quiet=True)
+    finally:
+        evaluation.close()
+
+    assert 1 <= len(collector.results) <= 4
+    assert collector.metadata["stopped_reason"].startswith("max_tokens reached")
+
+
+def test_slow_endpoint_does_not_hold_up_a_fast_one(start_fake_llm):
+    slow = start_fake_llm(ttft_ms=500)
+    fast = start_fake_llm(ttft_ms=5)
+    # The slow endpoint's cells come first in plan order
+    evaluation = Evaluation(config([model("slow", slow), model("fast", fast)], tests=6,
+                                   execution={"concurrency": 2}))
+    recorder = Recorder()
+
+    try:
+        evaluation.run(progress=recorder, quiet=True)
+    finally:
+        evaluation.close()
+
+    order = [result.model_id for result in recorder.results]
+    assert sorted(order) == ["fast"] * 6 + ["slow"] * 6
+    assert order[:6] == ["fast"] * 6
@@ -0,0 +1,187 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from rawbench.core.cost import Budget
+from rawbench.core.evaluation import Evaluation
+from rawbench.core.scoring import Assertion, LLMJudge, Scorer, compile_assertions
+from rawbench.results.result import Result, ResultCollector
+
+
+def reply(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeJudgeModel:
+    """Grades every response of a batch 0.9 and records what it was sent."""
+
+    def __init__(self):
+        self.calls = []
+
+    def run(self, test, system_prompt=None):
+        content = test["messages"][0]["content"]
+        self.calls.append(content)
+        count = content.count("<response ")
+        grades = [{"index": index, "score": 0.9, "reason": "fine"} for index in range(count)]
+        return SimpleNamespace(output_messages=[reply(json.dumps({"grades": grades}))])
+
+
+class FlatPricing:
+    """Every judge call uses 30 tokens and costs $0.03."""
+
+    def cost_of_responses(self, responses, *names):
+        return SimpleNamespace(total_tokens=30), 0.03
+
+
+def judge(batch_size=3, max_wait_ms=1000):
+    model = FakeJudgeModel()
+    return LLMJudge(lambda name: model, "judge-model", batch_size, max_wait_ms, FlatPricing()), model
+
+
+def result(output, test_id="t0"):
+    return Result(id=f"eval::gpt::default::{test_id}", prompt_id="default", model_id="gpt", test_id=test_id,
+                  input_messages=[], output_content=output, output_messages=[], total_tokens=10, cost=0.01)
+
+
+@pytest.mark.parametrize("spec, output, passed", [
+    ({"type": "is-json"}, '{"a": 1}', True),
+    ({"type": "json"}, "```json\n[1, 2]\n```", True),
+    ({"type": "is-json"}, "not json", False),
+    ({"type": "regex", "pattern": r"^\d+$"}, "42", True),
+    ({"type": "regex", "pattern": "hello", "ignore_case": True}, "HELLO there", True),
+    ({"type": "contains", "values": ["a", "b"]}, "a only", False),
+    ({"type": "contains", "value": "Paris", "ignore_case": True}, "it is paris", True),
+    ({"type": "contains", "values": ["a", "b"], "threshold": 0.5}, "a only", True),
+    ({"type": "similarity", "expected": "The capital is Paris."}, "the capital is paris", True),
+    ({"type": "similarity", "expected": "The capital is Paris."}, "London", False),
+])
+def test_assertion_types(spec, output, passed):
+    (assertion,) = compile_assertions([spec])
+    score, reason = assertion.check(output, None)
+
+    assert (score >= assertion.threshold) is passed
+    assert reason
+
+
+def test_json_schema_assertion():
+    pytest.importorskip("jsonschema")
+    (assertion,) = compile_assertions([{"type": "json-schema", "schema": {
+        "type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}}])
+
+    assert assertion.check('{"name": "x"}', None)[0] == 1.0
+    assert assertion.check('{"name": 1}', None) == (0.0, "name: 1 is not of type 'string'")
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"type": "nope"}, "Unknown assertion type 'nope'"),
+    ({"type": "regex"}, "needs a 'pattern'"),
+    ({"type": "llm-judge"}, "needs a 'rubric'"),
+    ({"type": "similarity"}, "needs an 'expected' answer"),
+])
+def test_invalid_assertions_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        compile_assertions([spec])
+
+
+def test_assertion_subclasses_must_implement_check():
+    class Incomplete(Assertion):
+        type = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete({})
+
+
+def test_judge_batches_concurrent_outputs_into_one_call():
+    llm_judge, model = judge(batch_size=3)
+    grades = {}
+
+    def grade(output):
+        grades[output] = llm_judge.grade(None, "be nice", output)
+
+    threads = [threading.Thread(target=grade, args=(f"output {index}",)) for index in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(model.calls) == 1
+    assert model.calls[0].startswith("Rubric:\nbe nice")
+    assert grades == {f"output {index}": (0.9, "fine") for index in range(3)}
+    assert llm_judge.to_dict()["graded"] == 3
+
+
+def test_judge_sends_a_partial_batch_after_max_wait():
+    llm_judge, model = judge(batch_size=8, max_wait_ms=10)
+
+    assert llm_judge.grade(None, "be nice", "alone") == (0.9, "fine")
+    assert len(model.calls) == 1
+
+
+def test_judge_caches_grades_by_model_rubric_and_output():
+    llm_judge, model = judge(batch_size=1)
+
+    llm_judge.grade(None, "be nice", "same")
+    llm_judge.grade(None, "be nice", "same")
+    llm_judge.grade(None, "be strict", "same")
+
+    assert len(model.calls) == 2
+    assert llm_judge.cache_hits == 1
+
+
+def test_failed_judge_calls_are_not_cached():
+    class Failing:
+        def run(self, test, system_prompt=None):
+            raise RuntimeError("provider down")
+
+    llm_judge = LLMJudge(lambda name: Failing(), "judge-model", batch_size=1)
+
+    assert llm_judge.grade(None, "be nice", "x") == (None, "judge failed: provider down")
+    assert llm_judge.to_dict()["cached_grades"] == 0
+
+
+def test_judge_cost_is_split_between_the_graded_outputs():
+    llm_judge, _ = judge(batch_size=1)
+    scorer = Scorer(judge=llm_judge)
+    assertions = compile_assertions([{"type": "llm-judge", "rubric": "be nice"}, {"type": "is-json"}])
+
+    first = scorer.score(result("same"), assertions)
+    cached = scorer.score(result("same", "t1"), assertions)
+
+    assert first.scores[0]["judge_cost"] == 0.03 and first.scores[0]["judge_tokens"] == 30
+    assert "judge_cost" not in first.scores[1]
+    assert "judge_cost" not in cached.scores[0]
+
+    collector = ResultCollector()
+    collector.add_result(first)
+    collector.add_result(cached)
+    summary = collector.get_summary()
+    assert summary["scores"]["judge_cost"] == 0.03
+    assert summary["scores"]["judge_tokens"] == 30
+    assert summary["total_cost"] == pytest.approx(0.02 + 0.03)
+
+
+def test_judge_calls_are_charged_to_the_budget(start_fake_llm, monkeypatch):
+    api_base = start_fake_llm()
+    # The judge model has no api_base of its own
+    monkeypatch.setenv("OPENAI_API_BASE", api_base)
+    config = {
+        "id": "judged",
+        "models": [{"id": "gpt", "provider": "openai", "name": "openai/gpt-4o-mini", "api_base": api_base}],
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [{"id": "hello", "messages": [{"role": "user", "content": "say hello"}],
+                   "assert": [{"type": "llm-judge", "rubric": "is polite"}]}],
+        "execution": {"scoring": {"judge": {"model": "openai/gpt-4o-mini"}}},
+    }
+    budget = Budget()
+
+    with Evaluation(config) as evaluation:
+        summary = evaluation.run(budget=budget, quiet=True).get_summary()
+
+    (scored,) = evaluation.result_collector.results
+    judge_tokens = summary["scores"]["judge_tokens"]
+    assert judge_tokens > 0
+    assert budget.spent_tokens == scored.total_tokens + judge_tokens
+    assert summary["total_cost"] == pytest.approx(scored.cost + summary["scores"]["judge_cost"])
+    assert budget.spent_cost == pytest.approx(summary["total_cost"])
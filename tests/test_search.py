@@ -0,0 +1,122 @@
+import json
+import os
+
+import pytest
+
+from rawbench.results.archive import write_archive
+from rawbench.results.search import SearchIndex
+
+
+def result(evaluation_id, model_id, test_id, output, tool=None, created_at="2026-03-01T10:00:00"):
+    messages = [{"role": "assistant", "content": output}]
+    if tool:
+        messages.insert(0, {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "call_1", "type": "function", "function": {"name": tool, "arguments": '{"q": "weather"}'}}]})
+    return {
+        "id": f"{evaluation_id}::{model_id}::default::{test_id}",
+        "prompt_id": "default",
+        "model_id": model_id,
+        "test_id": test_id,
+        "input_messages": [{"role": "user", "content": f"question about {test_id}"}],
+        "output_content": output,
+        "output_messages": messages,
+        "status": "success",
+        "created_at": created_at,
+    }
+
+
+def write_results(path, results, mtime=None):
+    path.write_text(json.dumps({"summary": {}, "results": results}))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def index(tmp_path):
+    write_results(tmp_path / "first.json", [
+        result("first", "gpt", "capital", "The capital of France is Paris."),
+        result("first", "claude", "capital", "Paris is the capital.", created_at="2026-03-05T10:00:00"),
+    ])
+    write_archive(str(tmp_path / "second.rbz"), {}, [
+        result("second", "gpt", "weather", "It is sunny in Lyon.", tool="get_weather"),
+    ], compression="zlib")
+    search_index = SearchIndex(str(tmp_path))
+    yield search_index
+    search_index.close()
+
+
+def ids(found):
+    return sorted(hit["id"] for hit in found["hits"])
+
+
+def test_indexes_json_files_and_archives(index):
+    assert index.update() == {"indexed": 2, "removed": 0, "unchanged": 0, "results": 3}
+
+    found = index.search("paris")
+    assert found["total"] == 2
+    assert ids(found) == ["first::claude::default::capital", "first::gpt::default::capital"]
+    assert "[Paris]" in found["hits"][0]["snippet"]
+    assert ids(index.search("tools:get_weather")) == ["second::gpt::default::weather"]
+    assert index.search("input:lyon")["total"] == 0
+
+
+def test_update_only_reindexes_changed_files(index, tmp_path):
+    index.update()
+    first = tmp_path / "first.json"
+    write_results(first, [result("first", "gpt", "capital", "Berlin is the capital of Germany.")],
+                  mtime=first.stat().st_mtime_ns + 10**9)
+
+    assert index.update() == {"indexed": 1, "removed": 0, "unchanged": 1, "results": 1}
+    assert index.search("paris")["total"] == 0
+    assert index.search("berlin")["total"] == 1
+    assert index.search("sunny")["total"] == 1
+
+
+def test_update_forgets_deleted_files(index, tmp_path):
+    index.update()
+    (tmp_path / "second.rbz").unlink()
+
+    assert index.update()["removed"] == 1
+    assert index.search("sunny")["total"] == 0
+
+
+def test_index_survives_reopening(index, tmp_path):
+    index.update()
+    index.close()
+
+    reopened = SearchIndex(str(tmp_path))
+    assert reopened.update()["unchanged"] == 2
+    assert reopened.search("paris", refresh=False)["total"] == 2
+    reopened.close()
+
+
+def test_filters(index):
+    assert ids(index.search("paris", model="gpt")) == ["first::gpt::default::capital"]
+    assert ids(index.search("paris", since="2026-03-02")) == ["first::claude::default::capital"]
+    assert index.search("paris", evaluation="second")["total"] == 0
+    assert index.search("sunny", file="second.rbz")["total"] == 1
+    with pytest.raises(ValueError, match="Unknown search filter"):
+        index.search("paris", color="red")
+
+
+def test_invalid_query_syntax_falls_back_to_plain_terms(index):
+    assert index.search('"paris')["total"] == 2
+
+
+def test_pagination(index):
+    page = index.search("capital", limit=1, offset=1)
+
+    assert page["total"] == 2
+    assert len(page["hits"]) == 1
+
+
+def test_files_without_results_are_skipped(index, tmp_path):
+    (tmp_path / "suite.json").write_text(json.dumps({"type": "suite", "summary": {}, "results": []}))
+    (tmp_path / "broken.json").write_text("{not json")
+
+    stats = index.update()
+
+    assert stats["indexed"] == 3
+    assert stats["results"] == 3
+    # A skipped file is remembered and not retried until it changes
+    assert index.update()["unchanged"] == 4
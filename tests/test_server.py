@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from rawbench.services.server import WebServer
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("RAWBENCH_PUSH_TOKEN", raising=False)
+    (tmp_path / "results").mkdir()
+    return WebServer()
+
+
+def write_results(tmp_path, count):
+    results = [{"id": f"eval::m::p::t{index}", "output_content": f"out {index}"} for index in range(count)]
+    path = tmp_path / "results" / "run.json"
+    path.write_text(json.dumps({"summary": {"total_results": count}, "results": results}))
+    return path
+
+
+def push(client, token=None, remote_addr="127.0.0.1"):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.post("/api/progress/events", json={"type": "started", "stats": {"total": 3}},
+                       headers=headers, environ_base={"REMOTE_ADDR": remote_addr})
+
+
+def test_progress_push_is_only_accepted_from_loopback_without_a_token(server):
+    client = server.app.test_client()
+
+    assert push(client).status_code == 200
+    assert push(client, remote_addr="10.0.0.5").status_code == 403
+
+
+def test_progress_push_requires_the_token_when_one_is_set(server):
+    server.push_token = "secret"
+    client = server.app.test_client()
+
+    assert push(client).status_code == 403
+    assert push(client, token="wrong", remote_addr="10.0.0.5").status_code == 403
+    assert push(client, token="secret", remote_addr="10.0.0.5").status_code == 200
+    assert server.progress.snapshot()["total"] == 3
+
+
+def test_result_pages_and_lookups_by_id(server, tmp_path):
+    write_results(tmp_path, 5)
+    client = server.app.test_client()
+
+    page = client.get("/api/results/run.json/results?offset=1&limit=2").get_json()
+    assert page["total"] == 5
+    assert [result["id"] for result in page["results"]] == ["eval::m::p::t1", "eval::m::p::t2"]
+    assert client.get("/api/results/run.json/results?id=eval::m::p::t4").get_json()["output_content"] == "out 4"
+    assert client.get("/api/results/run.json/results?id=missing").status_code == 404
+
+
+def test_result_pages_parse_the_file_once_while_it_is_unchanged(server, tmp_path, monkeypatch):
+    write_results(tmp_path, 3)
+    client = server.app.test_client()
+    client.get("/api/results/run.json/results?limit=1")
+
+    parsed = []
+    original = json.load
+    monkeypatch.setattr(json, "load", lambda f: parsed.append(f) or original(f))
+    client.get("/api/results/run.json/results?offset=2")
+    assert parsed == []
+
+    write_results(tmp_path, 4)
+    assert client.get("/api/results/run.json/results").get_json()["total"] == 4
+    assert len(parsed) == 1
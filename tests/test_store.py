@@ -0,0 +1,109 @@
+import json
+
+from rawbench.results.result import LATENCY_COMPONENTS, Result, ResultCollector
+from rawbench.results.store import CompactResultStore, StringPool, TranscriptStore
+
+MESSAGES = [{"role": "user", "content": "say hello"}]
+BREAKDOWN = {key: None if key == "connect_ms" else 10.0 for key in LATENCY_COMPONENTS}
+
+
+def result(index, model_id="gpt", content="hello", **fields):
+    fields = {"cost": 0.001, **fields}
+    return Result(
+        id=f"eval::{model_id}::default::t{index}",
+        prompt_id="default",
+        model_id=model_id,
+        test_id=f"t{index}",
+        input_messages=MESSAGES,
+        output_content=content,
+        output_messages=[{"role": "assistant", "content": content}],
+        completion_tokens=2,
+        prompt_tokens=3,
+        total_tokens=5,
+        latency_ms=100 + index,
+        latency_breakdown=BREAKDOWN,
+        **fields,
+    )
+
+
+def test_results_round_trip():
+    store = CompactResultStore()
+    originals = [result(0), result(1, model_id="claude", status="error", error_type="rate_limit",
+                                  error_message="slow down", cost=None), result(2, content=None)]
+    for original in originals:
+        store.add_result(original)
+
+    assert len(store) == 3
+    for original, stored in zip(originals, store.results):
+        assert stored.to_dict() == original.to_dict()
+
+
+def test_strings_and_inputs_are_interned():
+    store = CompactResultStore()
+    for index in range(50):
+        store.add_result(result(index % 5, model_id=f"m{index % 2}"))
+
+    # "default", "success", two model ids and five test ids
+    assert len(store._strings) == 9
+    # Every result shares the same input conversation
+    assert len(store._inputs) == 1
+
+
+def test_string_pool_keeps_none_apart():
+    pool = StringPool()
+
+    assert pool.add("a") == pool.add("a")
+    assert pool.get(pool.add(None)) is None
+    assert len(pool) == 1
+
+
+def test_transcripts_spill_to_disk_past_the_threshold():
+    transcripts = TranscriptStore(spill_threshold=100)
+    messages = [[{"role": "assistant", "content": f"answer {index}" * (1 + index * 20)}] for index in range(10)]
+
+    indexes = [transcripts.add(entry) for entry in messages]
+
+    assert transcripts.spilled > 0
+    assert transcripts.memory_bytes <= 100
+    assert [transcripts.get(index) for index in indexes] == messages
+    transcripts.close()
+
+
+def test_store_reads_spilled_results_back():
+    store = CompactResultStore(spill_threshold=0)
+    long_answer = "x" * 2000
+    store.add_result(result(0, content=long_answer))
+    store.add_result(result(1))
+
+    assert store.transcripts.spilled == 2
+    assert store.results[0].output_content == long_answer
+    assert store.results[-1].output_messages == [{"role": "assistant", "content": "hello"}]
+    store.close()
+
+
+def test_sort_by_id_reorders_every_column():
+    store = CompactResultStore()
+    for index in (2, 0, 1):
+        store.add_result(result(index, content=f"answer {index}"))
+
+    store.sort_by_id({f"eval::gpt::default::t{index}": index for index in range(3)})
+
+    assert [r.test_id for r in store.results] == ["t0", "t1", "t2"]
+    assert [r.output_content for r in store.results] == ["answer 0", "answer 1", "answer 2"]
+    assert [r.latency_ms for r in store.results] == [100, 101, 102]
+
+
+def test_summary_matches_the_plain_collector(tmp_path):
+    store, collector = CompactResultStore(), ResultCollector()
+    for index in range(6):
+        failed = {"status": "error", "error_type": "timeout"} if index == 4 else {}
+        for target in (store, collector):
+            target.add_result(result(index, model_id=f"m{index % 2}", **failed))
+
+    assert store.get_summary() == collector.get_summary()
+
+    path = tmp_path / "results.json"
+    store.export_to_json(str(path))
+    data = json.loads(path.read_text())
+    assert data["summary"]["total_results"] == 6
+    assert [r["id"] for r in data["results"]] == [r.id for r in collector.results]
@@ -0,0 +1,50 @@
+from rawbench.core.cost import Budget
+from rawbench.core.suite import Suite
+
+
+def config(evaluation_id, api_base, tests=("hello", "bye"), execution=None):
+    return {
+        "id": evaluation_id,
+        "models": [{"id": "gpt", "provider": "openai", "name": "openai/gpt-4o-mini", "api_base": api_base}],
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [{"id": test, "messages": [{"role": "user", "content": f"say {test}"}]} for test in tests],
+        "execution": execution or {},
+    }
+
+
+def test_identical_cells_are_called_once_and_counted_once(fake_llm):
+    with Suite([config("first", fake_llm), config("second", fake_llm, tests=("hello", "other"))]) as suite:
+        first, second = suite.run(quiet=True)
+        summary = suite.summary(["first.json", "second.json"], ["first.yaml", "second.yaml"])["summary"]
+
+    assert suite.shared_results == 1
+    assert [len(first.results), len(second.results)] == [2, 2]
+    shared = [result for result in second.results if result.test_id == "hello"][0]
+    assert shared.output_content == first.results[0].output_content
+    assert shared.total_tokens == 0 and shared.cost == 0.0
+    # Only the three calls that were made are counted
+    other = [result for result in second.results if result.test_id == "other"][0]
+    assert summary["total_tokens"] == sum(result.total_tokens for result in first.results) + other.total_tokens
+    assert summary["total_results"] == 4
+
+
+def test_budget_applies_to_the_whole_suite(fake_llm):
+    configs = [config("first", fake_llm, tests=[f"a{i}" for i in range(20)]),
+               config("second", fake_llm, tests=[f"b{i}" for i in range(20)])]
+
+    with Suite(configs) as suite:
+        collectors = suite.run(budget=Budget(max_tokens=1), quiet=True)
+
+    assert sum(len(collector.results) for collector in collectors) < 40
+    assert all(collector.metadata["stopped_reason"].startswith("max_tokens") for collector in collectors)
+
+
+def test_differing_execution_blocks_are_reported(fake_llm, capsys):
+    configs = [config("first", fake_llm, execution={"concurrency": 2}),
+               config("second", fake_llm, execution={"concurrency": 8}),
+               config("third", fake_llm, execution={"concurrency": 2})]
+
+    with Suite(configs) as suite:
+        assert suite.limiters.current_limit("anything") == 2
+
+    assert "those of second are ignored" in capsys.readouterr().out
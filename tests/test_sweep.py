@@ -0,0 +1,100 @@
+import pytest
+
+from rawbench.core.plan import ExecutionPlan
+from rawbench.core.sweep import ModelConfigs, Sweep
+
+BASE = {"id": "mini", "provider": "openai", "name": "openai/gpt-4o-mini"}
+
+
+def swept(**sweep):
+    return {**BASE, "sweep": sweep}
+
+
+def test_grid_expands_every_combination_in_a_stable_order():
+    sweep = Sweep.from_config({"parameters": {"temperature": [0.0, 0.5],
+                                              "max_tokens": {"min": 256, "max": 768, "step": 256}}})
+
+    assert len(sweep) == 6
+    assert [sweep.settings(index) for index in range(3)] == [
+        {"max_tokens": 256, "temperature": 0.0},
+        {"max_tokens": 256, "temperature": 0.5},
+        {"max_tokens": 512, "temperature": 0.0},
+    ]
+    assert sweep.variant(BASE, 1)["id"] == "mini[max_tokens=256,temperature=0.5]"
+
+
+def test_variant_ids_do_not_depend_on_parameter_order():
+    first = Sweep.from_config({"parameters": {"temperature": [0.0, 1.0], "top_p": [0.5, 1.0]}})
+    second = Sweep.from_config({"parameters": {"top_p": [0.5, 1.0], "temperature": [0.0, 1.0]}})
+
+    assert [first.variant(BASE, i)["id"] for i in range(4)] == [second.variant(BASE, i)["id"] for i in range(4)]
+
+
+@pytest.mark.parametrize("method", ["random", "latin_hypercube"])
+def test_sampled_variants_are_stable_across_runs(method):
+    spec = {"method": method, "samples": 8, "seed": 3,
+            "parameters": {"temperature": {"min": 0.0, "max": 1.0}, "max_tokens": {"min": 100, "max": 200}}}
+
+    first = [Sweep.from_config(spec).variant(BASE, index) for index in range(8)]
+    # Accessed out of order on a fresh sweep: each variant depends only on its index and the seed
+    second = [Sweep.from_config(spec).variant(BASE, index) for index in reversed(range(8))][::-1]
+
+    assert first == second
+    assert first[2]["id"].startswith("mini#2[max_tokens=")
+    assert all(0.0 <= variant["temperature"] <= 1.0 and 100 <= variant["max_tokens"] <= 200
+               for variant in first)
+    other_seed = [Sweep.from_config({**spec, "seed": 4}).variant(BASE, index) for index in range(8)]
+    assert other_seed != first
+
+
+def test_latin_hypercube_uses_every_stratum_once():
+    sweep = Sweep.from_config({"method": "latin_hypercube", "samples": 10,
+                               "parameters": {"temperature": {"min": 0.0, "max": 1.0}}})
+
+    strata = sorted(int(sweep.settings(index)["temperature"] * 10) for index in range(10))
+
+    assert strata == list(range(10))
+
+
+@pytest.mark.parametrize("sweep, message", [
+    ({"parameters": {"name": ["a"]}}, "Cannot sweep name"),
+    ({"method": "bayes", "parameters": {"temperature": [0.0]}}, "Unknown sweep method"),
+    ({"method": "random", "parameters": {"temperature": [0.0]}}, "positive number of 'samples'"),
+    ({"parameters": {"temperature": {"min": 0.0, "max": 1.0}}}, "grid sweeps need values or a step"),
+    ({"parameters": {"temperature": {"min": 1.0, "max": 0.0}}}, "max < min"),
+])
+def test_invalid_sweeps_are_rejected(sweep, message):
+    with pytest.raises(ValueError, match=message):
+        Sweep.from_config(sweep)
+
+
+def test_model_configs_expand_sweeps_lazily():
+    configs = ModelConfigs([{**BASE, "id": "plain"}, swept(parameters={"temperature": [0.0, 0.5, 1.0]})])
+
+    assert len(configs) == 4
+    assert [config["id"] for config in configs] == [
+        "plain", "mini[temperature=0]", "mini[temperature=0.5]", "mini[temperature=1]"]
+    assert configs[-1] == {**BASE, "id": "mini[temperature=1]", "temperature": 1.0}
+    assert configs.locate(2)[2] == 1
+    assert [config["id"] for config in configs.base_configs] == ["plain", "mini"]
+    with pytest.raises(IndexError):
+        configs[4]
+
+
+def test_plan_runs_every_variant_with_its_settings():
+    config = {
+        "id": "sweep",
+        "models": [swept(parameters={"temperature": [0.0, 1.0]})],
+        "prompts": [{"id": "default", "system": "You are helpful."}],
+        "tests": [{"id": "hello", "messages": [{"role": "user", "content": "hi"}]}],
+    }
+
+    plan = ExecutionPlan.compile(config, {})
+    cells = list(plan)
+
+    assert [cell.id for cell in cells] == ["sweep::mini[temperature=0]::default::hello",
+                                           "sweep::mini[temperature=1]::default::hello"]
+    assert [cell.model.temperature for cell in cells] == [0.0, 1.0]
+    assert cells[0].key != cells[1].key
+    assert list(plan.cell_ids()) == [cell.id for cell in cells]
+    assert plan[1].id == cells[1].id